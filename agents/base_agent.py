@@ -3,7 +3,6 @@ from typing import Dict, List, Any, Optional
 import numpy as np
 import pandas as pd
 from enum import Enum
-import streamlit as st
 import time
 
 class AgentMode(Enum):
@@ -1,15 +1,40 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import requests
 from .base_agent import BaseAgent, AgentMode
+from .decision_table import Above, Below, Contains, DecisionTable, Field, Format
+from analytics.funding import simulate_funding
+from data_sources.query import budget_category_stats
+from data_sources.records import BudgetLine, RecordTable
+from data_sources.resilience import DataSourceUnavailable
+
+# More funding for categories trending down, most urgently the smaller ones
+REALLOCATION_RULES = DecisionTable(
+    {'type': 'reallocation', 'target': Field('category'), 'action': 'Increase funding allocation', 'priority': None},
+    [
+        {'when': {'type': 'funding_trend', 'prediction': Contains('decreasing'), 'current_average': Below(20000000)},
+         'priority': 'high'},
+        {'when': {'type': 'funding_trend', 'prediction': Contains('decreasing')}, 'priority': 'medium'}
+    ]
+)
+
+FEDERAL_RULES = DecisionTable(
+    {'type': 'federal', 'target': Field('program'), 'action': Format('Apply for {program} funding'),
+     'amount': Field('amount'), 'priority': None},
+    [
+        {'when': {'probability': Above(0.6), 'roi_multiplier': Above(1.4)}, 'priority': 'high'},
+        {'when': {'probability': Above(0.6)}, 'priority': 'medium'}
+    ]
+)
 
 class BudgetProphet(BaseAgent):
     """Budget Prophet Agent: Predicts funding allocation with federal simulations and Bay Area disparities."""
     
-    def __init__(self):
+    def __init__(self, data_client=None):
         super().__init__("Budget Prophet", threshold=0.8)
+        self.data_client = data_client
         self.funding_maps = {
             'homeless_hotspots': ['Tenderloin', 'Mission District', 'South of Market', 'Civic Center'],
             'funding_priorities': ['emergency_shelter', 'permanent_housing', 'support_services', 'prevention'],
@@ -50,11 +75,12 @@ class BudgetProphet(BaseAgent):
     
     def predict(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Predict funding trends and budget impacts."""
-        current_allocations = data.get('current_allocations', [])
+        current_allocations = RecordTable.coerce(BudgetLine, data.get('current_allocations', []))
         federal_opportunities = data.get('federal_opportunities', [])
         
-        # Predict funding trends
-        funding_trends = self._predict_funding_trends(current_allocations)
+        # Predict funding trends, on server-side averages when a DataSF client is attached
+        category_averages = self._fetch_category_averages(data.get('fiscal_year', 2024))
+        funding_trends = self._predict_funding_trends(current_allocations, category_averages)
         
         # Predict budget shortfalls
         budget_shortfalls = self._predict_budget_shortfalls(current_allocations)
@@ -80,7 +106,7 @@ class BudgetProphet(BaseAgent):
     
     def prevent(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate budget reallocation strategies with federal funding."""
-        current_allocations = data.get('current_allocations', [])
+        current_allocations = RecordTable.coerce(BudgetLine, data.get('current_allocations', []))
         federal_opportunities = data.get('federal_opportunities', [])
         funding_predictions = data.get('funding_predictions', [])
         
@@ -133,7 +159,7 @@ class BudgetProphet(BaseAgent):
             'level_up_message': f"Broadcasting {len(current_allocations)} budget items with federal opportunities"
         }
     
-    def _fetch_budget_data(self, location: str) -> List[Dict[str, Any]]:
+    def _fetch_budget_data(self, location: str) -> RecordTable:
         """Simulate budget data fetch."""
         mock_budget_items = [
             {'id': 1, 'category': 'homeless_services', 'amount': 50000000, 'location': 'Tenderloin', 'priority': 'high'},
@@ -142,7 +168,7 @@ class BudgetProphet(BaseAgent):
             {'id': 4, 'category': 'public_safety', 'amount': 45000000, 'location': 'Civic Center', 'priority': 'high'},
             {'id': 5, 'category': 'social_services', 'amount': 25000000, 'location': 'South of Market', 'priority': 'medium'}
         ]
-        return mock_budget_items
+        return RecordTable.from_records(BudgetLine, mock_budget_items)
     
     def _fetch_federal_opportunities(self) -> List[Dict[str, Any]]:
         """Simulate federal funding opportunities."""
@@ -151,9 +177,18 @@ class BudgetProphet(BaseAgent):
             {'id': 2, 'program': 'CDBG Grant', 'amount': 15000000, 'roi_multiplier': 1.3, 'probability': 0.7},
             {'id': 3, 'program': 'HOME Investment', 'amount': 10000000, 'roi_multiplier': 1.4, 'probability': 0.6}
         ]
+        
+        # Simulated award outcomes alongside the point estimates
+        simulation = simulate_funding(mock_opportunities)
+        for opportunity, outcome in zip(mock_opportunities, simulation['programs']):
+            opportunity.update({
+                'award_rate': outcome['award_rate'],
+                'expected_award': outcome['expected_award'],
+                'expected_roi': outcome['expected_roi']
+            })
         return mock_opportunities
     
-    def _detect_funding_disparities(self, current_allocations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _detect_funding_disparities(self, current_allocations: RecordTable) -> List[Dict[str, Any]]:
         """Detect funding disparities using Bay Area simulation."""
         disparities = []
         
@@ -195,20 +230,27 @@ class BudgetProphet(BaseAgent):
         else:
             return ['prevention', 'support_services', 'emergency_shelter']
     
-    def _predict_funding_trends(self, current_allocations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _fetch_category_averages(self, fiscal_year: int) -> Optional[pd.Series]:
+        """Average budget line per department, aggregated by DataSF (None without a client)."""
+        if self.data_client is None:
+            return None
+        try:
+            stats = self.data_client.aggregate(budget_category_stats(fiscal_year))
+        except DataSourceUnavailable as e:
+            print(f"Using local budget averages: {e}")
+            return None
+        return pd.Series(stats['avg_amount'].to_numpy(), index=stats['department'])
+    
+    def _predict_funding_trends(self, current_allocations: RecordTable,
+                                category_averages: Optional[pd.Series] = None) -> List[Dict[str, Any]]:
         """Predict funding trends based on current allocations."""
         trends = []
         
-        # Predict trends by category
-        categories = {}
-        for allocation in current_allocations:
-            category = allocation['category']
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(allocation['amount'])
+        # Average allocation per category
+        if category_averages is None:
+            category_averages = current_allocations.frame.groupby('category', sort=False, observed=True)['amount'].mean()
         
-        for category, amounts in categories.items():
-            avg_amount = np.mean(amounts)
+        for category, avg_amount in category_averages.items():
             trend = 'increasing' if avg_amount > 40000000 else 'stable' if avg_amount > 20000000 else 'decreasing'
             
             trends.append({
@@ -221,11 +263,11 @@ class BudgetProphet(BaseAgent):
         
         return trends
     
-    def _predict_budget_shortfalls(self, current_allocations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _predict_budget_shortfalls(self, current_allocations: RecordTable) -> List[Dict[str, Any]]:
         """Predict budget shortfalls."""
         shortfalls = []
         
-        total_budget = sum(allocation['amount'] for allocation in current_allocations)
+        total_budget = float(current_allocations['amount'].sum())
         projected_needs = total_budget * 1.2  # 20% increase needed
         
         if projected_needs > total_budget:
@@ -256,46 +298,21 @@ class BudgetProphet(BaseAgent):
         
         return roi_predictions
     
-    def _generate_reallocation_strategies(self, current_allocations: List[Dict[str, Any]], funding_predictions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _generate_reallocation_strategies(self, current_allocations: RecordTable, funding_predictions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate budget reallocation strategies."""
-        strategies = []
-        
-        # Generate strategies based on funding trends
-        for prediction in funding_predictions:
-            if prediction['type'] == 'funding_trend':
-                if 'decreasing' in prediction['prediction']:
-                    strategies.append({
-                        'type': 'reallocation',
-                        'target': prediction['category'],
-                        'action': 'Increase funding allocation',
-                        'priority': 'high' if prediction['current_average'] < 20000000 else 'medium'
-                    })
-        
-        return strategies
+        return REALLOCATION_RULES.records(funding_predictions)
     
     def _generate_federal_strategies(self, federal_opportunities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate federal funding strategies."""
-        strategies = []
-        
-        for opportunity in federal_opportunities:
-            if opportunity['probability'] > 0.6:
-                strategies.append({
-                    'type': 'federal',
-                    'target': opportunity['program'],
-                    'action': f"Apply for {opportunity['program']} funding",
-                    'amount': opportunity['amount'],
-                    'priority': 'high' if opportunity['roi_multiplier'] > 1.4 else 'medium'
-                })
-        
-        return strategies
+        return FEDERAL_RULES.records(federal_opportunities)
     
-    def _generate_homeless_strategies(self, current_allocations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _generate_homeless_strategies(self, current_allocations: RecordTable) -> List[Dict[str, Any]]:
         """Generate homeless alignment strategies."""
         strategies = []
         
-        homeless_allocations = [a for a in current_allocations if a['category'] == 'homeless_services']
-        if homeless_allocations:
-            total_homeless_funding = sum(a['amount'] for a in homeless_allocations)
+        homeless_allocations = current_allocations.where(category='homeless_services')
+        if len(homeless_allocations):
+            total_homeless_funding = float(homeless_allocations['amount'].sum())
             
             if total_homeless_funding < 60000000:  # Threshold for adequate funding
                 strategies.append({
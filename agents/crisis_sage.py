@@ -1,9 +1,23 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import requests
 from .base_agent import BaseAgent, AgentMode
+from .decision_table import Above, DecisionTable, Field
+from analytics.spatial import SpatialIndex
+
+# Response per crisis type; medical and infrastructure priority depends on severity
+CRISIS_RULES = DecisionTable(
+    {'type': 'crisis_prevention', 'target': Field('location'), 'action': None, 'priority': None},
+    [
+        {'when': {'type': 'medical', 'severity': Above(0.7)}, 'action': 'Deploy medical response teams', 'priority': 'high'},
+        {'when': {'type': 'medical'}, 'action': 'Deploy medical response teams', 'priority': 'medium'},
+        {'when': {'type': 'safety'}, 'action': 'Deploy safety patrols', 'priority': 'high'},
+        {'when': {'type': 'infrastructure', 'severity': Above(0.8)}, 'action': 'Infrastructure maintenance check', 'priority': 'high'},
+        {'when': {'type': 'infrastructure'}, 'action': 'Infrastructure maintenance check', 'priority': 'medium'}
+    ]
+)
 
 class CrisisSage(BaseAgent):
     """Crisis Sage Agent: Coordinates emergency response and holistic prevention chains."""
@@ -21,12 +35,18 @@ class CrisisSage(BaseAgent):
             'support_services': ['mental_health', 'social_services', 'housing'],
             'infrastructure': ['utilities', 'transportation', 'communications']
         }
+        self.spatial_index: Optional[SpatialIndex] = None
+        self._indexed_events: List[Dict[str, Any]] = []
         
     def detect(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Detect crisis events and coordinate response."""
         # Simulate crisis event data
         crisis_events = self._fetch_crisis_data(data.get('location', 'San Francisco'))
         
+        # Spatial index for nearby-event queries
+        self.spatial_index = SpatialIndex.from_rows(crisis_events)
+        self._indexed_events = crisis_events
+        
         # Detect escalation patterns
         escalation_patterns = self._detect_escalation_patterns(crisis_events)
         
@@ -133,32 +153,37 @@ class CrisisSage(BaseAgent):
     def _fetch_crisis_data(self, location: str) -> List[Dict[str, Any]]:
         """Simulate crisis event data fetch."""
         mock_crisis_events = [
-            {'id': 1, 'type': 'medical', 'location': 'Tenderloin', 'severity': 0.8, 'description': 'Overdose incident'},
-            {'id': 2, 'type': 'safety', 'location': 'Mission District', 'severity': 0.6, 'description': 'Fire emergency'},
-            {'id': 3, 'type': 'infrastructure', 'location': 'Downtown', 'severity': 0.9, 'description': 'Power outage'}
+            {'id': 1, 'type': 'medical', 'location': 'Tenderloin', 'severity': 0.8, 'description': 'Overdose incident',
+             'latitude': 37.7847, 'longitude': -122.4141},
+            {'id': 2, 'type': 'safety', 'location': 'Mission District', 'severity': 0.6, 'description': 'Fire emergency',
+             'latitude': 37.7599, 'longitude': -122.4148},
+            {'id': 3, 'type': 'infrastructure', 'location': 'Downtown', 'severity': 0.9, 'description': 'Power outage',
+             'latitude': 37.7880, 'longitude': -122.4075}
         ]
         return mock_crisis_events
     
+    def events_near(self, latitude: float, longitude: float, meters: float = 500.0) -> List[Dict[str, Any]]:
+        """Crisis events from the last detect() within ``meters`` of a point, nearest first."""
+        if self.spatial_index is None:
+            return []
+        return [self._indexed_events[row] for row in self.spatial_index.radius(latitude, longitude, meters)]
+    
     def _detect_escalation_patterns(self, crisis_events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Detect escalation patterns in crisis events."""
         patterns = []
         
-        # Detect patterns by type
-        type_counts = {}
-        for event in crisis_events:
-            event_type = event['type']
-            if event_type not in type_counts:
-                type_counts[event_type] = 0
-            type_counts[event_type] += 1
+        # Detect patterns by type: frequency and mean severity in one grouped pass
+        frame = pd.DataFrame(crisis_events, columns=['type', 'severity'])
+        type_stats = frame.groupby('type', sort=False)['severity'].agg(['size', 'mean'])
         
         # Identify escalating patterns
-        for event_type, count in type_counts.items():
+        for event_type, count, severity in zip(type_stats.index, type_stats['size'], type_stats['mean']):
             if count > 1:
                 patterns.append({
                     'type': 'escalation_pattern',
                     'crisis_type': event_type,
-                    'frequency': count,
-                    'severity': np.mean([e['severity'] for e in crisis_events if e['type'] == event_type]),
+                    'frequency': int(count),
+                    'severity': float(severity),
                     'description': f"Escalating {event_type} crisis pattern"
                 })
         
@@ -265,32 +290,7 @@ class CrisisSage(BaseAgent):
     
     def _generate_crisis_strategies(self, crisis_events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate crisis prevention strategies."""
-        strategies = []
-        
-        for event in crisis_events:
-            if event['type'] == 'medical':
-                strategies.append({
-                    'type': 'crisis_prevention',
-                    'target': event['location'],
-                    'action': 'Deploy medical response teams',
-                    'priority': 'high' if event['severity'] > 0.7 else 'medium'
-                })
-            elif event['type'] == 'safety':
-                strategies.append({
-                    'type': 'crisis_prevention',
-                    'target': event['location'],
-                    'action': 'Deploy safety patrols',
-                    'priority': 'high'
-                })
-            elif event['type'] == 'infrastructure':
-                strategies.append({
-                    'type': 'crisis_prevention',
-                    'target': event['location'],
-                    'action': 'Infrastructure maintenance check',
-                    'priority': 'high' if event['severity'] > 0.8 else 'medium'
-                })
-        
-        return strategies
+        return CRISIS_RULES.records(crisis_events)
     
     def _generate_holistic_strategies(self, crisis_events: List[Dict[str, Any]], escalation_predictions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate holistic coordination strategies."""
@@ -0,0 +1,195 @@
+from dataclasses import dataclass
+from string import Formatter
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Above:
+    """Condition: numeric value strictly greater than a threshold."""
+    value: float
+
+    def mask(self, column: pd.Series) -> np.ndarray:
+        return (pd.to_numeric(column, errors='coerce') > self.value).to_numpy(dtype=bool, na_value=False)
+
+
+@dataclass(frozen=True)
+class Below:
+    """Condition: numeric value strictly less than a threshold."""
+    value: float
+
+    def mask(self, column: pd.Series) -> np.ndarray:
+        return (pd.to_numeric(column, errors='coerce') < self.value).to_numpy(dtype=bool, na_value=False)
+
+
+@dataclass(frozen=True)
+class Contains:
+    """Condition: text contains a substring."""
+    text: str
+
+    def mask(self, column: pd.Series) -> np.ndarray:
+        return column.astype(str).str.contains(self.text, regex=False).to_numpy(dtype=bool, na_value=False)
+
+
+@dataclass(frozen=True)
+class Field:
+    """Output copied from a column of the matched row."""
+    name: str
+
+    def values(self, frame: pd.DataFrame) -> np.ndarray:
+        column = _column(frame, self.name)
+        values = column.to_numpy(dtype=object)
+        if not pd.api.types.is_numeric_dtype(column.dtype):
+            # Keys missing from some input dicts come back as NaN
+            values[pd.isna(values)] = None
+        return values
+
+
+@dataclass(frozen=True)
+class Format:
+    """Output built from a str.format template over the matched row's columns."""
+    template: str
+
+    def values(self, frame: pd.DataFrame) -> np.ndarray:
+        text = np.full(len(frame), '', dtype=object)
+        for literal, name, _, _ in Formatter().parse(self.template):
+            text = text + literal
+            if name is not None:
+                text = text + _column(frame, name).astype(str).to_numpy(dtype=object)
+        return text
+
+
+class DecisionTable:
+    """Declarative rules (conditions -> outputs), compiled once and evaluated over whole tables.
+
+    ``outputs`` fixes the keys of every emitted row and their order. Each
+    value is a constant, a Field or Format computed from the matched row, or
+    None when every rule supplies its own value. A rule is a dict of those
+    values plus ``when``: column -> condition, where a plain value means
+    equality, a list, tuple or set means "one of", and Above/Below/Contains
+    compare. With the ``first`` hit policy each row emits the first rule it
+    matches; with ``collect`` it emits every matching rule, in rule order.
+    Matching is one boolean mask per distinct condition, so generating
+    strategies for a large table is a handful of array operations.
+    """
+
+    HIT_POLICIES = ('first', 'collect')
+
+    def __init__(self, outputs: Dict[str, Any], rules: List[Dict[str, Any]], hit_policy: str = 'first'):
+        if hit_policy not in self.HIT_POLICIES:
+            raise ValueError(f"Unknown hit policy {hit_policy!r}; expected one of {self.HIT_POLICIES}")
+        self.outputs = outputs
+        self.rules = rules
+        self.hit_policy = hit_policy
+
+        # Compile: number the distinct (column, condition) pairs and give each rule its list
+        self._conditions: List[Tuple[str, Any]] = []
+        self._rule_conditions: List[List[int]] = []
+        positions: Dict[Tuple[str, Any], int] = {}
+        for rule in rules:
+            unknown = set(rule) - set(outputs) - {'when'}
+            missing = [key for key, spec in outputs.items() if spec is None and key not in rule]
+            if unknown or missing:
+                raise ValueError(f"Rule {rule!r} has unknown outputs {sorted(unknown)} or lacks {missing}")
+            indexes = []
+            for name, condition in rule.get('when', {}).items():
+                key = (name, _freeze(condition))
+                if key not in positions:
+                    positions[key] = len(self._conditions)
+                    self._conditions.append(key)
+                indexes.append(positions[key])
+            self._rule_conditions.append(indexes)
+
+        # Per-rule output values, indexed by the matched rule number
+        self._rule_values = {
+            key: _object_array([rule[key] for rule in rules]) for key, spec in outputs.items() if spec is None
+        }
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match(self, data: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """(row, rule) positions of every emitted output, in row order."""
+        frame = _as_frame(data)
+        masks = [_condition_mask(_column(frame, name), condition) for name, condition in self._conditions]
+        everything = np.ones(len(frame), dtype=bool)
+        matches = np.array([
+            np.logical_and.reduce([masks[i] for i in indexes]) if indexes else everything
+            for indexes in self._rule_conditions
+        ]).reshape(len(self.rules), len(frame))
+
+        if self.hit_policy == 'first':
+            rows = np.flatnonzero(matches.any(axis=0))
+            return rows, matches[:, rows].argmax(axis=0)
+        rows, rules = np.nonzero(matches.T)
+        return rows, rules
+
+    def columns(self, data: Any) -> Dict[str, np.ndarray]:
+        """Output arrays, one entry per hit, keyed in the order of ``outputs``."""
+        frame = _as_frame(data)
+        rows, rules = self.match(frame)
+        columns = {}
+        for key, spec in self.outputs.items():
+            if spec is None:
+                columns[key] = self._rule_values[key][rules]
+            elif isinstance(spec, (Field, Format)):
+                columns[key] = spec.values(frame)[rows]
+            else:
+                columns[key] = np.full(len(rows), spec, dtype=object)
+        return columns
+
+    def evaluate(self, data: Any) -> pd.DataFrame:
+        """Outputs as a DataFrame, for analysis over many rows."""
+        return pd.DataFrame(self.columns(data))
+
+    def records(self, data: Any) -> List[Dict[str, Any]]:
+        """Outputs as a list of dicts, the shape agents hand to the next phase."""
+        columns = self.columns(data)
+        keys = list(columns)
+        return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+def _as_frame(data: Any) -> pd.DataFrame:
+    """DataFrame view of a RecordTable, DataFrame or list of dicts."""
+    if isinstance(data, pd.DataFrame):
+        return data
+    frame = getattr(data, 'frame', None)
+    if isinstance(frame, pd.DataFrame):
+        return frame
+    return pd.DataFrame(list(data))
+
+
+def _column(frame: pd.DataFrame, name: str) -> pd.Series:
+    """A column, or all None when the rows do not have it."""
+    if name in frame:
+        return frame[name]
+    return pd.Series([None] * len(frame), index=frame.index, dtype=object)
+
+
+def _object_array(items: List[Any]) -> np.ndarray:
+    """1-D object array that keeps list or tuple items whole."""
+    array = np.empty(len(items), dtype=object)
+    for i, item in enumerate(items):
+        array[i] = item
+    return array
+
+
+def _freeze(condition: Any) -> Any:
+    """Hashable form of a condition, with lists and sets as 'one of' tuples."""
+    if isinstance(condition, (list, tuple, set, frozenset)):
+        return ('one of', frozenset(condition))
+    return condition
+
+
+def _condition_mask(column: pd.Series, condition: Any) -> np.ndarray:
+    if hasattr(condition, 'mask'):
+        return condition.mask(column)
+    values = list(condition[1]) if isinstance(condition, tuple) and condition[:1] == ('one of',) else [condition]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Compare integer codes instead of strings
+        categories = column.cat.categories
+        codes = [categories.get_loc(v) for v in values if v in categories]
+        return np.isin(column.cat.codes.to_numpy(), codes)
+    return column.isin(values).to_numpy(dtype=bool)
@@ -1,9 +1,42 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import requests
 from .base_agent import BaseAgent, AgentMode
+from .decision_table import Above, DecisionTable, Field
+from analytics.eviction_risk import load_eviction_model
+from analytics.snap import DEFAULT_VERSION as SNAP_VERSION, snap_benefits
+from analytics.zoning import load_zoning_overlay
+from data_sources.addresses import AddressLinks, load_address_keys
+from data_sources.records import Eviction, Parcel, Permit, RecordTable
+
+# Rental assistance for non-payment evictions
+ASSISTANCE_RULES = DecisionTable(
+    {'type': 'assistance', 'target': Field('address'), 'action': 'Provide rental assistance', 'priority': None},
+    [
+        {'when': {'reason': 'Non-payment', 'severity': Above(0.7)}, 'priority': 'high'},
+        {'when': {'reason': 'Non-payment'}, 'priority': 'medium'}
+    ]
+)
+
+ZONING_RULES = DecisionTable(
+    {'type': 'zoning', 'target': Field('address'), 'action': 'Zoning compliance assistance', 'priority': None},
+    [
+        {'when': {'issue_type': 'zoning_violation', 'severity': Above(0.7)}, 'priority': 'high'},
+        {'when': {'issue_type': 'zoning_violation'}, 'priority': 'medium'}
+    ]
+)
+
+# Illustrative San Francisco renter household facing eviction (monthly dollars); it is reported
+# as an example only, never as any address's eligibility
+SNAP_EXAMPLE_HOUSEHOLD = {'household_size': 2, 'gross_income': 2400.0, 'earned_income': 2400.0, 'shelter_cost': 1800.0,
+                  'deductions': 0.0}
+
+# Development potential by district family (the code before the dash)
+DEVELOPMENT_POTENTIAL = {'RH': 'low', 'RM': 'medium', 'RTO': 'medium', 'NC': 'medium', 'RC': 'high', 'C': 'high'}
+# Families where residential evictions are flagged as zoning compliance issues
+COMMERCIAL_FAMILIES = {'C'}
 
 class HousingOracle(BaseAgent):
     """Housing Oracle Agent: Predicts housing risks with parcel/zoning overlays and provides SNAP guidance."""
@@ -20,6 +53,9 @@ class HousingOracle(BaseAgent):
             'benefit_calculation': 'Monthly benefit amount calculation',
             'application_assistance': 'Application process guidance'
         }
+        self.snap_version = SNAP_VERSION
+        # Raw address -> normalized key, persisted so refreshed feeds only parse new addresses
+        self.address_keys = load_address_keys()
         
     def detect(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Detect housing issues using eviction and permit data."""
@@ -29,8 +65,11 @@ class HousingOracle(BaseAgent):
         # Simulate permit data
         permits = self._fetch_permit_data(data.get('location', 'San Francisco'))
         
+        # Simulate parcel roll fetch
+        parcels = self._fetch_parcel_data(data.get('location', 'San Francisco'))
+        
         # Detect parcel and zoning issues
-        parcel_issues = self._detect_parcel_issues(evictions, permits)
+        parcel_issues = self._detect_parcel_issues(evictions, permits, parcels)
         
         # Calculate confidence
         confidence = min(0.9, len(evictions) * 0.1 + len(parcel_issues) * 0.2)
@@ -42,6 +81,7 @@ class HousingOracle(BaseAgent):
         return {
             'evictions': evictions,
             'permits': permits,
+            'parcels': parcels,
             'parcel_issues': parcel_issues,
             'confidence': confidence,
             'mode': 'detect',
@@ -50,7 +90,7 @@ class HousingOracle(BaseAgent):
     
     def predict(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Predict housing risks with zoning ruleset simulation."""
-        evictions = data.get('evictions', [])
+        evictions = RecordTable.coerce(Eviction, data.get('evictions', []))
         parcel_issues = data.get('parcel_issues', [])
         
         # Predict eviction risks
@@ -80,14 +120,14 @@ class HousingOracle(BaseAgent):
     
     def prevent(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate prevention strategies with SNAP guidance."""
-        evictions = data.get('evictions', [])
+        evictions = RecordTable.coerce(Eviction, data.get('evictions', []))
         risk_predictions = data.get('risk_predictions', [])
         
         # Generate housing assistance strategies
         assistance_strategies = self._generate_assistance_strategies(evictions)
         
         # Generate SNAP guidance
-        snap_guidance = self._generate_snap_guidance(evictions)
+        snap_guidance = self._generate_snap_guidance(evictions, data.get('snap_households'))
         
         # Generate zoning compliance strategies
         zoning_strategies = self._generate_zoning_strategies(data.get('parcel_issues', []))
@@ -101,6 +141,7 @@ class HousingOracle(BaseAgent):
         return {
             'strategies': all_strategies,
             'snap_guidance': snap_guidance,
+            'snap_example': self._snap_example(),
             'assistance_strategies': assistance_strategies,
             'zoning_strategies': zoning_strategies,
             'confidence': confidence,
@@ -132,31 +173,71 @@ class HousingOracle(BaseAgent):
             'level_up_message': f"Broadcasting {len(evictions)} housing issues with SNAP guidance"
         }
     
-    def _fetch_eviction_data(self, location: str) -> List[Dict[str, Any]]:
+    def _fetch_eviction_data(self, location: str) -> RecordTable:
         """Simulate eviction data fetch."""
         mock_evictions = [
             {'id': 1, 'address': '123 Market St', 'reason': 'Non-payment', 'severity': 0.8, 'date': '2024-01-15'},
             {'id': 2, 'address': '456 Mission St', 'reason': 'Lease violation', 'severity': 0.6, 'date': '2024-01-14'},
             {'id': 3, 'address': '789 Castro St', 'reason': 'Non-payment', 'severity': 0.9, 'date': '2024-01-13'}
         ]
-        return mock_evictions
+        return RecordTable.from_records(Eviction, mock_evictions)
     
-    def _fetch_permit_data(self, location: str) -> List[Dict[str, Any]]:
+    def _fetch_permit_data(self, location: str) -> RecordTable:
         """Simulate permit data fetch."""
         mock_permits = [
             {'id': 1, 'address': '123 Market St', 'type': 'renovation', 'status': 'approved'},
             {'id': 2, 'address': '456 Mission St', 'type': 'new_construction', 'status': 'pending'},
             {'id': 3, 'address': '789 Castro St', 'type': 'demolition', 'status': 'approved'}
         ]
-        return mock_permits
+        return RecordTable.from_records(Permit, mock_permits)
+    
+    def _fetch_parcel_data(self, location: str) -> RecordTable:
+        """Simulate assessor parcel roll fetch."""
+        mock_parcels = [
+            {'id': '3707012', 'address': '123 MARKET STREET', 'zoning_district': 'C-3',
+             'latitude': 37.7929, 'longitude': -122.3971},
+            {'id': '3531004', 'address': '456 MISSION STREET', 'zoning_district': 'RM-2',
+             'latitude': 37.7887, 'longitude': -122.3985},
+            {'id': '3582031', 'address': '789 CASTRO STREET', 'zoning_district': 'RH-2',
+             'latitude': 37.7577, 'longitude': -122.4348},
+            {'id': '1232018', 'address': '321 HAIGHT STREET', 'zoning_district': 'RH-3',
+             'latitude': 37.7722, 'longitude': -122.4290}
+        ]
+        return RecordTable.from_records(Parcel, mock_parcels)
     
-    def _detect_parcel_issues(self, evictions: List[Dict[str, Any]], permits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _detect_parcel_issues(self, evictions: RecordTable, permits: RecordTable,
+                              parcels: RecordTable) -> List[Dict[str, Any]]:
         """Detect parcel and zoning compliance issues with Sim Francisco-inspired overlays."""
         parcel_issues = []
         
-        for eviction in evictions:
-            address = eviction['address']
-            parcel_analysis = self._analyze_parcel_overlay(address)
+        # Link evictions, permits and parcels by normalized address in one hash-join pass
+        keyed = {name: self.address_keys.lookup(table['address'])
+                 for name, table in (('evictions', evictions), ('permits', permits), ('parcels', parcels))}
+        links = AddressLinks(keyed)
+        parcel_ids = parcels['id'].to_numpy(dtype=object)
+        
+        # The parcel roll's recorded district wins; parcels without one are zoned in one batched polygon lookup
+        recorded = parcels['zoning_district'].to_numpy(dtype=object)
+        zoning = np.where(pd.notna(recorded) & (recorded != ''), recorded, None)
+        unzoned = pd.isna(zoning)
+        overlay = load_zoning_overlay()
+        if unzoned.any() and overlay is not None:
+            zoning[unzoned] = overlay.parcel_districts(parcel_ids[unzoned], parcels['latitude'].to_numpy()[unzoned],
+                                                      parcels['longitude'].to_numpy()[unzoned])
+        zoning = np.where(pd.isna(zoning), None, zoning)
+        
+        # One overlay analysis per district, shared by every eviction in it; evictions
+        # without a linked, zoned parcel have no known district and are not analyzed
+        eviction_parcels = links.first('evictions', 'parcels')
+        eviction_permits = links.counts('evictions', 'permits')
+        overlays = {}
+        for address, parcel, permit_count in zip(evictions['address'], eviction_parcels, eviction_permits):
+            district = zoning[parcel] if parcel >= 0 else None
+            if district is None:
+                continue
+            if district not in overlays:
+                overlays[district] = self._analyze_parcel_overlay(district)
+            parcel_analysis = overlays[district]
             
             if parcel_analysis['zoning_compliance'] == 'violation':
                 parcel_issues.append({
@@ -166,59 +247,79 @@ class HousingOracle(BaseAgent):
                     'description': parcel_analysis['description'],
                     'zoning_district': parcel_analysis['zoning_district'],
                     'development_potential': parcel_analysis['development_potential'],
-                    'affordability_impact': parcel_analysis['affordability_impact']
+                    'affordability_impact': parcel_analysis['affordability_impact'],
+                    'parcel_id': parcel_ids[parcel] if parcel >= 0 else None,
+                    'linked_permits': int(permit_count)
                 })
         
         # Add development opportunity issues
-        for permit in permits:
-            if permit['type'] == 'new_construction':
-                parcel_issues.append({
-                    'address': permit['address'],
-                    'issue_type': 'development_opportunity',
-                    'severity': 0.7,
-                    'description': 'New construction opportunity',
-                    'zoning_district': 'RM-2',
-                    'development_potential': 'high',
-                    'affordability_impact': 'positive'
-                })
+        permit_parcels = links.first('permits', 'parcels')
+        new_construction = permits.mask(type='new_construction')
+        for address, parcel in zip(permits['address'][new_construction], permit_parcels[new_construction]):
+            parcel_issues.append({
+                'address': address,
+                'issue_type': 'development_opportunity',
+                'severity': 0.7,
+                'description': 'New construction opportunity',
+                'zoning_district': zoning[parcel] if parcel >= 0 else None,
+                'development_potential': 'high',
+                'affordability_impact': 'positive',
+                'parcel_id': parcel_ids[parcel] if parcel >= 0 else None
+            })
         
         return parcel_issues
     
-    def _analyze_parcel_overlay(self, address: str) -> Dict[str, Any]:
-        """Analyze parcel with Sim Francisco-inspired overlays."""
-        # Simulate parcel analysis
+    def _analyze_parcel_overlay(self, zoning_district: str) -> Dict[str, Any]:
+        """Analyze a parcel's zoning district from the zoning map overlay."""
+        family = zoning_district.split('-')[0]
+        violation = family in COMMERCIAL_FAMILIES
         return {
-            'zoning_compliance': 'violation' if 'Market' in address else 'compliant',
-            'severity': 0.8 if 'Market' in address else 0.3,
-            'description': 'Zoning violation detected' if 'Market' in address else 'Compliant parcel',
-            'zoning_district': 'RM-2',
-            'development_potential': 'medium',
-            'affordability_impact': 'negative' if 'Market' in address else 'neutral'
+            'zoning_compliance': 'violation' if violation else 'compliant',
+            'severity': 0.8 if violation else 0.3,
+            'description': 'Zoning violation detected' if violation else 'Compliant parcel',
+            'zoning_district': zoning_district,
+            'development_potential': DEVELOPMENT_POTENTIAL.get(family, 'medium'),
+            'affordability_impact': 'negative' if violation else 'neutral'
         }
     
-    def _predict_eviction_risks(self, evictions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _predict_eviction_risks(self, evictions: RecordTable) -> List[Dict[str, Any]]:
         """Predict eviction risks based on patterns."""
         risks = []
         
         # Predict based on eviction patterns
-        non_payment_evictions = [e for e in evictions if e['reason'] == 'Non-payment']
+        non_payment_evictions = evictions.where(reason='Non-payment')
         if len(non_payment_evictions) > 1:
             risks.append({
                 'type': 'eviction_risk',
                 'prediction': 'Escalating non-payment eviction pattern',
-                'affected_areas': [e['address'] for e in non_payment_evictions],
+                'affected_areas': non_payment_evictions['address'].tolist(),
                 'confidence': 0.8
             })
         
-        # Predict individual risks
-        for eviction in evictions:
-            if eviction['severity'] > 0.7:
+        # Predict individual risks: score every eviction in one batched model call,
+        # or fall back to the severity rule until a model has been trained
+        model = load_eviction_model()
+        if model is None:
+            for address in evictions.filter(evictions['severity'].to_numpy() > 0.7)['address']:
                 risks.append({
                     'type': 'eviction_risk',
-                    'address': eviction['address'],
+                    'address': address,
                     'prediction': 'High risk of additional evictions',
                     'confidence': 0.75
                 })
+            return risks
+        
+        scores = model.predict_proba(evictions)
+        flagged = scores >= model.threshold
+        for address, score in zip(evictions['address'][flagged], scores[flagged]):
+            risks.append({
+                'type': 'eviction_risk',
+                'address': address,
+                'prediction': 'High risk of additional evictions',
+                'risk_score': round(float(score), 3),
+                'model_training_data': model.training_data,
+                'confidence': 0.75
+            })
         
         return risks
     
@@ -237,7 +338,7 @@ class HousingOracle(BaseAgent):
         
         return risks
     
-    def _predict_affordability_trends(self, evictions: List[Dict[str, Any]], parcel_issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _predict_affordability_trends(self, evictions: RecordTable, parcel_issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Predict affordability trends."""
         predictions = []
         
@@ -246,7 +347,7 @@ class HousingOracle(BaseAgent):
             predictions.append({
                 'type': 'affordability_trend',
                 'prediction': 'Declining housing affordability',
-                'affected_areas': [e['address'] for e in evictions],
+                'affected_areas': evictions['address'].tolist(),
                 'confidence': 0.8
             })
         
@@ -262,63 +363,92 @@ class HousingOracle(BaseAgent):
         
         return predictions
     
-    def _generate_assistance_strategies(self, evictions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _generate_assistance_strategies(self, evictions: RecordTable) -> List[Dict[str, Any]]:
         """Generate housing assistance strategies."""
-        strategies = []
-        
-        for eviction in evictions:
-            if eviction['reason'] == 'Non-payment':
-                strategies.append({
-                    'type': 'assistance',
-                    'target': eviction['address'],
-                    'action': 'Provide rental assistance',
-                    'priority': 'high' if eviction['severity'] > 0.7 else 'medium'
-                })
-        
-        return strategies
+        return ASSISTANCE_RULES.records(evictions)
     
-    def _generate_snap_guidance(self, evictions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Generate SNAP guidance for affected households."""
+    def _generate_snap_guidance(self, evictions: RecordTable, households: Optional[Any] = None) -> List[Dict[str, Any]]:
+        """Generate SNAP guidance for affected households, with eligibility and allotments where household data was given.
+
+        ``households`` holds one record per household with ``address``,
+        ``household_size``, ``gross_income`` and ``shelter_cost`` (plus
+        optional ``earned_income`` and ``deductions``), in monthly dollars.
+        """
         snap_guidance = []
+        known, benefits = self._household_benefits(evictions, households)
         
-        for eviction in evictions:
+        for i, eviction in enumerate(evictions):
             # Generate SNAP eligibility check
-            snap_guidance.append({
+            check = {
                 'type': 'snap_guidance',
-                'target': eviction['address'],
+                'target': eviction.address,
                 'action': 'SNAP eligibility verification',
-                'priority': 'high' if eviction['severity'] > 0.7 else 'medium'
-            })
+                'priority': 'high' if eviction.severity > 0.7 else 'medium'
+            }
+            if known[i]:
+                check['eligible'] = bool(benefits['eligible'][i])
+            snap_guidance.append(check)
             
             # Generate benefit calculation
-            snap_guidance.append({
+            calculation = {
                 'type': 'snap_guidance',
-                'target': eviction['address'],
+                'target': eviction.address,
                 'action': 'Monthly benefit calculation',
                 'priority': 'medium'
-            })
+            }
+            if known[i]:
+                calculation.update(estimated_allotment=int(benefits['allotment'][i]), parameters=self.snap_version)
+            snap_guidance.append(calculation)
             
-            # Generate application assistance
-            snap_guidance.append({
-                'type': 'snap_guidance',
-                'target': eviction['address'],
-                'action': 'Application process guidance',
-                'priority': 'medium'
-            })
+            # Generate application assistance, skipped only for households known to be ineligible
+            if not known[i] or benefits['eligible'][i]:
+                snap_guidance.append({
+                    'type': 'snap_guidance',
+                    'target': eviction.address,
+                    'action': 'Application process guidance',
+                    'priority': 'medium'
+                })
         
         return snap_guidance
     
+    def _household_benefits(self, evictions: RecordTable, households: Optional[Any]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Per eviction: whether household data matched its address, and snap_benefits for the matched ones."""
+        n = len(evictions)
+        known = np.zeros(n, dtype=bool)
+        benefits = {'eligible': np.zeros(n, dtype=bool), 'allotment': np.zeros(n)}
+        frame = pd.DataFrame(list(households or []))
+        if not n or frame.empty:
+            return known, benefits
+        
+        # Match on normalized address keys; the first record per address wins
+        household_keys = pd.Index(self.address_keys.lookup(frame['address'])['key'])
+        usable = np.flatnonzero(household_keys.notna() & ~household_keys.duplicated())
+        positions = household_keys[usable].get_indexer(self.address_keys.lookup(evictions['address'])['key'])
+        known = positions >= 0
+        matched = frame.iloc[usable[positions[known]]]
+        computed = snap_benefits(
+            matched['household_size'].to_numpy(), matched['gross_income'].to_numpy(), matched['shelter_cost'].to_numpy(),
+            matched['deductions'].fillna(0.0).to_numpy() if 'deductions' in matched else 0.0,
+            earned_income=matched['earned_income'].fillna(0.0).to_numpy() if 'earned_income' in matched else None,
+            version=self.snap_version
+        )
+        for name in benefits:
+            benefits[name][known] = computed[name]
+        return known, benefits
+    
+    def _snap_example(self) -> Dict[str, Any]:
+        """Eligibility and allotment for SNAP_EXAMPLE_HOUSEHOLD, labelled as an illustration."""
+        household = SNAP_EXAMPLE_HOUSEHOLD
+        benefits = snap_benefits(household['household_size'], household['gross_income'], household['shelter_cost'],
+                                 household['deductions'], earned_income=household['earned_income'], version=self.snap_version)
+        return {
+            'illustrative': True,
+            'household': dict(household),
+            'eligible': bool(benefits['eligible']),
+            'estimated_allotment': int(benefits['allotment']),
+            'parameters': self.snap_version
+        }
+    
     def _generate_zoning_strategies(self, parcel_issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate zoning compliance strategies."""
-        strategies = []
-        
-        for issue in parcel_issues:
-            if issue['issue_type'] == 'zoning_violation':
-                strategies.append({
-                    'type': 'zoning',
-                    'target': issue['address'],
-                    'action': 'Zoning compliance assistance',
-                    'priority': 'high' if issue['severity'] > 0.7 else 'medium'
-                })
-        
-        return strategies 
\ No newline at end of file
+        return ZONING_RULES.records(parcel_issues) 
\ No newline at end of file
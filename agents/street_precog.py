@@ -1,33 +1,82 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import timedelta
 import requests
 from .base_agent import BaseAgent, AgentMode
+from .decision_table import Above, DecisionTable, Field
+from analytics.clustering import SpatioTemporalDBSCAN, to_seconds
+from analytics.spatial import SpatialIndex
+from analytics.time_patterns import TimePatternMiner, wall_clock
+from data_sources.classifier import KeywordClassifier, SEVERITY_CLASSIFIER
+from data_sources.query import issue_location_stats
+from data_sources.records import Issue, RecordTable
+from data_sources.resilience import DataSourceUnavailable
+
+# Cleanup outreach for gross issues (and gross predictions)
+OUTREACH_RULES = DecisionTable(
+    {'type': 'outreach', 'target': Field('location'), 'action': 'Schedule cleanup crew', 'priority': None},
+    [
+        {'when': {'type': 'gross', 'severity': Above(0.7)}, 'priority': 'high'},
+        {'when': {'type': 'gross'}, 'priority': 'medium'}
+    ]
+)
+
+MAINTENANCE_RULES = DecisionTable(
+    {'type': 'maintenance', 'target': Field('location'), 'action': None, 'priority': None},
+    [
+        {'when': {'type': 'safety', 'severity': Above(0.7)}, 'action': 'Schedule safety inspection', 'priority': 'high'},
+        {'when': {'type': 'safety'}, 'action': 'Schedule safety inspection', 'priority': 'medium'},
+        {'when': {'type': 'accessibility'}, 'action': 'Schedule accessibility repair', 'priority': 'medium'}
+    ]
+)
+
+# Version of the built-in mock 311 rows; it keys cached time profiles the way a sync watermark would
+MOCK_311_SNAPSHOT = 'mock-311-v1'
 
 class StreetPrecog(BaseAgent):
     """Street Precog Agent: Detects and predicts street issues with 311 integration and QR-inspired patterns."""
     
-    def __init__(self):
+    def __init__(self, data_client=None):
         super().__init__("Street Precog", threshold=0.75)
+        self.data_client = data_client
         self.issue_patterns = {
             'gross': ['trash', 'litter', 'graffiti', 'vandalism'],
             'safety': ['broken_glass', 'potholes', 'streetlights'],
             'accessibility': ['sidewalk_obstruction', 'ramp_issues']
         }
+        self.issue_classifier = KeywordClassifier.from_groups(
+            self.issue_patterns.items(), 'other', separators_as_underscore=True
+        )
         self.qr_inspired_patterns = {
             'location_clusters': [],
             'time_patterns': {},
             'severity_scores': {}
         }
+        self.spatial_index: Optional[SpatialIndex] = None
+        self._indexed_issues: Optional[RecordTable] = None
+        
+        # Reports within 100 m and four hours of each other cluster; a week of reports is kept
+        self.clusterer = SpatioTemporalDBSCAN(eps_meters=100.0, eps_seconds=4 * 3600.0, min_samples=5)
+        self.cluster_window = timedelta(days=7)
+        self._clustered_issues: Optional[RecordTable] = None
+        self._newest_report = -np.inf
+        self.time_miner = TimePatternMiner()
         
     def detect(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Detect street issues using 311 API and QR-inspired patterns."""
         # Simulate 311 API call for street issues
         issues = self._fetch_311_data(data.get('location', 'San Francisco'))
+        issues = self._fill_issue_types(issues)
         
-        # QR-inspired pattern detection
-        qr_patterns = self._detect_qr_patterns(issues)
+        # Spatial index for nearby-issue queries and hexbin hotspots
+        self.spatial_index = SpatialIndex.from_frame(issues)
+        self._indexed_issues = issues
+        hotspots = self.spatial_index.hexbins().to_dict('records')
+        
+        # QR-inspired pattern detection, on server-side counts when a DataSF client is attached
+        location_stats = self._fetch_location_stats(data.get('location', 'San Francisco'))
+        qr_patterns = self._detect_qr_patterns(issues, location_stats, self._issues_snapshot(data.get('location', 'San Francisco')))
         
         # Calculate confidence based on pattern strength
         confidence = min(0.95, len(issues) * 0.1 + len(qr_patterns) * 0.2)
@@ -36,9 +85,11 @@ class StreetPrecog(BaseAgent):
         # Level-up: Add QR-inspired detection status
         self.add_level_up_feature('qr_patterns_detected', qr_patterns)
         self.add_level_up_feature('311_integration', f"Processed {len(issues)} 311 reports")
+        self.add_level_up_feature('spatial_hotspots', len(hotspots))
         
         return {
             'issues_detected': issues,
+            'issue_hotspots': hotspots,
             'qr_patterns': qr_patterns,
             'confidence': confidence,
             'mode': 'detect',
@@ -47,7 +98,7 @@ class StreetPrecog(BaseAgent):
     
     def predict(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Predict future street issues using weather and historical patterns."""
-        current_issues = data.get('issues_detected', [])
+        current_issues = RecordTable.coerce(Issue, data.get('issues_detected', []))
         weather_data = data.get('weather', {})
         
         # Predict based on weather conditions and historical patterns
@@ -79,20 +130,13 @@ class StreetPrecog(BaseAgent):
     def prevent(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate prevention strategies for street issues."""
         predictions = data.get('predictions', [])
-        current_issues = data.get('issues_detected', [])
+        current_issues = RecordTable.coerce(Issue, data.get('issues_detected', []))
         
         prevention_strategies = []
         
-        # Generate outreach strategies
-        for issue in current_issues + predictions:
-            if issue.get('type') == 'gross':
-                strategy = {
-                    'type': 'outreach',
-                    'target': issue.get('location'),
-                    'action': 'Schedule cleanup crew',
-                    'priority': 'high' if issue.get('severity', 0) > 0.7 else 'medium'
-                }
-                prevention_strategies.append(strategy)
+        # Generate outreach strategies: gross issues first, then gross predictions
+        prevention_strategies.extend(OUTREACH_RULES.records(current_issues))
+        prevention_strategies.extend(OUTREACH_RULES.records(predictions))
         
         # Generate maintenance strategies
         maintenance_strategies = self._generate_maintenance_strategies(current_issues)
@@ -136,39 +180,145 @@ class StreetPrecog(BaseAgent):
             'level_up_message': f"Broadcasting {len(issues)} issues with QR patterns"
         }
     
-    def _fetch_311_data(self, location: str) -> List[Dict[str, Any]]:
+    def _fetch_311_data(self, location: str) -> RecordTable:
         """Simulate 311 API call for street issues."""
         # Mock 311 data - in real implementation, this would call the actual API
         mock_issues = [
-            {'id': 1, 'type': 'gross', 'location': 'Market St', 'severity': 0.8, 'description': 'Trash accumulation'},
-            {'id': 2, 'type': 'safety', 'location': 'Mission St', 'severity': 0.6, 'description': 'Broken glass'},
-            {'id': 3, 'type': 'gross', 'location': 'Castro St', 'severity': 0.9, 'description': 'Graffiti'},
-            {'id': 4, 'type': 'accessibility', 'location': 'Haight St', 'severity': 0.5, 'description': 'Sidewalk obstruction'}
+            {'id': 1, 'type': 'gross', 'location': 'Market St', 'severity': 0.8, 'description': 'Trash accumulation',
+             'latitude': 37.7837, 'longitude': -122.4075, 'created_date': '2024-01-15T08:15:00'},
+            {'id': 2, 'type': 'safety', 'location': 'Mission St', 'severity': 0.6, 'description': 'Broken glass',
+             'latitude': 37.7650, 'longitude': -122.4194, 'created_date': '2024-01-16T07:40:00'},
+            {'id': 3, 'type': 'gross', 'location': 'Castro St', 'severity': 0.9, 'description': 'Graffiti',
+             'latitude': 37.7626, 'longitude': -122.4350, 'created_date': '2024-01-19T18:30:00'},
+            {'id': 4, 'type': 'accessibility', 'location': 'Haight St', 'severity': 0.5, 'description': 'Sidewalk obstruction',
+             'latitude': 37.7700, 'longitude': -122.4469, 'created_date': '2024-01-20T19:05:00'}
         ]
-        return mock_issues
+        return RecordTable.from_records(Issue, mock_issues)
+    
+    def _issues_snapshot(self, location: str) -> str:
+        """Version key of the rows _fetch_311_data returns (the sync watermark, once it reads synced data)."""
+        return f"{MOCK_311_SNAPSHOT}:{location}"
+    
+    def issues_near(self, latitude: float, longitude: float, meters: float = 250.0) -> RecordTable:
+        """Issues from the last detect() within ``meters`` of a point, nearest first."""
+        if self.spatial_index is None:
+            return RecordTable.from_records(Issue, [])
+        return self._indexed_issues.take(self.spatial_index.radius(latitude, longitude, meters))
+    
+    def ingest_reports(self, issues: Any) -> List[Dict[str, Any]]:
+        """Add newly streamed 311 reports to the location clusters and return the updated clusters."""
+        issues = self._fill_issue_types(RecordTable.coerce(Issue, issues))
+        if self._clustered_issues is None:
+            self._clustered_issues = RecordTable.from_records(Issue, [])
+        
+        # Only the new reports' neighborhoods are re-examined
+        seconds = self._report_seconds(issues)
+        self.clusterer.partial_fit(issues['latitude'], issues['longitude'], seconds)
+        self._clustered_issues = self._clustered_issues.append(issues)
+        
+        # Drop reports that have aged out of the window
+        self._newest_report = max(self._newest_report, self._newest_seconds(seconds))
+        keep = self.clusterer.expire(self._newest_report - self.cluster_window.total_seconds())
+        if not keep.all():
+            self._clustered_issues = self._clustered_issues.filter(keep)
+        
+        self.qr_inspired_patterns['location_clusters'] = self._summarize_clusters()
+        return self.qr_inspired_patterns['location_clusters']
+    
+    def _report_times(self, issues: RecordTable) -> np.ndarray:
+        """Report times as datetime64, parsed once (columns from frame_311_data already are); NaT where undated."""
+        return wall_clock(issues['created_date'])
+    
+    def _report_seconds(self, issues: RecordTable) -> np.ndarray:
+        """Report times as epoch seconds; undated reports stay NaN and are left out of the clusters."""
+        return to_seconds(self._report_times(issues))
+    
+    def _newest_seconds(self, seconds: np.ndarray) -> float:
+        """Latest dated report time, or -inf when no report is dated."""
+        dated = seconds[np.isfinite(seconds)]
+        return float(dated.max()) if len(dated) else -np.inf
+    
+    def _summarize_clusters(self) -> List[Dict[str, Any]]:
+        """One location_cluster pattern per density cluster, largest first."""
+        frame = self._clustered_issues.frame[['location', 'severity', 'latitude', 'longitude']].assign(
+            cluster=self.clusterer.labels_, reported=pd.to_datetime(self._clustered_issues['created_date'], errors='coerce'))
+        frame = frame[frame['cluster'] >= 0]
+        if frame.empty:
+            return []
+        
+        # Name each cluster after its most reported location
+        per_location = frame.groupby(['cluster', 'location'], observed=True).size()
+        names = per_location.sort_values(ascending=False, kind='stable').reset_index().drop_duplicates('cluster')
+        summary = frame.groupby('cluster').agg(
+            reports=('severity', 'size'), severity=('severity', 'mean'), latitude=('latitude', 'mean'),
+            longitude=('longitude', 'mean'), start=('reported', 'min'), end=('reported', 'max'))
+        summary['location'] = names.set_index('cluster')['location']
+        summary = summary.sort_values('reports', ascending=False, kind='stable')
+        
+        return [{
+            'type': 'location_cluster',
+            'location': row.location,
+            'count': int(row.reports),
+            'severity': float(row.severity),
+            'latitude': float(row.latitude),
+            'longitude': float(row.longitude),
+            'start': None if pd.isna(row.start) else row.start.isoformat(),
+            'end': None if pd.isna(row.end) else row.end.isoformat()
+        } for row in summary.itertuples()]
+    
+    def _fill_issue_types(self, issues: RecordTable) -> RecordTable:
+        """Fill in missing issue types from their descriptions using issue_patterns."""
+        types = issues['type']
+        missing = (types.isna() | (types == '')).to_numpy()
+        if not missing.any():
+            return issues
+        filled = types.astype(object).to_numpy(copy=True)
+        filled[missing] = self.issue_classifier.classify_array(issues['description'].to_numpy()[missing])
+        return issues.with_column('type', filled)
+    
+    def _fetch_location_stats(self, location: str) -> Optional[pd.DataFrame]:
+        """Issue count and mean severity per location, aggregated by DataSF (None without a client)."""
+        if self.data_client is None:
+            return None
+        try:
+            stats = self.data_client.aggregate(issue_location_stats(None if location == 'San Francisco' else location))
+        except DataSourceUnavailable as e:
+            print(f"Using local issue counts: {e}")
+            return None
+        
+        # Severity depends on request type, so weight each type's score by its count
+        stats['weighted'] = SEVERITY_CLASSIFIER.classify_array(stats['service_request_type'], dtype=float) * stats['count']
+        grouped = stats.groupby('street_address', sort=False)[['count', 'weighted']].sum()
+        return pd.DataFrame({'count': grouped['count'], 'severity': grouped['weighted'] / grouped['count']})
     
-    def _detect_qr_patterns(self, issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Detect QR-inspired patterns in issue data."""
+    def _detect_qr_patterns(self, issues: RecordTable, location_stats: Optional[pd.DataFrame] = None,
+                            snapshot: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Detect QR-inspired patterns in issue data; ``snapshot`` identifies its version for the time profile cache."""
         patterns = []
-        
-        # Location clustering
-        locations = [issue['location'] for issue in issues]
-        location_counts = pd.Series(locations).value_counts()
-        
-        for location, count in location_counts.items():
-            if count > 1:
-                patterns.append({
-                    'type': 'location_cluster',
-                    'location': location,
-                    'count': count,
-                    'severity': np.mean([i['severity'] for i in issues if i['location'] == location])
-                })
-        
-        # Time-based patterns (simulated)
-        time_patterns = {
-            'morning_peak': ['Market St', 'Mission St'],
-            'evening_peak': ['Castro St', 'Haight St']
-        }
+        times = self._report_times(issues)
+        
+        # Location clustering: server-side counts per street, else density clusters of nearby reports
+        if location_stats is not None:
+            clusters = location_stats[location_stats['count'] > 1].sort_values('count', ascending=False, kind='stable')
+            location_clusters = [{
+                'type': 'location_cluster',
+                'location': location,
+                'count': int(count),
+                'severity': float(severity)
+            } for location, count, severity in zip(clusters.index, clusters['count'], clusters['severity'])]
+        else:
+            seconds = to_seconds(times)
+            self.clusterer.fit(issues['latitude'], issues['longitude'], seconds)
+            self._clustered_issues = issues
+            self._newest_report = self._newest_seconds(seconds)
+            location_clusters = self._summarize_clusters()
+        self.qr_inspired_patterns['location_clusters'] = location_clusters
+        patterns.extend(location_clusters)
+        
+        # Time-based patterns: locations whose reports concentrate in a part of the day
+        profile = self.time_miner.profile(issues['location'], times, snapshot)
+        time_patterns = profile.period_peaks()
+        self.qr_inspired_patterns['time_patterns'] = time_patterns
         
         for time_period, affected_locations in time_patterns.items():
             patterns.append({
@@ -179,19 +329,18 @@ class StreetPrecog(BaseAgent):
         
         return patterns
     
-    def _predict_weather_impact(self, issues: List[Dict[str, Any]], weather: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _predict_weather_impact(self, issues: RecordTable, weather: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Predict weather impact on street issues."""
         predictions = []
         
         if weather.get('rain_probability', 0) > 0.7:
-            for issue in issues:
-                if issue['type'] == 'gross':
-                    predictions.append({
-                        'type': 'weather_impact',
-                        'issue_id': issue['id'],
-                        'prediction': 'Increased severity due to rain',
-                        'confidence': 0.8
-                    })
+            for issue_id in issues.where(type='gross')['id']:
+                predictions.append({
+                    'type': 'weather_impact',
+                    'issue_id': issue_id,
+                    'prediction': 'Increased severity due to rain',
+                    'confidence': 0.8
+                })
         
         return predictions
     
@@ -209,64 +358,45 @@ class StreetPrecog(BaseAgent):
         
         return rain_predictions
     
-    def _predict_pattern_based_issues(self, current_issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _predict_pattern_based_issues(self, current_issues: RecordTable) -> List[Dict[str, Any]]:
         """Predict issues based on detected patterns."""
         pattern_predictions = []
         
-        # Predict based on location patterns
-        for issue in current_issues:
-            if issue['type'] == 'gross' and issue['location'] == 'Market St':
-                pattern_predictions.append({
-                    'type': 'pattern_prediction',
-                    'location': 'Market St',
-                    'prediction': 'Continued trash accumulation pattern',
-                    'confidence': 0.7
-                })
+        # Predict based on location patterns: one prediction per gross issue on Market St
+        for _ in range(int(current_issues.mask(type='gross', location='Market St').sum())):
+            pattern_predictions.append({
+                'type': 'pattern_prediction',
+                'location': 'Market St',
+                'prediction': 'Continued trash accumulation pattern',
+                'confidence': 0.7
+            })
         
         # Predict based on issue type patterns
-        gross_issues = [i for i in current_issues if i['type'] == 'gross']
+        gross_issues = current_issues.where(type='gross')
         if len(gross_issues) > 2:
             pattern_predictions.append({
                 'type': 'pattern_prediction',
                 'prediction': 'Escalating gross issue pattern',
-                'affected_areas': [i['location'] for i in gross_issues],
+                'affected_areas': gross_issues['location'].tolist(),
                 'confidence': 0.8
             })
         
         return pattern_predictions
     
-    def _generate_maintenance_strategies(self, issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _generate_maintenance_strategies(self, issues: RecordTable) -> List[Dict[str, Any]]:
         """Generate maintenance-based prevention strategies."""
-        strategies = []
-        
-        for issue in issues:
-            if issue['type'] == 'safety':
-                strategies.append({
-                    'type': 'maintenance',
-                    'target': issue['location'],
-                    'action': 'Schedule safety inspection',
-                    'priority': 'high' if issue['severity'] > 0.7 else 'medium'
-                })
-            elif issue['type'] == 'accessibility':
-                strategies.append({
-                    'type': 'maintenance',
-                    'target': issue['location'],
-                    'action': 'Schedule accessibility repair',
-                    'priority': 'medium'
-                })
-        
-        return strategies
+        return MAINTENANCE_RULES.records(issues)
     
-    def _generate_safety_strategies(self, issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _generate_safety_strategies(self, issues: RecordTable) -> List[Dict[str, Any]]:
         """Generate safety-based prevention strategies."""
         strategies = []
         
-        safety_issues = [i for i in issues if i['type'] == 'safety']
-        if safety_issues:
+        safety_issues = issues.where(type='safety')
+        if len(safety_issues):
             strategies.append({
                 'type': 'safety',
                 'action': 'Deploy safety patrols',
-                'target_areas': [i['location'] for i in safety_issues],
+                'target_areas': safety_issues['location'].tolist(),
                 'priority': 'high'
             })
         
@@ -0,0 +1,233 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from pulp import PULP_CBC_CMD, LpAffineExpression, LpBinary, LpMaximize, LpProblem, LpSolutionOptimal, LpStatus, LpVariable
+from scipy import sparse
+from scipy.optimize import linprog
+
+DEFAULT_TIME_LIMIT = 10.0  # seconds CBC may search before returning its best solution
+DEFAULT_MIP_GAP = 1e-4  # relative optimality gap at which CBC stops
+# Candidate fields that group_budgets usually constrains; any candidate key works
+GROUP_FIELDS = ('agent', 'district', 'category')
+# Fields identifying a candidate across runs (for warm starts) when it has no ``id``
+KEY_FIELDS = ('agent', 'strategy', 'target')
+# Largest knapsack table (candidates x budget steps) solved exactly by dynamic programming
+DP_MAX_CELLS = 20000000
+
+
+class AllocationEngine:
+    """Selects strategies that maximize total benefit within budgets.
+
+    The overall budget can be combined with per-group budgets on any
+    candidate field (typically agent, district and category). The engine
+    picks the cheapest exact method for the instance: a sort when only
+    the overall budget applies and costs are uniform, dynamic programming
+    when the knapsack table is small, and otherwise a binary program whose
+    budget rows come from one sparse matrix. For that program the LP
+    relaxation (the fractional knapsack for a single budget, HiGHS for
+    several) gives an upper bound and, rounded down and topped
+    up greedily, a feasible selection; CBC only runs, under a time limit
+    and warm-started from the better of that and the previous selection
+    (by candidate ``id``, else KEY_FIELDS), when the selection is not
+    already within the MIP gap of the bound.
+    """
+
+    def __init__(self, time_limit: float = DEFAULT_TIME_LIMIT, mip_gap: float = DEFAULT_MIP_GAP, warm_start: bool = True,
+                 threads: Optional[int] = None):
+        self.time_limit = time_limit
+        self.mip_gap = mip_gap
+        self.warm_start = warm_start
+        self.threads = threads
+        self._previous: Dict[Any, bool] = {}
+
+    def allocate(self, candidates: List[Dict[str, Any]], budget: float,
+                 group_budgets: Optional[Dict[str, Dict[Any, float]]] = None) -> Dict[str, Any]:
+        """Choose candidates (dicts with cost and benefit) under the overall and group budgets."""
+        start = time.perf_counter()
+        cost = np.array([float(c['cost']) for c in candidates], dtype=np.float64)
+        benefit = np.array([float(c['benefit']) for c in candidates], dtype=np.float64)
+        matrix, limits = _budget_matrix(candidates, cost, budget, group_budgets or {})
+
+        # Step 1: free strategies are always taken; unprofitable ones, or ones over any of their budgets, never are
+        chosen = np.zeros(len(candidates), dtype=bool)
+        coo = matrix.tocoo()
+        too_costly = np.zeros(len(candidates), dtype=bool)
+        too_costly[coo.col[coo.data > limits[coo.row]]] = True
+        active = (benefit > 0) & ~too_costly
+        chosen[active & (cost <= 0)] = True
+        active &= cost > 0
+        index = np.flatnonzero(active)
+
+        # Step 2: solve the remaining candidates with the cheapest exact method
+        bound = None
+        if not len(index):
+            method, status, picked = 'trivial', 'Optimal', np.zeros(0, dtype=bool)
+        elif matrix.shape[0] == 1 and np.all(cost[index] == cost[index[0]]):
+            method, status, picked = 'greedy', 'Optimal', _uniform_fill(benefit[index], cost[index[0]], limits[0])
+        elif matrix.shape[0] == 1 and (weights := _integer_weights(cost[index], limits[0])) is not None:
+            method, status, picked = 'dynamic_programming', 'Optimal', _knapsack_dp(*weights, benefit[index])
+        else:
+            method = 'mip'
+            status, picked, bound = self._solve_mip(candidates, index, cost, benefit, matrix[:, index].tocsr(), limits)
+        chosen[index[picked]] = True
+
+        if self.warm_start:
+            self._previous = {_candidate_key(c): bool(chosen[i]) for i, c in enumerate(candidates)}
+        total_benefit = float(benefit[chosen].sum())
+        # Exact methods are their own bound; the MIP reports its LP bound with free candidates added back
+        bound = total_benefit if bound is None else bound + float(benefit[chosen & (cost <= 0)].sum())
+        return {
+            'selected_strategies': [candidates[i] for i in np.flatnonzero(chosen)],
+            'total_cost': float(cost[chosen].sum()),
+            'total_benefit': total_benefit,
+            'optimization_status': status,
+            'upper_bound': bound,
+            'gap': (bound - total_benefit) / bound if bound > 0 else 0.0,
+            'method': method,
+            'candidates': len(candidates),
+            'budget_constraints': matrix.shape[0],
+            'solve_time': time.perf_counter() - start
+        }
+
+    def _solve_mip(self, candidates: List[Dict[str, Any]], index: np.ndarray, cost: np.ndarray, benefit: np.ndarray,
+                   matrix: sparse.csr_matrix, limits: np.ndarray) -> Tuple[str, np.ndarray, Optional[float]]:
+        """Binary program over the active candidates, one budget row per sparse matrix row; returns status, picks, bound."""
+        benefit, cost = benefit[index], cost[index]
+
+        # Step 1: LP relaxation bound, and its whole candidates topped up greedily as an incumbent
+        if matrix.shape[0] == 1:
+            bound, whole = _fractional_bound(cost, benefit, float(limits[0]))
+        else:
+            relaxed = linprog(-benefit, A_ub=matrix, b_ub=limits, bounds=(0, 1), method='highs')
+            bound, whole = (-float(relaxed.fun), relaxed.x > 1 - 1e-9) if relaxed.status == 0 else (None, None)
+        incumbent = _greedy_fill(cost, benefit, matrix, limits, whole)
+        if self.warm_start:
+            previous = np.array([self._previous.get(_candidate_key(candidates[i]), False) for i in index])
+            if np.all(matrix @ previous.astype(np.float64) <= limits) and benefit @ previous > benefit @ incumbent:
+                incumbent = previous
+        if bound is not None and bound - benefit @ incumbent <= self.mip_gap * abs(bound):
+            return 'Optimal', incumbent, bound
+
+        # Step 2: CBC from the incumbent, under the time limit
+        prob = LpProblem("Resource_Allocation", LpMaximize)
+        choose = [LpVariable(f"strategy_{i}", 0, 1, LpBinary) for i in index]
+        prob += LpAffineExpression(zip(choose, benefit.tolist()))
+        for row in range(matrix.shape[0]):
+            lo, hi = matrix.indptr[row], matrix.indptr[row + 1]
+            members = [choose[j] for j in matrix.indices[lo:hi]]
+            prob += LpAffineExpression(zip(members, matrix.data[lo:hi].tolist())) <= float(limits[row]), f"budget_{row}"
+        if self.warm_start:
+            for variable, value in zip(choose, incumbent.tolist()):
+                variable.setInitialValue(int(value))
+
+        prob.solve(PULP_CBC_CMD(msg=False, timeLimit=self.time_limit, gapRel=self.mip_gap, warmStart=self.warm_start,
+                                threads=self.threads))
+        picked = np.array([(v.value() or 0) > 0.5 for v in choose], dtype=bool)
+        if not np.all(matrix @ picked.astype(np.float64) <= limits + 1e-6):
+            # No solution within the time limit: fall back to the feasible incumbent
+            return 'Heuristic', incumbent, bound
+        status = LpStatus[prob.status] if prob.sol_status == LpSolutionOptimal else 'Feasible'
+        # CBC may stop within the gap below its warm start; keep whichever is better
+        if benefit @ picked < benefit @ incumbent:
+            picked = incumbent
+        return status, picked, bound
+
+
+def _candidate_key(candidate: Dict[str, Any]) -> Any:
+    """Identity of a candidate across runs: its ``id``, else its KEY_FIELDS."""
+    return candidate['id'] if 'id' in candidate else tuple(candidate.get(field) for field in KEY_FIELDS)
+
+
+def _budget_matrix(candidates: List[Dict[str, Any]], cost: np.ndarray, budget: float,
+                   group_budgets: Dict[str, Dict[Any, float]]) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """Sparse (budgets x candidates) cost matrix and the limit of each row; row 0 is the overall budget."""
+    rows, cols, limits = [np.zeros(len(candidates), dtype=np.int64)], [np.arange(len(candidates))], [float(budget)]
+    for field, budgets in group_budgets.items():
+        offset = len(limits)
+        row_of = {value: offset + r for r, value in enumerate(budgets)}
+        limits.extend(float(limit) for limit in budgets.values())
+        members = [(row_of[c[field]], i) for i, c in enumerate(candidates) if c.get(field) in row_of]
+        if members:
+            field_rows, field_cols = zip(*members)
+            rows.append(np.array(field_rows, dtype=np.int64))
+            cols.append(np.array(field_cols, dtype=np.int64))
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    matrix = sparse.csr_matrix((cost[cols], (rows, cols)), shape=(len(limits), len(candidates)))
+    return matrix, np.array(limits, dtype=np.float64)
+
+
+def _uniform_fill(benefit: np.ndarray, cost: float, budget: float) -> np.ndarray:
+    """With equal costs the optimum is simply the most beneficial candidates that fit."""
+    picked = np.zeros(len(benefit), dtype=bool)
+    picked[np.argsort(-benefit, kind='stable')[:int(budget // cost)]] = True
+    return picked
+
+
+def _integer_weights(cost: np.ndarray, budget: float) -> Optional[Tuple[np.ndarray, int]]:
+    """Costs and budget in units of the costs' common divisor, when whole-dollar and small enough for DP."""
+    if not np.all(cost == np.round(cost)):
+        return None
+    unit = int(np.gcd.reduce(cost.astype(np.int64)))
+    capacity = int(budget // unit)
+    if len(cost) * (capacity + 1) > DP_MAX_CELLS:
+        return None
+    return cost.astype(np.int64) // unit, capacity
+
+
+def _knapsack_dp(weights: np.ndarray, capacity: int, benefit: np.ndarray) -> np.ndarray:
+    """Exact 0/1 knapsack, one vectorized pass over the capacity axis per candidate."""
+    best = np.zeros(capacity + 1)
+    take = np.zeros((len(weights), capacity + 1), dtype=bool)
+    for i, (weight, value) in enumerate(zip(weights.tolist(), benefit.tolist())):
+        with_item = best[:capacity + 1 - weight] + value
+        improved = with_item > best[weight:]
+        take[i, weight:] = improved
+        best[weight:] = np.where(improved, with_item, best[weight:])
+
+    picked = np.zeros(len(weights), dtype=bool)
+    remaining = capacity
+    for i in range(len(weights) - 1, -1, -1):
+        if take[i, remaining]:
+            picked[i] = True
+            remaining -= int(weights[i])
+    return picked
+
+
+def _fractional_bound(cost: np.ndarray, benefit: np.ndarray, budget: float) -> Tuple[float, np.ndarray]:
+    """LP bound of a single knapsack (whole candidates by benefit per dollar, then part of the next) and the whole ones."""
+    order = np.argsort(-benefit / cost, kind='stable')
+    spent = np.cumsum(cost[order])
+    fits = int(np.searchsorted(spent, budget, side='right'))
+    whole = np.zeros(len(cost), dtype=bool)
+    whole[order[:fits]] = True
+    bound = float(benefit[order[:fits]].sum())
+    if fits < len(cost):
+        left = budget - (spent[fits - 1] if fits else 0.0)
+        bound += float(benefit[order[fits]]) * left / float(cost[order[fits]])
+    return bound, whole
+
+
+def _greedy_fill(cost: np.ndarray, benefit: np.ndarray, matrix: sparse.csr_matrix, limits: np.ndarray,
+                 taken: Optional[np.ndarray] = None) -> np.ndarray:
+    """Feasible selection: ``taken`` (when it fits), then candidates by benefit per dollar while their budgets have room."""
+    columns = matrix.tocsc()
+    picked = np.zeros(len(cost), dtype=bool) if taken is None else taken.copy()
+    remaining = limits - matrix @ picked.astype(np.float64)
+    if np.any(remaining < 0):
+        picked[:] = False
+        remaining = limits.copy()
+    for j in np.argsort(-benefit / cost, kind='stable').tolist():
+        if picked[j]:
+            continue
+        rows = columns.indices[columns.indptr[j]:columns.indptr[j + 1]]
+        if np.all(remaining[rows] >= cost[j]):
+            remaining[rows] -= cost[j]
+            picked[j] = True
+    return picked
+
+
+def allocate_budget(candidates: List[Dict[str, Any]], budget: float, group_budgets: Optional[Dict[str, Dict[Any, float]]] = None,
+                    time_limit: float = DEFAULT_TIME_LIMIT, mip_gap: float = DEFAULT_MIP_GAP) -> Dict[str, Any]:
+    """One-call AllocationEngine(time_limit, mip_gap).allocate(...)."""
+    return AllocationEngine(time_limit, mip_gap).allocate(candidates, budget, group_budgets)
@@ -0,0 +1,185 @@
+from typing import Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+from .spatial import project
+
+
+def to_seconds(timestamps: Any) -> np.ndarray:
+    """Timestamps (datetime-like or epoch seconds) as float seconds, NaN where missing."""
+    values = np.asarray(timestamps)
+    if values.dtype.kind in 'iuf':
+        return values.astype(np.float64)
+    if values.dtype.kind == 'M':
+        return np.where(np.isnat(values), np.nan, values.astype('datetime64[ns]').view(np.int64) / 1e9)
+    parsed = pd.to_datetime(pd.Series(values), errors='coerce')
+    seconds = parsed.dt.tz_localize(None) if parsed.dt.tz is not None else parsed
+    return np.where(parsed.isna(), np.nan, seconds.to_numpy('datetime64[ns]').astype(np.int64) / 1e9)
+
+
+class SpatioTemporalDBSCAN:
+    """DBSCAN over (latitude, longitude, time) with separate spatial and temporal radii.
+
+    Two reports are neighbors when they are within ``eps_meters`` on the
+    ground and ``eps_seconds`` in time; a report with at least ``min_samples``
+    neighbors (itself included) is a core point, connected core points form
+    a cluster and other reports near a core point join its cluster as border
+    points. Neighbors come from a KD-tree over (x, y, scaled time) queried
+    with Chebyshev boxes, then filtered by true ground distance.
+
+    partial_fit() adds reports incrementally. Inserting points can only
+    promote points to core and merge clusters, so only the new points and the
+    points they promote are re-queried. expire() drops old reports and refits
+    the rest, because removals can split clusters.
+    """
+
+    def __init__(self, eps_meters: float = 150.0, eps_seconds: Optional[float] = 86400.0, min_samples: int = 5):
+        self.eps_meters = eps_meters
+        self.eps_seconds = eps_seconds
+        self.min_samples = min_samples
+        self._reset()
+
+    def _reset(self):
+        self._latitude = np.empty(0)
+        self._longitude = np.empty(0)
+        self._seconds = np.empty(0)
+        self._rows = np.empty(0, dtype=np.int64)   # row position of each indexed point
+        self._xyz = np.empty((0, 3))
+        self._counts = np.empty(0, dtype=np.int64)
+        self._core = np.empty(0, dtype=bool)
+        self._component = np.empty(0, dtype=np.int64)
+        self._tree: Optional[cKDTree] = None
+        self._labels: Optional[np.ndarray] = None
+
+    def fit(self, latitude: Any, longitude: Any, timestamps: Any = None) -> 'SpatioTemporalDBSCAN':
+        self._reset()
+        return self.partial_fit(latitude, longitude, timestamps)
+
+    def partial_fit(self, latitude: Any, longitude: Any, timestamps: Any = None) -> 'SpatioTemporalDBSCAN':
+        """Add reports; their row positions continue after the ones already added."""
+        latitude = np.asarray(latitude, dtype=np.float64)
+        longitude = np.asarray(longitude, dtype=np.float64)
+        seconds = np.zeros(len(latitude)) if timestamps is None else to_seconds(timestamps)
+        start = len(self._latitude)
+        self._latitude = np.concatenate([self._latitude, latitude])
+        self._longitude = np.concatenate([self._longitude, longitude])
+        self._seconds = np.concatenate([self._seconds, seconds])
+        self._labels = None
+
+        # Step 1: index the new reports that have a place and a time
+        valid = np.isfinite(latitude) & np.isfinite(longitude) & np.isfinite(seconds)
+        if not valid.any():
+            return self
+        old = len(self._rows)
+        xy = project(latitude[valid], longitude[valid])
+        z = seconds[valid] * self._time_scale()
+        self._rows = np.concatenate([self._rows, start + np.flatnonzero(valid)])
+        self._xyz = np.vstack([self._xyz, np.column_stack([xy, z])])
+        self._tree = cKDTree(self._xyz)
+        added = np.arange(old, len(self._rows))
+
+        # Step 2: new points count their neighbors; old points gain one per new neighbor
+        src, dst = self._neighbors(added)
+        counts = np.concatenate([self._counts, np.zeros(len(added), dtype=np.int64)])
+        counts[added] = np.bincount(src - old, minlength=len(added))
+        counts[:old] += np.bincount(dst[dst < old], minlength=old)
+        self._counts = counts
+
+        # Step 3: link points that just became core to every core neighbor
+        core = np.concatenate([self._core, np.zeros(len(added), dtype=bool)])
+        promoted = np.flatnonzero((counts >= self.min_samples) & ~core)
+        core[promoted] = True
+        self._core = core
+        src, dst = self._neighbors(promoted)
+        linked = core[dst]
+        self._merge(src[linked], dst[linked])
+        return self
+
+    def expire(self, before: Any) -> np.ndarray:
+        """Drop reports older than ``before`` and refit; returns the kept-rows mask for the caller's own data."""
+        cutoff = float(to_seconds([before])[0])
+        keep = ~(self._seconds < cutoff)
+        if keep.all():
+            return keep
+        latitude, longitude, seconds = self._latitude[keep], self._longitude[keep], self._seconds[keep]
+        self._reset()
+        self.partial_fit(latitude, longitude, seconds)
+        return keep
+
+    @property
+    def labels_(self) -> np.ndarray:
+        """Cluster per row (0, 1, ... in order of first appearance), -1 for noise or unplaceable rows."""
+        if self._labels is None:
+            self._labels = self._compute_labels()
+        return self._labels
+
+    @property
+    def n_clusters_(self) -> int:
+        return int(self.labels_.max()) + 1 if len(self.labels_) else 0
+
+    @property
+    def core_sample_mask_(self) -> np.ndarray:
+        mask = np.zeros(len(self._latitude), dtype=bool)
+        mask[self._rows[self._core]] = True
+        return mask
+
+    def _time_scale(self) -> float:
+        """Meters per second, so eps_seconds of time spans eps_meters in the tree."""
+        return self.eps_meters / self.eps_seconds if self.eps_seconds else 0.0
+
+    def _neighbors(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(point, neighbor) index pairs within both radii, each point included as its own neighbor."""
+        if not len(points):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        # A tree over just the queried points, joined against the full tree in one C pass
+        pairs = cKDTree(self._xyz[points]).sparse_distance_matrix(
+            self._tree, self.eps_meters, p=np.inf, output_type='ndarray')
+        src = points[pairs['i']]
+        dst = pairs['j'].astype(np.int64)
+        # The Chebyshev box is a square on the ground; keep the circle
+        delta = self._xyz[src, :2] - self._xyz[dst, :2]
+        close = np.einsum('ij,ij->i', delta, delta) <= self.eps_meters ** 2
+        return src[close], dst[close]
+
+    def _merge(self, src: np.ndarray, dst: np.ndarray):
+        """Union the core-core edges into the existing components."""
+        n = len(self._rows)
+        previous = np.concatenate([self._component, np.arange(len(self._component), n)])
+        # Chain every point to its component's representative so old clusters stay joined
+        representative = np.full(n, -1, dtype=np.int64)
+        representative[previous[::-1]] = np.arange(n)[::-1]
+        rows = np.concatenate([src, np.arange(n)])
+        cols = np.concatenate([dst, representative[previous]])
+        graph = coo_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+        self._component = connected_components(graph, directed=False)[1].astype(np.int64)
+
+    def _compute_labels(self) -> np.ndarray:
+        labels = np.full(len(self._latitude), -1, dtype=np.int64)
+        if not len(self._rows):
+            return labels
+        point_labels = np.where(self._core, self._component, -1)
+
+        # Border points join the cluster of their nearest core neighbor
+        border = np.flatnonzero(~self._core & (self._counts > 1))
+        src, dst = self._neighbors(border)
+        linked = self._core[dst]
+        src, dst = src[linked], dst[linked]
+        if len(src):
+            distance = np.hypot(*(self._xyz[src, :2] - self._xyz[dst, :2]).T)
+            order = np.lexsort((distance, src))
+            points, first = np.unique(src[order], return_index=True)
+            point_labels[points] = self._component[dst[order][first]]
+
+        # Number clusters 0..k-1 in order of first appearance
+        labels[self._rows] = point_labels
+        clustered = labels >= 0
+        components, first_row = np.unique(labels[clustered], return_index=True)
+        order = np.argsort(first_row, kind='stable')
+        renumber = np.empty(len(components), dtype=np.int64)
+        renumber[order] = np.arange(len(components))
+        labels[clustered] = renumber[np.searchsorted(components, labels[clustered])]
+        return labels
@@ -0,0 +1,210 @@
+import argparse
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier
+
+from data_sources.addresses import normalize_addresses
+
+# Next to the package rather than the working directory; EVICTION_MODEL_PATH overrides it
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data_cache', 'models',
+                                  'eviction_risk.joblib')
+MODEL_VERSION = 2
+TRAIN_ROWS = 100000
+# Label: another eviction at the same address within this many days
+HORIZON_DAYS = 180
+# Share of training evictions scoring at or above the model's flag threshold
+FLAG_RATE = 0.2
+
+CATEGORICAL_FEATURES = ['reason', 'neighborhood']
+NUMERIC_FEATURES = ['severity', 'month', 'weekday', 'prior_at_address']
+FEATURES = CATEGORICAL_FEATURES + NUMERIC_FEATURES
+
+_MODELS: Dict[str, Tuple[Optional[int], Optional['EvictionRiskModel']]] = {}
+_LOCK = threading.Lock()
+LOAD_STATS = {'hits': 0, 'loads': 0, 'missing': 0}
+# training_data of models fitted on SyntheticCityGenerator evictions
+SYNTHETIC = 'synthetic'
+
+
+def eviction_features(evictions: Any) -> pd.DataFrame:
+    """Model inputs for an eviction RecordTable or frame, one row per eviction.
+
+    ``prior_at_address`` counts the earlier evictions at the same normalized
+    address within the same table, so a feed scores against its own history.
+    """
+    frame = getattr(evictions, 'frame', evictions)
+    n = len(frame)
+    dates = pd.to_datetime(frame['date'], errors='coerce') if 'date' in frame else pd.Series(pd.NaT, index=frame.index)
+    dates = dates.reset_index(drop=True)
+
+    # Address key per row, parsing each distinct address once
+    codes, uniques = pd.factorize(frame['address'].reset_index(drop=True)) if 'address' in frame else (np.full(n, -1), [])
+    keys = normalize_addresses(uniques)['key'].to_numpy(dtype=object) if len(uniques) else np.empty(0, dtype=object)
+    address = pd.Series(np.where(codes >= 0, keys[np.maximum(codes, 0)] if len(keys) else None, None), dtype=object)
+    order = dates.sort_values(kind='stable').index
+    prior = address[order].groupby(address[order], dropna=False).cumcount().reindex(range(n))
+
+    def text(name: str) -> pd.Series:
+        return frame[name].astype(str).reset_index(drop=True) if name in frame else pd.Series([''] * n, dtype=object)
+
+    return pd.DataFrame({
+        'reason': text('reason'),
+        'neighborhood': text('neighborhood'),
+        'severity': pd.to_numeric(frame['severity'], errors='coerce').reset_index(drop=True)
+                    if 'severity' in frame else np.full(n, np.nan),
+        'month': dates.dt.month.astype(float),
+        'weekday': dates.dt.weekday.astype(float),
+        'prior_at_address': np.where(address.isna(), 0, prior).astype(float),
+        'address_key': address
+    })
+
+
+def repeat_labels(features: pd.DataFrame, dates: pd.Series, horizon_days: int = HORIZON_DAYS) -> np.ndarray:
+    """1 where the same address sees another eviction within horizon_days after this one."""
+    dates = pd.to_datetime(dates, errors='coerce').reset_index(drop=True)
+    frame = pd.DataFrame({'key': features['address_key'], 'date': dates}).dropna()
+    frame = frame.sort_values(['key', 'date'], kind='stable')
+    following = frame.groupby('key')['date'].shift(-1)
+    repeat = (following - frame['date']) <= pd.Timedelta(days=horizon_days)
+    labels = np.zeros(len(features), dtype=np.int8)
+    labels[frame.index[repeat.to_numpy(dtype=bool, na_value=False)]] = 1
+    return labels
+
+
+class EvictionRiskModel:
+    """Gradient-boosted repeat-eviction risk over reason, place, timing and address history.
+
+    Categories are encoded against the training vocabulary (unseen values
+    count as missing), so scoring a whole table is one feature pass and one
+    batched predict_proba call. ``threshold`` is the score at which the
+    model flags the top FLAG_RATE of its training evictions, and
+    ``training_data`` names what it was fitted on (SYNTHETIC for generated
+    evictions), so callers can tell demo scores from real ones.
+    """
+
+    def __init__(self, estimator: HistGradientBoostingClassifier, vocabularies: Dict[str, List[str]],
+                 threshold: float, training_data: str, version: int = MODEL_VERSION):
+        self.estimator = estimator
+        self.vocabularies = vocabularies
+        self.threshold = threshold
+        self.training_data = training_data
+        self.version = version
+
+    @property
+    def synthetic(self) -> bool:
+        return self.training_data == SYNTHETIC
+
+    @classmethod
+    def train(cls, evictions: Any, training_data: str, horizon_days: int = HORIZON_DAYS, seed: int = 0) -> 'EvictionRiskModel':
+        features = eviction_features(evictions)
+        labels = repeat_labels(features, getattr(evictions, 'frame', evictions)['date'], horizon_days)
+        vocabularies = {name: sorted(features[name].unique().tolist()) for name in CATEGORICAL_FEATURES}
+        estimator = HistGradientBoostingClassifier(
+            max_iter=100, learning_rate=0.1, random_state=seed,
+            categorical_features=[name in CATEGORICAL_FEATURES for name in FEATURES]
+        )
+        model = cls(estimator, vocabularies, threshold=0.5, training_data=training_data)
+        estimator.fit(model._matrix(features), labels)
+        scores = estimator.predict_proba(model._matrix(features))[:, 1]
+        model.threshold = float(np.quantile(scores, 1 - FLAG_RATE))
+        return model
+
+    def _matrix(self, features: pd.DataFrame) -> np.ndarray:
+        """Float feature matrix; categories become vocabulary positions, NaN when unseen."""
+        columns = []
+        for name in CATEGORICAL_FEATURES:
+            codes = pd.Index(self.vocabularies[name]).get_indexer(features[name]).astype(float)
+            codes[codes < 0] = np.nan
+            columns.append(codes)
+        columns.extend(features[name].to_numpy(dtype=float) for name in NUMERIC_FEATURES)
+        return np.column_stack(columns) if columns else np.empty((len(features), 0))
+
+    def predict_proba(self, evictions: Any) -> np.ndarray:
+        """Repeat-eviction probability for every row, in one batched call."""
+        features = eviction_features(evictions)
+        if not len(features):
+            return np.empty(0)
+        return self.estimator.predict_proba(self._matrix(features))[:, 1]
+
+    def save(self, path: str) -> str:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Uncompressed, so load() can memory-map the fitted arrays; written aside and
+        # renamed into place so other processes never read a half-written artifact
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(self, tmp_path, compress=0)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> 'EvictionRiskModel':
+        """Load an artifact with its arrays memory-mapped read-only instead of copied."""
+        return joblib.load(path, mmap_mode='r')
+
+
+def training_evictions(rows: int = TRAIN_ROWS, seed: int = 42) -> pd.DataFrame:
+    """A year of synthetic evictions, for a demo artifact without a DataSF pull."""
+    from data_sources.synthetic import SyntheticCityGenerator
+    return SyntheticCityGenerator(seed=seed).to_frame('evictions', rows)
+
+
+def model_path(path: Optional[str] = None) -> str:
+    """Absolute artifact path: ``path``, else EVICTION_MODEL_PATH, else DEFAULT_MODEL_PATH."""
+    return os.path.abspath(path or os.environ.get('EVICTION_MODEL_PATH') or DEFAULT_MODEL_PATH)
+
+
+def load_eviction_model(path: Optional[str] = None) -> Optional[EvictionRiskModel]:
+    """The process-wide model for an artifact path (see model_path), or None when it is missing or outdated.
+
+    The loaded model is kept per process and only reloaded when the artifact
+    file changes, so Streamlit reruns and new agent instances reuse it.
+    Models are trained by this module's CLI, never on the request path.
+    """
+    path = model_path(path)
+    with _LOCK:
+        mtime = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+        cached = _MODELS.get(path)
+        if cached is not None and cached[0] == mtime:
+            LOAD_STATS['hits'] += 1
+            return cached[1]
+
+        try:
+            model = EvictionRiskModel.load(path) if mtime is not None else None
+        except Exception as e:
+            print(f"⚠️ Could not load eviction risk model {path}: {e}")
+            model = None
+        if model is not None and getattr(model, 'version', None) != MODEL_VERSION:
+            model = None
+        if model is None:
+            LOAD_STATS['missing'] += 1
+            print(f"⚠️ No current eviction risk model at {path}; train one with python -m analytics.eviction_risk")
+        else:
+            LOAD_STATS['loads'] += 1
+        _MODELS[path] = (mtime, model)
+        return model
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Train the eviction risk model and write its artifact.")
+    parser.add_argument('--data', default=None, help="Parquet file of evictions (default: synthetic)")
+    parser.add_argument('--rows', type=int, default=TRAIN_ROWS, help="Synthetic rows when --data is not given")
+    parser.add_argument('--out', default=None, help="Artifact path (default: EVICTION_MODEL_PATH, else DEFAULT_MODEL_PATH)")
+    args = parser.parse_args(argv)
+    args.out = model_path(args.out)
+
+    evictions = pd.read_parquet(args.data) if args.data else training_evictions(args.rows)
+    model = EvictionRiskModel.train(evictions, training_data=os.path.abspath(args.data) if args.data else SYNTHETIC)
+    model.save(args.out)
+    print(f"✅ Trained on {len(evictions):,} {'synthetic ' if model.synthetic else ''}evictions; "
+          f"flag threshold {model.threshold:.3f} -> {args.out}")
+
+
+if __name__ == "__main__":
+    # Run through the importable module so the artifact pickles analytics.eviction_risk.EvictionRiskModel, not __main__'s
+    from analytics.eviction_risk import main as module_main
+    module_main()
@@ -0,0 +1,128 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.special import ndtri
+
+DEFAULT_TRIALS = 100000
+# Trials drawn per chunk; each chunk has its own seeded stream, so results do not depend on the worker count
+CHUNK_TRIALS = 50000
+PERCENTILES = (5, 50, 95)
+
+# Outcome model defaults, overridable per opportunity with the same keys
+AWARD_SHARE = 0.85  # mean share of the requested amount awarded when a grant is won
+AWARD_CONCENTRATION = 20.0  # Beta concentration of that share
+ROI_UNCERTAINTY = 0.2  # lognormal sigma of the realized ROI multiplier
+# Correlation of award outcomes through a shared federal appropriations climate
+COMMON_SHOCK = 0.3
+
+
+def _simulate_chunk(params: Dict[str, np.ndarray], trials: int, seed: np.random.SeedSequence) -> Tuple[np.ndarray, ...]:
+    """Draw one chunk of trials x programs outcomes; returns per-trial totals and per-program sums."""
+    rng = np.random.default_rng(seed)
+    n = len(params['amount'])
+    rho = params['correlation']
+
+    # Step 1: awards, correlated through one common factor per trial (Gaussian copula)
+    z = rho * rng.standard_normal((trials, 1)) + np.sqrt(1 - rho ** 2) * rng.standard_normal((trials, n))
+    awarded = z < params['threshold']
+
+    # Step 2: only awarded cells get a paid share of the amount and a realized return on it
+    rows, programs = np.nonzero(awarded)
+    funding = rng.beta(params['beta_a'][programs], params['beta_b'][programs]) * params['amount'][programs]
+    returns = funding * np.exp(params['roi_mu'][programs] + params['roi_sigma'][programs] * rng.standard_normal(len(rows)))
+
+    return (np.bincount(rows, funding, minlength=trials), np.bincount(rows, returns, minlength=trials),
+            awarded.sum(axis=0), np.bincount(programs, funding, minlength=n), np.bincount(programs, returns, minlength=n))
+
+
+class FundingSimulator:
+    """Monte Carlo federal funding outcomes for a set of opportunities.
+
+    Every trial draws, for all programs at once, whether each is awarded
+    (its ``probability``, correlated through a shared appropriations
+    factor), what share of the requested ``amount`` it pays, and the ROI
+    realized on it (lognormal around ``roi_multiplier``). Trials are
+    NumPy matrices of shape (trials, programs) drawn in fixed-size chunks,
+    each from its own child of one SeedSequence, so a run is reproducible
+    and can be split across processes without changing the result.
+    """
+
+    def __init__(self, opportunities: List[Dict[str, Any]], correlation: float = COMMON_SHOCK):
+        self.opportunities = list(opportunities)
+        self.correlation = correlation
+
+        def column(key: str, default: float) -> np.ndarray:
+            return np.array([float(o.get(key, default)) for o in self.opportunities], dtype=np.float64)
+
+        probability = np.clip(column('probability', 0.0), 0.0, 1.0)
+        share = np.clip(column('award_share', AWARD_SHARE), 1e-6, 1 - 1e-6)
+        concentration = column('award_concentration', AWARD_CONCENTRATION)
+        sigma = column('roi_uncertainty', ROI_UNCERTAINTY)
+        self._params = {
+            'amount': column('amount', 0.0),
+            'threshold': ndtri(probability),
+            'beta_a': share * concentration,
+            'beta_b': (1 - share) * concentration,
+            # Mean-preserving: E[multiplier] equals the stated roi_multiplier
+            'roi_mu': np.log(np.maximum(column('roi_multiplier', 1.0), 1e-12)) - sigma ** 2 / 2,
+            'roi_sigma': sigma,
+            'correlation': float(correlation)
+        }
+
+    def run(self, trials: int = DEFAULT_TRIALS, seed: int = 0, workers: int = 1) -> Dict[str, Any]:
+        """Simulate ``trials`` outcomes; ``workers`` > 1 (0 = CPU count) spreads chunks over a process pool."""
+        sizes = [min(CHUNK_TRIALS, trials - start) for start in range(0, trials, CHUNK_TRIALS)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        workers = workers or os.cpu_count() or 1
+        if not self.opportunities or not sizes:
+            chunks = []
+        elif workers > 1 and len(sizes) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(sizes))) as pool:
+                chunks = list(pool.map(_simulate_chunk, [self._params] * len(sizes), sizes, seeds))
+        else:
+            chunks = [_simulate_chunk(self._params, size, child) for size, child in zip(sizes, seeds)]
+        return self._summarize(chunks, trials, seed)
+
+    def _summarize(self, chunks: List[Tuple[np.ndarray, ...]], trials: int, seed: int) -> Dict[str, Any]:
+        n = len(self.opportunities)
+        funding = np.concatenate([c[0] for c in chunks]) if chunks else np.zeros(0)
+        returns = np.concatenate([c[1] for c in chunks]) if chunks else np.zeros(0)
+        awards, award_sums, return_sums = (sum((c[i] for c in chunks), np.zeros(n)) for i in (2, 3, 4))
+        runs = max(len(funding), 1)
+
+        programs = []
+        for i, opportunity in enumerate(self.opportunities):
+            programs.append({
+                'program': opportunity.get('program', f"program_{i}"),
+                'amount': float(self._params['amount'][i]),
+                'award_rate': float(awards[i] / runs),
+                'expected_award': float(award_sums[i] / runs),
+                'expected_return': float(return_sums[i] / runs),
+                'expected_roi': float(return_sums[i] / award_sums[i]) if award_sums[i] > 0 else 0.0
+            })
+
+        return {
+            'trials': trials,
+            'seed': seed,
+            'total_funding': _distribution(funding),
+            'total_return': _distribution(returns),
+            'expected_roi': float(returns.mean() / funding.mean()) if len(funding) and funding.mean() > 0 else 0.0,
+            'programs': programs
+        }
+
+
+def _distribution(values: np.ndarray) -> Dict[str, float]:
+    """Mean and PERCENTILES of per-trial totals, keyed mean, p5, p50, p95."""
+    if not len(values):
+        return {'mean': 0.0, **{f"p{q}": 0.0 for q in PERCENTILES}}
+    points = np.percentile(values, PERCENTILES)
+    return {'mean': float(values.mean()), **{f"p{q}": float(v) for q, v in zip(PERCENTILES, points)}}
+
+
+def simulate_funding(opportunities: List[Dict[str, Any]], trials: int = DEFAULT_TRIALS, seed: int = 0,
+                     workers: int = 1, correlation: Optional[float] = None) -> Dict[str, Any]:
+    """One-call FundingSimulator(opportunities).run(...)."""
+    simulator = FundingSimulator(opportunities, COMMON_SHOCK if correlation is None else correlation)
+    return simulator.run(trials, seed, workers)
@@ -0,0 +1,121 @@
+import threading
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Monthly SNAP parameters (48 states and DC) by version, for household sizes 1-8
+# plus the amount added per extra member. CalFresh applies broad-based
+# categorical eligibility: a 200% FPL gross test and no net income test.
+PARAMETER_TABLES: Dict[str, Dict[str, Any]] = {
+    'FY2024': {
+        'gross_limit': ([1580, 2137, 2694, 3250, 3807, 4364, 4921, 5478], 557),
+        'net_limit': ([1215, 1644, 2072, 2500, 2929, 3357, 3785, 4214], 429),
+        'max_allotment': ([291, 535, 766, 973, 1155, 1386, 1532, 1751], 219),
+        'standard_deduction': [198, 198, 198, 208, 244, 279],
+        'shelter_cap': 672,
+        'minimum_benefit': 23
+    },
+    'FY2025': {
+        'gross_limit': ([1632, 2215, 2798, 3380, 3963, 4546, 5129, 5712], 583),
+        'net_limit': ([1255, 1704, 2152, 2600, 3049, 3497, 3945, 4394], 449),
+        'max_allotment': ([292, 536, 768, 975, 1158, 1390, 1536, 1756], 220),
+        'standard_deduction': [204, 204, 204, 217, 254, 291],
+        'shelter_cap': 712,
+        'minimum_benefit': 23
+    },
+    'CA-FY2025': {
+        'base': 'FY2025',
+        'gross_limit': ([2510, 3408, 4304, 5200, 6098, 6994, 7890, 8788], 898),
+        'net_limit': None
+    }
+}
+DEFAULT_VERSION = 'CA-FY2025'
+
+EARNED_INCOME_DEDUCTION = 0.2
+SHELTER_INCOME_SHARE = 0.5
+BENEFIT_REDUCTION_RATE = 0.3
+# Largest household the compiled tables cover; larger households are clipped to it
+MAX_HOUSEHOLD = 20
+
+_COMPILED: Dict[str, 'SnapParameters'] = {}
+_LOCK = threading.Lock()
+
+
+class SnapParameters:
+    """One version's tables compiled to arrays indexed by household size (index 0 unused)."""
+
+    def __init__(self, version: str, table: Dict[str, Any]):
+        self.version = version
+        sizes = np.arange(MAX_HOUSEHOLD + 1)
+        self.gross_limit = _by_size(table['gross_limit'], sizes)
+        self.net_limit = _by_size(table['net_limit'], sizes) if table['net_limit'] is not None else None
+        self.max_allotment = _by_size(table['max_allotment'], sizes)
+        deductions = np.asarray(table['standard_deduction'], dtype=np.float64)
+        self.standard_deduction = deductions[np.clip(sizes, 1, len(deductions)) - 1]
+        self.shelter_cap = float(table['shelter_cap'])
+        self.minimum_benefit = float(table['minimum_benefit'])
+
+
+def _by_size(spec: Any, sizes: np.ndarray) -> np.ndarray:
+    """Expand (values for sizes 1-8, per extra member) to one value per household size."""
+    values, extra = spec
+    values = np.asarray(values, dtype=np.float64)
+    capped = np.clip(sizes, 1, len(values))
+    return values[capped - 1] + np.maximum(sizes - len(values), 0) * extra
+
+
+def snap_parameters(version: str = DEFAULT_VERSION) -> SnapParameters:
+    """Compiled parameters for a version, built once per process."""
+    with _LOCK:
+        compiled = _COMPILED.get(version)
+        if compiled is None:
+            if version not in PARAMETER_TABLES:
+                raise ValueError(f"Unknown SNAP parameter version {version!r}; expected one of {sorted(PARAMETER_TABLES)}")
+            table = dict(PARAMETER_TABLES[version])
+            # Versions can override a base version's tables
+            while 'base' in table:
+                table = {**PARAMETER_TABLES[table.pop('base')], **table}
+            compiled = _COMPILED[version] = SnapParameters(version, table)
+        return compiled
+
+
+def snap_benefits(household_size: Any, gross_income: Any, shelter_cost: Any, deductions: Any = 0.0,
+                  earned_income: Optional[Any] = None, version: str = DEFAULT_VERSION) -> Dict[str, np.ndarray]:
+    """Eligibility and monthly allotment for many households at once.
+
+    All amounts are monthly dollars and broadcast against each other.
+    ``deductions`` covers dependent care, child support and excess medical
+    costs; ``earned_income`` is the part of gross income from work (none
+    by default), which gets the 20% earned income deduction. Elderly and
+    disabled households' uncapped shelter deduction is not modeled.
+    """
+    params = snap_parameters(version)
+    size = np.clip(np.asarray(household_size, dtype=np.int64), 1, MAX_HOUSEHOLD)
+    gross = np.asarray(gross_income, dtype=np.float64)
+    earned = np.zeros_like(gross) if earned_income is None else np.minimum(np.asarray(earned_income, dtype=np.float64), gross)
+    size, gross, earned, shelter, other = np.broadcast_arrays(
+        size, gross, earned, np.asarray(shelter_cost, dtype=np.float64), np.asarray(deductions, dtype=np.float64))
+
+    # Step 1: adjusted income after the earned income, standard and other deductions
+    adjusted = np.maximum(gross - EARNED_INCOME_DEDUCTION * earned - params.standard_deduction[size] - other, 0.0)
+
+    # Step 2: excess shelter deduction, capped
+    excess_shelter = np.minimum(np.maximum(shelter - SHELTER_INCOME_SHARE * adjusted, 0.0), params.shelter_cap)
+    net = np.maximum(adjusted - excess_shelter, 0.0)
+
+    # Step 3: allotment is the maximum less 30% of net income (rounded up), with a floor for 1-2 person households
+    allotment = params.max_allotment[size] - np.ceil(BENEFIT_REDUCTION_RATE * net)
+    eligible = gross <= params.gross_limit[size]
+    if params.net_limit is not None:
+        eligible &= net <= params.net_limit[size]
+    small = size <= 2
+    allotment = np.where(small, np.maximum(allotment, params.minimum_benefit), allotment)
+    eligible &= allotment > 0
+
+    return {
+        'eligible': eligible,
+        'allotment': np.where(eligible, allotment, 0.0),
+        'net_income': net,
+        'gross_limit': params.gross_limit[size],
+        'max_allotment': params.max_allotment[size]
+    }
@@ -0,0 +1,143 @@
+from typing import Any, Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+# Projection origin (City Hall); an equirectangular projection is accurate to
+# well under a meter per kilometer across the city
+ORIGIN_LAT = 37.7793
+ORIGIN_LON = -122.4193
+EARTH_RADIUS_M = 6371008.8
+
+_METERS_PER_DEG_LAT = np.radians(1.0) * EARTH_RADIUS_M
+_METERS_PER_DEG_LON = _METERS_PER_DEG_LAT * np.cos(np.radians(ORIGIN_LAT))
+_SQRT3 = np.sqrt(3.0)
+
+
+def project(latitude: Any, longitude: Any) -> np.ndarray:
+    """Latitude/longitude in degrees to local (x, y) meters, shape (n, 2)."""
+    lat = np.asarray(latitude, dtype=np.float64)
+    lon = np.asarray(longitude, dtype=np.float64)
+    return np.column_stack([(lon - ORIGIN_LON) * _METERS_PER_DEG_LON, (lat - ORIGIN_LAT) * _METERS_PER_DEG_LAT])
+
+
+def unproject(xy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Inverse of project(): (latitude, longitude) arrays."""
+    xy = np.atleast_2d(xy)
+    return xy[:, 1] / _METERS_PER_DEG_LAT + ORIGIN_LAT, xy[:, 0] / _METERS_PER_DEG_LON + ORIGIN_LON
+
+
+def hex_cells(xy: np.ndarray, size: float) -> np.ndarray:
+    """Pointy-top hexagon of edge ``size`` meters containing each point, as int64 cell keys."""
+    xy = np.atleast_2d(xy)
+    q = (_SQRT3 / 3 * xy[:, 0] - xy[:, 1] / 3) / size
+    r = (2 / 3 * xy[:, 1]) / size
+    # Cube rounding: round all three axes, then fix the one that moved most
+    s = -q - r
+    rq, rr, rs = np.rint(q), np.rint(r), np.rint(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+    return (rq.astype(np.int64) << 32) | (rr.astype(np.int64) & 0xFFFFFFFF)
+
+
+def hex_centers(cells: np.ndarray, size: float) -> np.ndarray:
+    """Projected (x, y) center of each hex cell key."""
+    cells = np.asarray(cells, dtype=np.int64)
+    q = cells >> 32
+    r = ((cells & 0xFFFFFFFF) ^ 0x80000000) - 0x80000000
+    return np.column_stack([size * _SQRT3 * (q + r / 2), size * 1.5 * r])
+
+
+class SpatialIndex:
+    """KD-tree plus hexbin index over point locations.
+
+    Points are projected to meters around San Francisco and loaded into a
+    KD-tree for radius, k-nearest and bounding-box queries; each point is
+    also assigned a hexagonal grid cell for density maps and cell lookups.
+    Rows without coordinates are skipped, and every query returns row
+    positions into the data the index was built from.
+    """
+
+    def __init__(self, latitude: Any, longitude: Any, cell_size: float = 250.0):
+        lat = np.asarray(latitude, dtype=np.float64)
+        lon = np.asarray(longitude, dtype=np.float64)
+        valid = np.isfinite(lat) & np.isfinite(lon)
+        self.cell_size = cell_size
+        self.n_rows = len(valid)
+        self.rows = np.flatnonzero(valid)
+        self.xy = project(lat[valid], lon[valid])
+        self.tree = cKDTree(self.xy) if len(self.rows) else None
+        self.cells = hex_cells(self.xy, cell_size)
+
+        # Points grouped by cell for O(log n) cell lookups
+        self._cell_order = np.argsort(self.cells, kind='stable')
+        self._sorted_cells = self.cells[self._cell_order]
+
+    @classmethod
+    def from_frame(cls, frame: Any, cell_size: float = 250.0) -> 'SpatialIndex':
+        """Index anything with latitude/longitude columns (DataFrame or RecordTable)."""
+        return cls(frame['latitude'], frame['longitude'], cell_size)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]], cell_size: float = 250.0) -> 'SpatialIndex':
+        rows = list(rows)
+        latitude = [row.get('latitude', np.nan) for row in rows]
+        longitude = [row.get('longitude', np.nan) for row in rows]
+        return cls(pd.to_numeric(latitude, errors='coerce'), pd.to_numeric(longitude, errors='coerce'), cell_size)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def radius(self, latitude: float, longitude: float, meters: float) -> np.ndarray:
+        """Rows within ``meters`` of a point, nearest first."""
+        if self.tree is None:
+            return np.empty(0, dtype=np.int64)
+        center = project(latitude, longitude)[0]
+        hits = np.asarray(self.tree.query_ball_point(center, meters), dtype=np.int64)
+        distances = np.hypot(*(self.xy[hits] - center).T)
+        return self.rows[hits[np.argsort(distances, kind='stable')]]
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """The k nearest rows and their distances in meters."""
+        if self.tree is None:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        distances, hits = self.tree.query(project(latitude, longitude)[0], k=min(k, len(self)))
+        hits, distances = np.atleast_1d(hits), np.atleast_1d(distances)
+        return self.rows[hits], distances
+
+    def bbox(self, south: float, west: float, north: float, east: float) -> np.ndarray:
+        """Rows inside a latitude/longitude box, in row order."""
+        if self.tree is None:
+            return np.empty(0, dtype=np.int64)
+        low, high = project([south, north], [west, east])
+        # The box's circumscribed circle narrows the candidates, then the box filters them
+        hits = np.asarray(self.tree.query_ball_point((low + high) / 2, np.hypot(*(high - low)) / 2), dtype=np.int64)
+        inside = np.all((self.xy[hits] >= low) & (self.xy[hits] <= high), axis=1)
+        return np.sort(self.rows[hits[inside]])
+
+    def neighbor_counts(self, meters: float) -> np.ndarray:
+        """Number of other indexed points within ``meters`` of each row (0 for rows without coordinates)."""
+        counts = np.zeros(self.n_rows, dtype=np.int64)
+        if self.tree is not None:
+            counts[self.rows] = self.tree.query_ball_point(self.xy, meters, return_length=True) - 1
+        return counts
+
+    def cell_of(self, latitude: float, longitude: float) -> int:
+        return int(hex_cells(project(latitude, longitude), self.cell_size)[0])
+
+    def in_cell(self, cell: int) -> np.ndarray:
+        """Rows whose point falls in a hex cell."""
+        start = np.searchsorted(self._sorted_cells, cell, side='left')
+        stop = np.searchsorted(self._sorted_cells, cell, side='right')
+        return np.sort(self.rows[self._cell_order[start:stop]])
+
+    def hexbins(self) -> pd.DataFrame:
+        """Point count per hex cell with the cell center, densest first."""
+        cells, counts = np.unique(self.cells, return_counts=True)
+        latitude, longitude = unproject(hex_centers(cells, self.cell_size))
+        frame = pd.DataFrame({'cell': cells, 'latitude': latitude, 'longitude': longitude, 'count': counts})
+        return frame.sort_values('count', ascending=False, kind='stable').reset_index(drop=True)
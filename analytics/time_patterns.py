@@ -0,0 +1,193 @@
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+HOURS_PER_WEEK = 168
+_NS_PER_HOUR = 3600 * 10 ** 9
+
+# Parts of the day as [start, end) hours; night wraps past midnight
+PERIODS: Dict[str, Tuple[int, int]] = {
+    'morning': (6, 10),
+    'midday': (10, 16),
+    'evening': (16, 21),
+    'night': (21, 6)
+}
+
+
+def wall_clock(timestamps: Any) -> np.ndarray:
+    """Timestamps as datetime64[ns] in their own wall-clock time, NaT where missing.
+
+    Datetime columns (such as frame_311_data's created_date) are only
+    re-viewed; text is parsed. Parse once and pass the result on, since
+    parsing dominates the cost of everything downstream.
+    """
+    if isinstance(timestamps, np.ndarray) and timestamps.dtype.kind == 'M':
+        return timestamps.astype('datetime64[ns]', copy=False)
+    column = timestamps if isinstance(timestamps, pd.Series) else pd.Series(timestamps)
+    if not pd.api.types.is_datetime64_any_dtype(column):
+        column = pd.to_datetime(column, errors='coerce')
+    if column.dt.tz is not None:
+        column = column.dt.tz_localize(None)
+    return column.to_numpy('datetime64[ns]')
+
+
+def hour_of_week(timestamps: Any) -> np.ndarray:
+    """Hour of the week (Monday 00:00 = 0 ... Sunday 23:00 = 167) of each timestamp, -1 where missing.
+
+    Timezone-aware timestamps are read in their own wall-clock time, so
+    reports keep the local hour they were made at.
+    """
+    values = wall_clock(timestamps)
+    nanoseconds = values.view(np.int64)
+    hours = nanoseconds // _NS_PER_HOUR
+    # 1970-01-01 was a Thursday, three days after Monday
+    weekday = (hours // 24 + 3) % 7
+    return np.where(np.isnat(values), -1, weekday * 24 + hours % 24)
+
+
+def snapshot_key(*columns: Any) -> str:
+    """Content fingerprint of some columns, for callers without a sync watermark.
+
+    Hashes the columns' Arrow buffers. Arrow-backed and numeric columns are
+    hashed in place, but object columns are converted to Arrow first, which
+    copies them; callers that know their data version should pass it as the
+    snapshot instead.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for column in columns:
+        array = column if isinstance(column, pa.ChunkedArray) else pa.chunked_array([pa.array(column)])
+        digest.update(f"{array.type}:{len(array)}".encode())
+        for chunk in array.chunks:
+            parts = [chunk, chunk.dictionary] if isinstance(chunk, pa.DictionaryArray) else [chunk]
+            for buffer in (buffer for part in parts for buffer in part.buffers()):
+                if buffer is not None:
+                    digest.update(buffer)
+    return digest.hexdigest()
+
+
+class HourOfWeekProfile:
+    """Report counts per location and hour of the week, as one (locations x 168) matrix.
+
+    Built with a single bincount over ``location_code * 168 + hour_of_week``,
+    so a year of reports for every location is one NumPy pass. The
+    hour-of-day fold is counted from the reports too, so period peaks never
+    sum the full matrix, which is mostly zeros when locations are addresses.
+    """
+
+    def __init__(self, locations: pd.Index, counts: np.ndarray, by_hour: Optional[np.ndarray] = None):
+        self.locations = locations
+        self.counts = counts
+        self._by_hour = by_hour
+        self._peaks: Dict[Any, Dict[str, List[Any]]] = {}
+
+    @classmethod
+    def from_reports(cls, locations: Any, timestamps: Any) -> 'HourOfWeekProfile':
+        column = pd.Series(locations).reset_index(drop=True)
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes, names = column.cat.codes.to_numpy(np.int64), column.cat.categories
+        else:
+            codes, names = pd.factorize(column)
+            codes = codes.astype(np.int64)
+        hours = hour_of_week(timestamps)
+        valid = (codes >= 0) & (hours >= 0)
+        codes, hours = codes[valid], hours[valid]
+        counts = np.bincount(codes * HOURS_PER_WEEK + hours, minlength=len(names) * HOURS_PER_WEEK)
+        by_hour = np.bincount(codes * 24 + hours % 24, minlength=len(names) * 24)
+        return cls(pd.Index(names), counts.astype(np.int32).reshape(len(names), HOURS_PER_WEEK),
+                   by_hour.astype(np.int32).reshape(len(names), 24))
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    @property
+    def reports(self) -> np.ndarray:
+        return self.by_hour().sum(axis=1)
+
+    def by_hour(self) -> np.ndarray:
+        """Counts folded onto hour of day, shape (locations, 24); shared, so treat it as read-only."""
+        if self._by_hour is None:
+            self._by_hour = self.counts.reshape(len(self), 7, 24).sum(axis=1)
+        return self._by_hour
+
+    def peak_hours(self) -> pd.DataFrame:
+        """Busiest hour of the week per location with at least one report."""
+        peak = self.counts.argmax(axis=1)
+        frame = pd.DataFrame({
+            'location': self.locations,
+            'weekday': peak // 24,
+            'hour': peak % 24,
+            'count': self.counts[np.arange(len(self)), peak],
+            'reports': self.reports
+        })
+        return frame[frame['reports'] > 0].reset_index(drop=True)
+
+    def period_peaks(self, periods: Optional[Dict[str, Tuple[int, int]]] = None, min_reports: int = 1,
+                     min_lift: float = 1.5, limit: Optional[int] = 10) -> Dict[str, List[Any]]:
+        """Locations whose reports concentrate in each part of the day, keyed ``<period>_peak``.
+
+        A location peaks in a period when its share of reports there is at
+        least ``min_lift`` times the citywide share. Locations are ranked by
+        their report count in the period, busiest first; periods without any
+        peaking location are left out. Results are kept per argument set, so a
+        cached profile answers repeat calls without recomputing.
+        """
+        periods = periods or PERIODS
+        key = (tuple(periods.items()), min_reports, min_lift, limit)
+        if key not in self._peaks:
+            self._peaks[key] = self._period_peaks(periods, min_reports, min_lift, limit)
+        return {name: list(found) for name, found in self._peaks[key].items()}
+
+    def _period_peaks(self, periods: Dict[str, Tuple[int, int]], min_reports: int, min_lift: float,
+                      limit: Optional[int]) -> Dict[str, List[Any]]:
+        hours = np.arange(24)
+        membership = np.array([
+            (hours >= start) & (hours < end) if start < end else (hours >= start) | (hours < end)
+            for start, end in periods.values()
+        ], dtype=np.int64)
+        in_period = self.by_hour() @ membership.T
+        reports = self.reports.astype(np.int64)
+
+        # Lift = location share / city share, compared without dividing
+        city = in_period.sum(axis=0)
+        peaking = ((in_period * reports.sum() >= min_lift * city * reports[:, None])
+                   & (in_period > 0) & (reports >= min_reports)[:, None])
+
+        peaks = {}
+        for column, name in enumerate(periods):
+            rows = np.flatnonzero(peaking[:, column])
+            rows = rows[np.argsort(-in_period[rows, column], kind='stable')][:limit]
+            if len(rows):
+                peaks[f"{name}_peak"] = self.locations[rows].tolist()
+        return peaks
+
+
+class TimePatternMiner:
+    """Hour-of-week profiles cached per dataset snapshot.
+
+    Pass a ``snapshot`` key (a sync watermark or cache key) when the caller
+    already knows which version of the data it holds; otherwise the data is
+    fingerprinted, which is cheaper than re-parsing its timestamps.
+    """
+
+    def __init__(self, max_cache: int = 8):
+        self.max_cache = max_cache
+        self.stats = {'hits': 0, 'misses': 0}
+        self._cache: Dict[str, HourOfWeekProfile] = {}
+
+    def profile(self, locations: Any, timestamps: Any, snapshot: Optional[str] = None) -> HourOfWeekProfile:
+        key = snapshot or snapshot_key(locations, timestamps)
+        profile = self._cache.get(key)
+        if profile is not None:
+            self.stats['hits'] += 1
+            return profile
+
+        self.stats['misses'] += 1
+        profile = HourOfWeekProfile.from_reports(locations, timestamps)
+        if len(self._cache) >= self.max_cache:
+            # Drop the oldest snapshot
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = profile
+        return profile
@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.geometry import shape
+from shapely.strtree import STRtree
+
+# Next to the package rather than the working directory; ZONING_PATH overrides it
+DEFAULT_ZONING_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data_cache',
+                                   'zoning_districts.geojson')
+# Feature property holding the district code: DataSF's zoning map export first, then common alternatives
+DISTRICT_PROPERTIES = ('zoning_sim', 'zoning', 'districtname', 'district')
+
+_OVERLAYS: Dict[str, Tuple[Optional[int], Optional['ZoningOverlay']]] = {}
+_LOCK = threading.Lock()
+
+
+class ZoningOverlay:
+    """Zoning district polygons behind an STRtree, for batched point-in-polygon lookups.
+
+    The tree is built once per map; locating a batch of points is one
+    vectorized STRtree query. Districts found for parcels are cached by
+    parcel id, so re-zoning the same parcel table only looks up ids and
+    queries the tree for parcels it has not seen.
+    """
+
+    def __init__(self, polygons: List[Any], districts: List[str]):
+        self.polygons = np.asarray(polygons, dtype=object)
+        codes, names = pd.factorize(pd.Series(districts, dtype=object))
+        self.polygon_codes = codes.astype(np.int32)
+        self.district_names = np.asarray(names, dtype=object)
+        self.tree = STRtree(self.polygons)
+        self.stats = {'hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+        self._parcel_ids = pd.Index([], dtype=object)
+        self._parcel_codes = np.empty(0, dtype=np.int32)
+
+    @classmethod
+    def from_geojson(cls, path: str) -> 'ZoningOverlay':
+        """Load a GeoJSON FeatureCollection of (Multi)Polygons with a district property."""
+        with open(path) as f:
+            collection = json.load(f)
+        polygons, districts = [], []
+        for feature in collection.get('features', []):
+            properties = feature.get('properties') or {}
+            district = next((properties[name] for name in DISTRICT_PROPERTIES if properties.get(name)), None)
+            if district is None or not feature.get('geometry'):
+                continue
+            polygons.append(shape(feature['geometry']))
+            districts.append(str(district))
+        return cls(polygons, districts)
+
+    def __len__(self) -> int:
+        return len(self.polygons)
+
+    def locate(self, latitude: Any, longitude: Any) -> np.ndarray:
+        """District code of each point (an index into district_names), -1 outside every polygon."""
+        lat = np.asarray(latitude, dtype=np.float64)
+        lon = np.asarray(longitude, dtype=np.float64)
+        codes = np.full(len(lat), -1, dtype=np.int32)
+        valid = np.flatnonzero(np.isfinite(lat) & np.isfinite(lon))
+        if not len(valid) or not len(self.polygons):
+            return codes
+
+        # 'intersects' keeps points on a shared edge; where polygons overlap, the first in map order wins
+        points, polygons = self.tree.query(shapely.points(lon[valid], lat[valid]), predicate='intersects')
+        order = np.lexsort((polygons, points))
+        found, first = np.unique(points[order], return_index=True)
+        codes[valid[found]] = self.polygon_codes[polygons[order][first]]
+        return codes
+
+    def districts(self, latitude: Any, longitude: Any) -> np.ndarray:
+        """District name of each point, None outside the map."""
+        return self._names(self.locate(latitude, longitude))
+
+    def parcel_districts(self, parcel_ids: Any, latitude: Any, longitude: Any) -> np.ndarray:
+        """District name of each parcel, None outside the map; cached by parcel id."""
+        ids = pd.Index(np.asarray(parcel_ids, dtype=object))
+        with self._lock:
+            positions = self._parcel_ids.get_indexer(ids)
+            missing = positions < 0
+            if missing.any():
+                # Locate each unseen parcel once, even if it repeats in the batch
+                rows = np.flatnonzero(missing)[~ids[missing].duplicated()]
+                codes = self.locate(np.asarray(latitude, dtype=np.float64)[rows],
+                                    np.asarray(longitude, dtype=np.float64)[rows])
+                self._parcel_ids = self._parcel_ids.append(ids[rows])
+                self._parcel_codes = np.concatenate([self._parcel_codes, codes])
+                positions = self._parcel_ids.get_indexer(ids)
+            self.stats['misses'] += int(missing.sum())
+            self.stats['hits'] += int(len(ids) - missing.sum())
+            codes = self._parcel_codes[positions]
+        return self._names(codes)
+
+    def _names(self, codes: np.ndarray) -> np.ndarray:
+        names = np.empty(len(codes), dtype=object)
+        inside = codes >= 0
+        names[inside] = self.district_names[codes[inside]]
+        return names
+
+
+def zoning_path(path: Optional[str] = None) -> str:
+    """Absolute zoning map path: ``path``, else ZONING_PATH, else DEFAULT_ZONING_PATH."""
+    return os.path.abspath(path or os.environ.get('ZONING_PATH') or DEFAULT_ZONING_PATH)
+
+
+def write_synthetic_zoning(path: Optional[str] = None, seed: int = 42) -> str:
+    """Write the synthetic zoning map, for benchmarks and demos that opt in to made-up districts."""
+    from data_sources.synthetic import SyntheticCityGenerator
+    path = zoning_path(path)
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(SyntheticCityGenerator(seed=seed).zoning_districts(), f)
+    return path
+
+
+def load_zoning_overlay(path: Optional[str] = None) -> Optional[ZoningOverlay]:
+    """The process-wide overlay for a zoning map file, rebuilt only when the file changes.
+
+    Without a path, DataSF's zoning map is read from ZONING_PATH, else DEFAULT_ZONING_PATH.
+    Returns None (with a one-time warning) when the file is missing; a
+    synthetic map is only used when written there explicitly.
+    """
+    path = zoning_path(path)
+    with _LOCK:
+        mtime = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+        cached = _OVERLAYS.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        if mtime is None:
+            print(f"⚠️ No zoning map at {path}; using the parcel roll's recorded districts")
+            overlay = None
+        else:
+            overlay = ZoningOverlay.from_geojson(path)
+        _OVERLAYS[path] = (mtime, overlay)
+        return overlay
@@ -8,6 +8,7 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import requests
 from orchestrator import Orchestrator
+from coordination.events import StreamlitSink
 import streamlit as st
 import time
 from typing import List, Dict, Any
@@ -331,7 +332,7 @@ def run_cinematic_coordination(scenario: str, location: str, weather_data: dict)
     """Run coordination with cinematic effects."""
     
     # Initialize orchestrator
-    orchestrator = Orchestrator()
+    orchestrator = Orchestrator(event_sink=StreamlitSink())
     
     # Prepare scenario data
     scenario_data = {
@@ -573,6 +574,19 @@ def display_cinematic_geographic_impact(results: dict, location: str):
     
     st.markdown('<h3 style="color: #667eea;">🗺️ GEOGRAPHIC IMPACT ANALYSIS</h3>', unsafe_allow_html=True)
     
+    # 311 hotspots from StreetPrecog's spatial index (250 m hexbins)
+    hotspots = pd.DataFrame(results.get('detection', {}).get('street_precog', {}).get('issue_hotspots', []))
+    if not hotspots.empty:
+        fig = px.scatter(hotspots, x='longitude', y='latitude', size='count', color='count',
+                         title="311 Issue Hotspots", color_continuous_scale='OrRd')
+        fig.update_yaxes(scaleanchor='x', scaleratio=1.27)
+        fig.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='#2c3e50')
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
     # Simulate geographic data
     neighborhoods = ['Mission District', 'Tenderloin', 'Downtown', 'Castro District', 'Haight-Ashbury']
     impact_scores = np.random.uniform(0.1, 0.9, len(neighborhoods))
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+SF Neural Precog Network Batch Runner
+Runs the full predictive chain headlessly over a file of scenarios
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+PHASES = ['detection', 'prediction', 'prevention', 'roi_optimization',
+          'visualization', 'citizen_engagement', 'broadcast']
+AGENTS = ['street_precog', 'housing_oracle', 'budget_prophet', 'crisis_sage']
+WEATHER_FIELDS = ['rain_probability', 'temperature', 'wind_speed']
+
+# One orchestrator per worker process, built once by the pool initializer
+_worker_orchestrator = None
+_worker_sink = None
+
+
+def load_scenarios(path: str) -> Iterator[Dict[str, Any]]:
+    """Read scenario specs from a JSONL, JSON or CSV file."""
+    if path.endswith('.csv'):
+        with open(path, newline='') as f:
+            for i, row in enumerate(csv.DictReader(f)):
+                yield _scenario_from_row(row, i)
+    elif path.endswith('.json'):
+        with open(path) as f:
+            for i, spec in enumerate(json.load(f)):
+                yield _normalize_scenario(spec, i)
+    else:
+        with open(path) as f:
+            for i, line in enumerate(line for line in f if line.strip()):
+                yield _normalize_scenario(json.loads(line), i)
+
+
+def _scenario_from_row(row: Dict[str, str], index: int) -> Dict[str, Any]:
+    """Build a scenario spec from a flat CSV row."""
+    spec: Dict[str, Any] = {k: v for k, v in row.items() if v not in (None, '') and k not in WEATHER_FIELDS}
+    weather = {k: float(row[k]) for k in WEATHER_FIELDS if row.get(k) not in (None, '')}
+    if weather:
+        spec['weather'] = weather
+    return _normalize_scenario(spec, index)
+
+
+def _normalize_scenario(spec: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """Fill defaults so every scenario has location, weather, timestamp and budget."""
+    scenario = dict(spec)
+    scenario.setdefault('id', str(index))
+    scenario.setdefault('location', 'San Francisco')
+    scenario.setdefault('weather', {'rain_probability': 0.6})
+    scenario.setdefault('timestamp', '2024-01-15')
+    if 'budget' in scenario:
+        scenario['budget'] = float(scenario['budget'])
+    return scenario
+
+
+def _init_worker(executor_mode: str, agent_timeout: Optional[float]):
+    """Build the worker's orchestrator once; streamlit is never imported."""
+    global _worker_orchestrator, _worker_sink
+    from orchestrator import Orchestrator
+    from coordination.events import BufferingSink
+
+    _worker_sink = BufferingSink()
+    _worker_orchestrator = Orchestrator(executor_mode, agent_timeout=agent_timeout, event_sink=_worker_sink)
+
+
+def run_scenario(scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one scenario through the full chain and return a flat summary record."""
+    from coordination.events import EventKind
+
+    _worker_sink.clear()
+    start = time.perf_counter()
+    try:
+        results = _worker_orchestrator.coordinate_agents(scenario)
+        error = None
+    except Exception as e:
+        results, error = {}, f"{type(e).__name__}: {e}"
+    elapsed = time.perf_counter() - start
+
+    latencies = {event.phase: event.data.get('duration', 0.0)
+                 for event in _worker_sink.of_kind(EventKind.PHASE_COMPLETED)}
+    return summarize_results(scenario, results, latencies, elapsed, error)
+
+
+def summarize_results(scenario: Dict[str, Any], results: Dict[str, Any], latencies: Dict[str, float],
+                      elapsed: float, error: Optional[str] = None) -> Dict[str, Any]:
+    """Flatten coordination results into one record with a fixed set of columns."""
+    roi = results.get('roi_optimization', {})
+    optimization = roi.get('optimization_result', {})
+    weather = scenario.get('weather', {})
+
+    record = {
+        'scenario_id': str(scenario.get('id')),
+        'location': scenario.get('location'),
+        'timestamp': scenario.get('timestamp'),
+        'budget': float(scenario.get('budget', 1000000)),
+        'rain_probability': float(weather.get('rain_probability', np.nan)),
+        'total_roi': float(roi.get('total_roi', 0.0)),
+        'total_cost': float(optimization.get('total_cost', 0)),
+        'total_benefit': float(optimization.get('total_benefit', 0)),
+        'selected_strategies': len(optimization.get('selected_strategies', [])),
+        'funding_opportunities': int(roi.get('funding_opportunities', 0)),
+        'optimization_status': optimization.get('optimization_status'),
+        'elapsed_s': elapsed,
+        'error': error
+    }
+    for agent in AGENTS:
+        record[f"{agent}_strategies"] = len(results.get('prevention', {}).get(agent, {}).get('strategies', []))
+        record[f"{agent}_confidence"] = float(results.get('prediction', {}).get(agent, {}).get('confidence', 0.0))
+    for phase in PHASES:
+        record[f"latency_{phase}_s"] = float(latencies.get(phase, np.nan))
+    return record
+
+
+class ResultWriter:
+    """Streams summary records to JSONL, or to Parquet in row-group batches."""
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        self.path = path
+        self.batch_size = batch_size
+        self.parquet = path.endswith('.parquet')
+        self._batch: List[Dict[str, Any]] = []
+        self._writer = None
+        self._file = None if self.parquet else open(path, 'w')
+
+    def write(self, record: Dict[str, Any]):
+        if not self.parquet:
+            self._file.write(json.dumps(record, default=str) + '\n')
+            return
+        self._batch.append(record)
+        if len(self._batch) >= self.batch_size:
+            self._flush_parquet()
+
+    def _flush_parquet(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._batch:
+            return
+        if self._writer is None:
+            table = pa.Table.from_pylist(self._batch)
+            schema = table.schema
+            # Columns that were all-null in the first batch still need a real type
+            for i, f in enumerate(schema):
+                if pa.types.is_null(f.type):
+                    schema = schema.set(i, pa.field(f.name, pa.string()))
+            self._writer = pq.ParquetWriter(self.path, schema)
+        table = pa.Table.from_pylist(self._batch, schema=self._writer.schema)
+        self._writer.write_table(table)
+        self._batch = []
+
+    def close(self):
+        if self.parquet:
+            self._flush_parquet()
+            if self._writer is not None:
+                self._writer.close()
+        else:
+            self._file.close()
+
+
+def latency_report(records: List[Dict[str, Any]], wall_time: float) -> Dict[str, Any]:
+    """Compute throughput and per-phase latency percentiles in milliseconds."""
+    report = {
+        'scenarios': len(records),
+        'errors': sum(1 for r in records if r['error']),
+        'wall_time_s': wall_time,
+        'scenarios_per_sec': len(records) / wall_time if wall_time > 0 else 0.0,
+        'phase_latency_ms': {}
+    }
+    for phase in PHASES + ['elapsed']:
+        column = 'elapsed_s' if phase == 'elapsed' else f"latency_{phase}_s"
+        values = np.array([r[column] for r in records], dtype=float)
+        values = values[~np.isnan(values)] * 1000
+        if len(values):
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            report['phase_latency_ms'][phase] = {'p50': p50, 'p90': p90, 'p99': p99, 'max': values.max()}
+    return report
+
+
+def print_report(report: Dict[str, Any], stream=sys.stderr):
+    """Print the throughput and latency report as a small table."""
+    print(f"📊 {report['scenarios']} scenarios in {report['wall_time_s']:.2f}s "
+          f"({report['scenarios_per_sec']:.1f} scenarios/sec, {report['errors']} errors)", file=stream)
+    print(f"{'phase':<20}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}", file=stream)
+    for phase, stats in report['phase_latency_ms'].items():
+        print(f"{phase:<20}{stats['p50']:>10.2f}{stats['p90']:>10.2f}{stats['p99']:>10.2f}{stats['max']:>10.2f}",
+              file=stream)
+
+
+def run_batch(scenarios: Iterator[Dict[str, Any]], output: str, workers: int = 0,
+              executor_mode: str = 'sequential', agent_timeout: Optional[float] = None,
+              chunksize: int = 16) -> Dict[str, Any]:
+    """Run scenarios across a process pool, streaming records to the output file."""
+    workers = workers or os.cpu_count() or 1
+    writer = ResultWriter(output)
+    records = []
+
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(executor_mode, agent_timeout)) as pool:
+            # map() yields in input order as soon as each chunk is done
+            for record in pool.map(run_scenario, scenarios, chunksize=chunksize):
+                writer.write(record)
+                records.append({k: record[k] for k in record if k.startswith('latency_') or k in ('elapsed_s', 'error')})
+    finally:
+        writer.close()
+
+    return latency_report(records, time.perf_counter() - start)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the SF Neural Precog chain over a batch of scenarios.")
+    parser.add_argument('scenarios', help="Scenario specs (.jsonl, .json or .csv)")
+    parser.add_argument('-o', '--output', default='results.jsonl', help="Output file (.jsonl or .parquet)")
+    parser.add_argument('-w', '--workers', type=int, default=0, help="Worker processes (default: CPU count)")
+    parser.add_argument('--executor', default='sequential', choices=['sequential', 'thread', 'asyncio'],
+                        help="Executor mode for agents within a phase")
+    parser.add_argument('--agent-timeout', type=float, default=None, help="Per-agent timeout in seconds")
+    parser.add_argument('--chunksize', type=int, default=16, help="Scenarios sent to a worker at a time")
+    parser.add_argument('--report', default=None, help="Also write the latency report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run_batch(load_scenarios(args.scenarios), args.output, args.workers,
+                       args.executor, args.agent_timeout, args.chunksize)
+    print_report(report)
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    return 1 if report['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Address key and hash-join benchmark on synthetic evictions, permits and parcels
+Keys every address cold, then reopens the persisted key table and re-links
+an eviction feed refreshed with 1% new rows
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_sources.addresses import AddressKeyTable, AddressLinks
+from data_sources.synthetic import SyntheticCityGenerator
+
+
+def link(keys: AddressKeyTable, tables: dict) -> tuple:
+    """Key every table, then join evictions to parcels and count their permits."""
+    start = time.perf_counter()
+    keyed = {name: keys.lookup(table['address']) for name, table in tables.items()}
+    keyed_at = time.perf_counter()
+    links = AddressLinks(keyed)
+    parcels = links.first('evictions', 'parcels')
+    permits = links.counts('evictions', 'permits')
+    return parcels, permits, keyed_at - start, time.perf_counter() - keyed_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=200000)
+    args = parser.parse_args()
+
+    # Small chunks, so the refreshed feed is the same rows plus one new chunk
+    generator = SyntheticCityGenerator(chunk_size=max(1, args.rows // 100))
+    refreshed = generator.to_frame('evictions', args.rows + args.rows // 100)
+    tables = {
+        'evictions': refreshed.iloc[:args.rows],
+        'permits': generator.to_frame('permits', args.rows),
+        'parcels': generator.to_frame('parcels', args.rows)
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'address_keys.db')
+        keys = AddressKeyTable(path)
+        parcels, permits, cold_key, cold_join = link(keys, tables)
+        parsed = keys.stats['parsed']
+        keys.close()
+
+        start = time.perf_counter()
+        keys = AddressKeyTable(path)
+        reload = time.perf_counter() - start
+        _, _, warm_key, warm_join = link(keys, {**tables, 'evictions': refreshed})
+        new_parsed = keys.stats['parsed']
+        keys.close()
+
+    print(f"🚀 {len(refreshed):,} evictions, {len(tables['permits']):,} permits, {len(tables['parcels']):,} parcels")
+    print(f"{'step':<22}{'seconds':>10}{'parsed':>12}")
+    print(f"{'cold keying':<22}{cold_key:>10.3f}{parsed:>12,}")
+    print(f"{'cold join':<22}{cold_join:>10.3f}")
+    print(f"{'reload key table':<22}{reload:>10.3f}")
+    print(f"{'refresh keying':<22}{warm_key:>10.3f}{new_parsed:>12,}")
+    print(f"{'refresh join':<22}{warm_join:>10.3f}")
+    print(f"Evictions on a known parcel: {(parcels >= 0).mean():.1%}; "
+          f"with permits at the address: {(permits > 0).mean():.1%}")
+
+
+if __name__ == "__main__":
+    main()
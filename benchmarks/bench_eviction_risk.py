@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Eviction risk model benchmark on synthetic evictions
+Compares per-row and batched predict_proba, and loading the artifact
+copied, memory-mapped and from the per-process warm cache
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.eviction_risk import (SYNTHETIC, EvictionRiskModel, eviction_features, load_eviction_model, repeat_labels,
+                                     training_evictions)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=200000, help="evictions to score")
+    parser.add_argument('--train-rows', type=int, default=100000)
+    parser.add_argument('--sample', type=int, default=500, help="rows scored one at a time")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'eviction_risk.joblib')
+        _, train = timed(lambda: EvictionRiskModel.train(training_evictions(args.train_rows), SYNTHETIC).save(path))
+        _, copied = timed(joblib.load, path)
+        model, mapped = timed(load_eviction_model, path)
+        _, warm = timed(load_eviction_model, path)
+
+        evictions = training_evictions(args.rows, seed=7)
+        matrix = model._matrix(eviction_features(evictions))
+        start = time.perf_counter()
+        for row in matrix[:args.sample]:
+            model.estimator.predict_proba(row[None, :])
+        per_row = (time.perf_counter() - start) / args.sample * len(evictions)
+        scores, batched = timed(model.predict_proba, evictions)
+
+    labels = repeat_labels(eviction_features(evictions), evictions['date'])
+    order = np.argsort(-scores)
+    top = labels[order[:int(len(order) * 0.2)]].mean()
+    print(f"🚀 {len(evictions):,} evictions, model trained on {args.train_rows:,}")
+    print(f"{'step':<26}{'seconds':>10}")
+    print(f"{'train + save':<26}{train:>10.3f}")
+    print(f"{'load (copied)':<26}{copied:>10.4f}")
+    print(f"{'load (memory-mapped)':<26}{mapped:>10.4f}")
+    print(f"{'load (warm cache)':<26}{warm:>10.6f}")
+    print(f"{'per-row predict (est.)':<26}{per_row:>10.1f}")
+    print(f"{'batched predict_proba':<26}{batched:>10.3f}")
+    print(f"Repeat evictions: {labels.mean():.1%} overall, {top:.1%} in the top-scored 20%; "
+          f"{(scores >= model.threshold).mean():.1%} flagged")
+
+
+if __name__ == "__main__":
+    main()
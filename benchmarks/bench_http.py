@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+HTTP path benchmark against the local SODA stand-in server
+Reports keyset pagination throughput and concurrent fetch_all latency
+under injected latency and failures
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_sources.api_client import DataSFAPIClient
+from data_sources.async_client import fetch_all_datasets
+from data_sources.soda_server import FaultInjector, SODAStandInServer, load_datasets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--page-size', type=int, default=5000)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    datasets = load_datasets(rows=args.rows)
+    faults = FaultInjector(latency=args.latency, error_rate=args.error_rate, throttle_rate=args.throttle_rate)
+    with SODAStandInServer(datasets, faults=faults) as server:
+        client = DataSFAPIClient(base_url=server.base_url, use_cache=False)
+
+        start = time.perf_counter()
+        rows = sum(len(page) for page in client.iter_raw_pages('311', "1 = 1", page_size=args.page_size))
+        elapsed = time.perf_counter() - start
+        print(f"keyset pagination: {rows:,} rows in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)")
+
+        start = time.perf_counter()
+        fetch_all_datasets('Mission', 2024, 1000, base_url=server.base_url, use_cache=False)
+        print(f"fetch_all (4 datasets, concurrent): {time.perf_counter() - start:.3f}s")
+
+        start = time.perf_counter()
+        client.get_311_data('Graffiti', 1000)
+        client.get_eviction_data('Mission', 1000)
+        client.get_building_permits('Mission', 1000)
+        client.get_budget_data(2024)
+        print(f"get_* (4 datasets, sequential): {time.perf_counter() - start:.3f}s")
+        print(f"server stats: {server.stats}")
+        print(f"client metrics: {client.metrics()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Decision-table benchmark on synthetic 311 issues
+Compares the per-row strategy loop StreetPrecog used to run with the
+compiled maintenance and outreach rule tables
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.street_precog import MAINTENANCE_RULES, OUTREACH_RULES
+from data_sources.records import Issue, RecordTable
+from data_sources.synthetic import SyntheticCityGenerator
+
+
+def row_loop(issues: RecordTable) -> list:
+    """Baseline: one if/else chain per issue."""
+    strategies = []
+    for issue in issues:
+        if issue.type == 'gross':
+            strategies.append({'type': 'outreach', 'target': issue.location, 'action': 'Schedule cleanup crew',
+                               'priority': 'high' if issue.severity > 0.7 else 'medium'})
+    for issue in issues:
+        if issue.type == 'safety':
+            strategies.append({'type': 'maintenance', 'target': issue.location, 'action': 'Schedule safety inspection',
+                               'priority': 'high' if issue.severity > 0.7 else 'medium'})
+        elif issue.type == 'accessibility':
+            strategies.append({'type': 'maintenance', 'target': issue.location,
+                               'action': 'Schedule accessibility repair', 'priority': 'medium'})
+    return strategies
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    issues = RecordTable.from_frame(Issue, SyntheticCityGenerator().to_frame('311_issues', args.rows))
+    baseline, loop = timed(row_loop, issues)
+    _, arrays = timed(lambda: [table.columns(issues) for table in (OUTREACH_RULES, MAINTENANCE_RULES)])
+    records, dicts = timed(lambda: OUTREACH_RULES.records(issues) + MAINTENANCE_RULES.records(issues))
+
+    print(f"🚀 {len(issues):,} issues -> {len(records):,} strategies")
+    print(f"{'method':<18}{'seconds':>10}")
+    print(f"{'row loop':<18}{loop:>10.3f}")
+    print(f"{'rule arrays':<18}{arrays:>10.3f}")
+    print(f"{'rule records':<18}{dicts:>10.3f}")
+    print(f"Same strategies: {records == baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+SNAP eligibility and allotment benchmark on synthetic households
+Compares a per-household Python calculation with the vectorized
+calculator, and checks that both agree
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.snap import DEFAULT_VERSION, snap_benefits, snap_parameters
+
+
+def one_household(params, size: int, gross: float, earned: float, shelter: float, other: float) -> float:
+    """Baseline: the same rules for a single household, in plain Python."""
+    adjusted = max(gross - 0.2 * earned - params.standard_deduction[size] - other, 0.0)
+    net = max(adjusted - min(max(shelter - 0.5 * adjusted, 0.0), params.shelter_cap), 0.0)
+    allotment = params.max_allotment[size] - math.ceil(0.3 * net)
+    eligible = gross <= params.gross_limit[size] and (params.net_limit is None or net <= params.net_limit[size])
+    if size <= 2:
+        allotment = max(allotment, params.minimum_benefit)
+    return allotment if eligible and allotment > 0 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=5000000)
+    parser.add_argument('--sample', type=int, default=100000, help="households computed one at a time")
+    parser.add_argument('--version', default=DEFAULT_VERSION)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    size = rng.choice(np.arange(1, 9), size=args.rows, p=[0.3, 0.25, 0.17, 0.13, 0.07, 0.04, 0.02, 0.02])
+    gross = np.round(rng.lognormal(7.8, 0.7, args.rows), 2)
+    earned = np.where(rng.random(args.rows) < 0.7, gross, 0.0)
+    shelter = np.round(rng.lognormal(7.3, 0.4, args.rows), 2)
+    other = np.where(rng.random(args.rows) < 0.2, np.round(rng.uniform(50, 600, args.rows), 2), 0.0)
+
+    params = snap_parameters(args.version)
+    start = time.perf_counter()
+    baseline = [one_household(params, *row) for row in zip(size[:args.sample].tolist(), gross[:args.sample].tolist(),
+                                                               earned[:args.sample].tolist(), shelter[:args.sample].tolist(),
+                                                               other[:args.sample].tolist())]
+    loop = (time.perf_counter() - start) / args.sample * args.rows
+
+    start = time.perf_counter()
+    result = snap_benefits(size, gross, shelter, other, earned_income=earned, version=args.version)
+    vectorized = time.perf_counter() - start
+
+    print(f"🚀 {args.rows:,} households, {args.version} parameters")
+    print(f"{'method':<22}{'seconds':>10}")
+    print(f"{'python loop (est.)':<22}{loop:>10.2f}")
+    print(f"{'vectorized':<22}{vectorized:>10.3f}")
+    print(f"Eligible: {result['eligible'].mean():.1%}; mean allotment ${result['allotment'][result['eligible']].mean():,.0f}; "
+          f"same allotments: {np.array_equal(np.asarray(baseline), result['allotment'][:args.sample])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Spatial index benchmark on synthetic 311 points
+Reports build time and per-query latency for radius, k-nearest, bounding-box
+and hex cell lookups
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.spatial import SpatialIndex
+from data_sources.synthetic import SyntheticCityGenerator
+
+
+def time_query(fn, centers: np.ndarray) -> float:
+    """Mean milliseconds per call over the query centers."""
+    start = time.perf_counter()
+    for latitude, longitude in centers:
+        fn(latitude, longitude)
+    return (time.perf_counter() - start) / len(centers) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--radius', type=float, default=250.0)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--cell-size', type=float, default=250.0)
+    args = parser.parse_args()
+
+    frame = SyntheticCityGenerator().to_frame('311_issues', args.rows)
+    start = time.perf_counter()
+    index = SpatialIndex.from_frame(frame, args.cell_size)
+    build = time.perf_counter() - start
+    print(f"🚀 Indexed {len(index):,} points in {build:.2f}s ({len(np.unique(index.cells)):,} hex cells)")
+
+    # Query around real points so results are representative of agent lookups
+    rng = np.random.default_rng(0)
+    sample = rng.choice(len(frame), size=args.queries)
+    centers = frame[['latitude', 'longitude']].to_numpy()[sample]
+    half = args.radius / 111000
+
+    hits = np.mean([len(index.radius(lat, lon, args.radius)) for lat, lon in centers[:100]])
+    print(f"{'query':<12}{'ms/query':>10}")
+    for name, fn in [
+        (f"radius {args.radius:.0f}m", lambda lat, lon: index.radius(lat, lon, args.radius)),
+        (f"knn k={args.k}", lambda lat, lon: index.nearest(lat, lon, args.k)),
+        ('bbox', lambda lat, lon: index.bbox(lat - half, lon - half, lat + half, lon + half)),
+        ('hex cell', lambda lat, lon: index.in_cell(index.cell_of(lat, lon)))
+    ]:
+        print(f"{name:<12}{time_query(fn, centers):>10.3f}")
+    print(f"Mean radius hits: {hits:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
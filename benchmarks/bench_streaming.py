@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Full-dataset pull benchmark: response.json() + _process_311_data vs the frame path,
+decoding the body whole (response.json() into Arrow), streamed, or chosen by size
+Runs the local SODA stand-in in its own process and each mode in a fresh
+process, then reports wall time, rows/sec and peak RSS per mode
+"""
+
+import argparse
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = ['stream', 'whole', 'auto', 'json']
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_worker(mode: str, base_url: str, rows: int) -> dict:
+    """Pull the whole 311 dataset once in this process and measure it."""
+    from data_sources.api_client import DataSFAPIClient, DATASET_IDS
+
+    client = DataSFAPIClient(base_url=base_url, use_cache=False)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == 'json':
+        response = client.session.get(f"{base_url}/{DATASET_IDS['311']}.json", params={'$limit': rows}, timeout=600)
+        response.raise_for_status()
+        result = client._process_311_data(response.json())
+    else:
+        result = client.stream_frame('311', max_rows=rows, stream={'whole': False, 'stream': True, 'auto': None}[mode])
+    elapsed = time.perf_counter() - start
+    return {'mode': mode, 'rows': len(result), 'seconds': elapsed, 'rows_per_sec': len(result) / elapsed,
+            'baseline_rss_mb': baseline, 'peak_rss_mb': peak_rss_mb()}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(base_url: str, timeout: float):
+    import requests
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(f"{base_url}/vw6y-z8j6.json", params={'$limit': 1}, timeout=5)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.5)
+    raise RuntimeError("SODA stand-in did not start in time")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--modes', nargs='*', default=['stream', 'whole', 'json'], choices=MODES)
+    parser.add_argument('--worker', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.base_url, args.rows)))
+        return
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}/resource"
+    server = subprocess.Popen([sys.executable, '-m', 'data_sources.soda_server', '--datasets', '311',
+                               '--rows', str(args.rows), '--max-limit', str(args.rows), '--port', str(port)],
+                              cwd=ROOT, stdout=subprocess.DEVNULL)
+    try:
+        print(f"Generating {args.rows:,} synthetic 311 rows for the stand-in...")
+        wait_for_server(base_url, timeout=900)
+        print(f"{'mode':<8}{'rows':>10}{'seconds':>10}{'rows/s':>12}{'baseline MB':>14}{'peak RSS MB':>14}")
+        for mode in args.modes:
+            worker = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', mode,
+                                     '--base-url', base_url, '--rows', str(args.rows)],
+                                    cwd=ROOT, capture_output=True, text=True)
+            if worker.returncode != 0:
+                print(f"{mode:<8} failed: {worker.stderr.strip().splitlines()[-1:]}")
+                continue
+            stats = json.loads(worker.stdout.strip().splitlines()[-1])
+            print(f"{mode:<8}{stats['rows']:>10,}{stats['seconds']:>10.2f}{stats['rows_per_sec']:>12,.0f}"
+                  f"{stats['baseline_rss_mb']:>14,.0f}{stats['peak_rss_mb']:>14,.0f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Zoning overlay benchmark on synthetic parcels
+Compares a per-parcel polygon scan with one batched STRtree query, and a
+rerun served from the per-parcel cache
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import shapely
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.zoning import ZoningOverlay, write_synthetic_zoning
+from data_sources.synthetic import SyntheticCityGenerator
+
+
+def scan(overlay: ZoningOverlay, latitude, longitude) -> list:
+    """Baseline: test each parcel against every polygon until one contains it."""
+    districts = []
+    for lat, lon in zip(latitude, longitude):
+        point = shapely.Point(lon, lat)
+        districts.append(next((overlay.district_names[overlay.polygon_codes[i]]
+                               for i, polygon in enumerate(overlay.polygons) if polygon.intersects(point)), None))
+    return districts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--sample', type=int, default=500, help="parcels scanned one at a time")
+    args = parser.parse_args()
+
+    parcels = SyntheticCityGenerator().to_frame('parcels', args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        overlay = ZoningOverlay.from_geojson(write_synthetic_zoning(os.path.join(tmp, 'zoning.geojson')))
+        build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    baseline = scan(overlay, parcels['latitude'][:args.sample], parcels['longitude'][:args.sample])
+    per_parcel = (time.perf_counter() - start) / args.sample * len(parcels)
+
+    timings = []
+    for _ in range(2):
+        start = time.perf_counter()
+        districts = overlay.parcel_districts(parcels['id'], parcels['latitude'], parcels['longitude'])
+        timings.append(time.perf_counter() - start)
+
+    print(f"🚀 {len(parcels):,} parcels over {len(overlay):,} zoning polygons")
+    print(f"{'step':<24}{'seconds':>10}")
+    print(f"{'load + STRtree':<24}{build:>10.3f}")
+    print(f"{'per-parcel scan (est.)':<24}{per_parcel:>10.1f}")
+    print(f"{'batched STRtree':<24}{timings[0]:>10.3f}")
+    print(f"{'cached rerun':<24}{timings[1]:>10.3f}")
+    print(f"Same districts: {list(districts[:args.sample]) == baseline}; "
+          f"off the map: {sum(d is None for d in districts):,}")
+
+
+if __name__ == "__main__":
+    main()
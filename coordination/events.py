@@ -0,0 +1,101 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, List, Optional
+import threading
+import time
+
+
+class EventKind(Enum):
+    PHASE_STARTED = "phase_started"
+    PHASE_COMPLETED = "phase_completed"
+    AGENT_COMPLETED = "agent_completed"
+    LEVEL_UP = "level_up"
+
+
+@dataclass
+class OrchestratorEvent:
+    """A structured progress event emitted by the orchestrator."""
+    kind: EventKind
+    phase: str
+    message: str = ""
+    agent: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+
+class EventSink(ABC):
+    """Destination for orchestrator events (UI, logs, test buffers)."""
+
+    @abstractmethod
+    def emit(self, event: OrchestratorEvent):
+        """Receive one event."""
+        pass
+
+    def flush(self):
+        """Deliver anything buffered so far."""
+        pass
+
+
+class NullSink(EventSink):
+    """Drops every event; used for headless and batch runs."""
+
+    def emit(self, event: OrchestratorEvent):
+        pass
+
+
+class BufferingSink(EventSink):
+    """Keeps every event in memory so tests can assert on them."""
+
+    def __init__(self):
+        self.events: List[OrchestratorEvent] = []
+        self._lock = threading.Lock()
+
+    def emit(self, event: OrchestratorEvent):
+        with self._lock:
+            self.events.append(event)
+
+    def of_kind(self, kind: EventKind) -> List[OrchestratorEvent]:
+        """Return buffered events of a single kind, in emission order."""
+        return [event for event in self.events if event.kind == kind]
+
+    def clear(self):
+        """Drop all buffered events."""
+        with self._lock:
+            self.events = []
+
+
+class StreamlitSink(EventSink):
+    """Renders events in Streamlit, batching each phase into a few UI calls.
+
+    Events are held until their phase completes and then written as one
+    header, one success block and one info block, instead of one websocket
+    message per agent. Streamlit is imported lazily so that importing this
+    module never pulls it into worker processes.
+    """
+
+    def __init__(self):
+        self._pending: List[OrchestratorEvent] = []
+
+    def emit(self, event: OrchestratorEvent):
+        self._pending.append(event)
+        if event.kind == EventKind.PHASE_COMPLETED:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+
+        import streamlit as st
+
+        pending, self._pending = self._pending, []
+        successes = [e.message for e in pending if e.kind == EventKind.AGENT_COMPLETED]
+        infos = [e.message for e in pending if e.kind == EventKind.LEVEL_UP]
+
+        for event in pending:
+            if event.kind == EventKind.PHASE_STARTED:
+                st.write(event.message)
+        if successes:
+            st.success("  \n".join(successes))
+        if infos:
+            st.info("  \n".join(infos))
@@ -0,0 +1,159 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+
+class ExecutorMode(Enum):
+    SEQUENTIAL = "sequential"
+    THREAD = "thread"
+    ASYNCIO = "asyncio"
+
+
+AgentTask = Callable[[], Dict[str, Any]]
+
+
+class PhaseExecutor:
+    """Runs the agents of one orchestrator phase, optionally concurrently.
+
+    Results are always returned in the order the tasks were given, so the
+    merged phase output does not depend on which agent finished first. An
+    agent that exceeds ``agent_timeout`` is replaced by a timeout result
+    instead of holding up the rest of the chain. Its thread cannot be
+    stopped, so the agent is not handed another task until that work has
+    finished; each phase gets a fresh pool so abandoned work never takes
+    a later phase's workers.
+    """
+
+    def __init__(self, mode: Any = ExecutorMode.SEQUENTIAL, agent_timeout: Optional[float] = None,
+                 max_workers: Optional[int] = None):
+        self.mode = ExecutorMode(mode)
+        self.agent_timeout = agent_timeout
+        self.max_workers = max_workers
+        # Tasks abandoned at a timeout that may still be running, by agent
+        self._abandoned: Dict[str, Future] = {}
+
+    def run_phase(self, phase: str, tasks: Dict[str, AgentTask]) -> Dict[str, Dict[str, Any]]:
+        """Run every agent task of a phase and merge results in task order."""
+        if not tasks:
+            return {}
+
+        # Agents still busy with an abandoned task sit this phase out
+        results = {name: self._busy_result(phase, name) for name in self._settle_abandoned(tasks)}
+        runnable = {name: task for name, task in tasks.items() if name not in results}
+        if runnable and self.mode == ExecutorMode.SEQUENTIAL:
+            results.update(self._run_sequential(phase, runnable))
+        elif runnable and self.mode == ExecutorMode.THREAD:
+            results.update(self._run_threaded(phase, runnable))
+        elif runnable:
+            results.update(self._run_asyncio(phase, runnable))
+
+        # Deterministic merge: follow task order, not completion order
+        return {name: results[name] for name in tasks}
+
+    def shutdown(self):
+        """Wait for abandoned agent tasks, so the agents are idle before anything else uses them."""
+        wait(list(self._abandoned.values()))
+        self._abandoned.clear()
+
+    def _new_pool(self, n_tasks: int) -> ThreadPoolExecutor:
+        """Worker pool for one phase, one worker per agent unless max_workers says otherwise."""
+        return ThreadPoolExecutor(max_workers=self.max_workers or max(n_tasks, 1), thread_name_prefix="precog-agent")
+
+    def _settle_abandoned(self, names: Any) -> set:
+        """Give earlier timed-out tasks of these agents up to agent_timeout to finish; returns agents still busy."""
+        pending = {name: self._abandoned[name] for name in names if name in self._abandoned}
+        if pending:
+            wait(pending.values(), timeout=self.agent_timeout)
+        busy = set()
+        for name, future in pending.items():
+            if future.done():
+                del self._abandoned[name]
+            else:
+                busy.add(name)
+        return busy
+
+    def _run_sequential(self, phase: str, tasks: Dict[str, AgentTask]) -> Dict[str, Dict[str, Any]]:
+        """Run tasks one after another, never two agents at once."""
+        if self.agent_timeout is None:
+            return {name: task() for name, task in tasks.items()}
+
+        # Each agent still runs alone, but in a worker so it can be abandoned;
+        # one worker per agent keeps an abandoned agent from blocking the next
+        pool = self._new_pool(len(tasks))
+        results = {}
+        for name, task in tasks.items():
+            future = pool.submit(task)
+            done, _ = wait([future], timeout=self.agent_timeout)
+            results[name] = future.result() if done else self._abandon(phase, name, future)
+        pool.shutdown(wait=False)
+        return results
+
+    def _run_threaded(self, phase: str, tasks: Dict[str, AgentTask]) -> Dict[str, Dict[str, Any]]:
+        """Run all tasks concurrently on a thread pool."""
+        pool = self._new_pool(len(tasks))
+        futures = {name: pool.submit(task) for name, task in tasks.items()}
+
+        # All agents start together, so one shared deadline is a per-agent timeout
+        done, _ = wait(futures.values(), timeout=self.agent_timeout)
+
+        results = {}
+        for name, future in futures.items():
+            results[name] = future.result() if future in done else self._abandon(phase, name, future)
+        pool.shutdown(wait=False)
+        return results
+
+    def _run_asyncio(self, phase: str, tasks: Dict[str, AgentTask]) -> Dict[str, Dict[str, Any]]:
+        """Run all tasks concurrently from an asyncio event loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._gather_phase(phase, tasks))
+
+        # Already inside a loop (e.g. an async caller): a nested loop is not allowed
+        return self._run_threaded(phase, tasks)
+
+    async def run_phase_async(self, phase: str, tasks: Dict[str, AgentTask]) -> Dict[str, Dict[str, Any]]:
+        """Awaitable variant of run_phase for callers that own an event loop."""
+        busy = await asyncio.get_running_loop().run_in_executor(None, self._settle_abandoned, list(tasks))
+        results = {name: self._busy_result(phase, name) for name in busy}
+        runnable = {name: task for name, task in tasks.items() if name not in busy}
+        if runnable:
+            results.update(await self._gather_phase(phase, runnable))
+        return {name: results[name] for name in tasks}
+
+    async def _gather_phase(self, phase: str, tasks: Dict[str, AgentTask]) -> Dict[str, Dict[str, Any]]:
+        """Await all tasks on a thread pool, each under the agent timeout."""
+        pool = self._new_pool(len(tasks))
+
+        async def run_one(name: str, task: AgentTask) -> Dict[str, Any]:
+            future = pool.submit(task)
+            try:
+                return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout=self.agent_timeout)
+            except asyncio.TimeoutError:
+                return self._abandon(phase, name, future)
+
+        gathered = await asyncio.gather(*(run_one(name, task) for name, task in tasks.items()))
+        pool.shutdown(wait=False)
+        return dict(zip(tasks.keys(), gathered))
+
+    def _abandon(self, phase: str, agent_name: str, future: Future) -> Dict[str, Any]:
+        """Record a task that missed its deadline and return its timeout result."""
+        self._abandoned[agent_name] = future
+        return self._timeout_result(phase, agent_name)
+
+    def _timeout_result(self, phase: str, agent_name: str) -> Dict[str, Any]:
+        """Placeholder result for an agent that did not finish in time."""
+        return {
+            'confidence': 0.0,
+            'mode': phase,
+            'timed_out': True,
+            'level_up_message': f"{agent_name} timed out after {self.agent_timeout}s"
+        }
+
+    def _busy_result(self, phase: str, agent_name: str) -> Dict[str, Any]:
+        """Placeholder result for an agent still running a task it timed out on earlier."""
+        return {
+            **self._timeout_result(phase, agent_name),
+            'level_up_message': f"{agent_name} skipped: still running a task that timed out earlier"
+        }
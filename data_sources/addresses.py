@@ -0,0 +1,196 @@
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Next to the package rather than the working directory; ADDRESS_KEYS_PATH overrides it
+DEFAULT_KEYS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data_cache', 'address_keys.db')
+
+# Street types as DataSF spells them, keyed by the spellings feeds use
+STREET_SUFFIXES = {
+    'STREET': 'ST', 'STR': 'ST', 'AVENUE': 'AVE', 'AV': 'AVE', 'BOULEVARD': 'BLVD', 'DRIVE': 'DR',
+    'PLACE': 'PL', 'TERRACE': 'TER', 'COURT': 'CT', 'LANE': 'LN', 'ROAD': 'RD', 'ALLEY': 'ALY',
+    'PLAZA': 'PLZ', 'HIGHWAY': 'HWY', 'CIRCLE': 'CIR', 'PARKWAY': 'PKWY', 'SQUARE': 'SQ'
+}
+UNIT_DESIGNATORS = ['APARTMENT', 'APT', 'UNIT', 'SUITE', 'STE', 'FLOOR', 'FL', 'ROOM', 'RM', 'BLDG', 'SPACE', 'SPC']
+
+_UNIT = rf"(?:\s+(?:{'|'.join(UNIT_DESIGNATORS)})\b\s*\S*|\s*#\s*\S*)$"
+# Number (ranges and letter suffixes collapse to the first number), optional "BLOCK OF", street
+_PARTS = r'^0*(?P<number>\d+)[A-Z]?(?:\s*-\s*\d+[A-Z]?)?\s+(?P<block>BLOCK OF\s+)?(?P<name>.*?)\s*\b(?P<suffix>\w+)$'
+KEY_COLUMNS = ['key', 'block_key', 'is_block']
+
+_TABLES: Dict[Tuple[str, int], 'AddressKeyTable'] = {}
+_TABLES_LOCK = threading.Lock()
+
+
+def normalize_addresses(addresses: Any) -> pd.DataFrame:
+    """Normalized address keys, one row per input (NA where there is no key).
+
+    ``key`` is "NUMBER STREET TYPE" in upper case with punctuation, units
+    ("APT 4", "#2") and ordinal zero-padding removed and street types
+    abbreviated, e.g. "123-125 Market Street, Apt. 4" -> "123 MARKET ST".
+    ``block_key`` is the same address rounded down to its hundred block, and
+    ``is_block`` marks block-level addresses such as DataSF's eviction feed
+    ("1400 Block Of Mission St"). Addresses without a street number get no key.
+    """
+    # Arrow's RE2 kernels parse the whole column without a per-row Python call
+    text = pc.utf8_upper(pa.array(list(addresses), type=pa.string(), from_pandas=True))
+    text = pc.utf8_trim_whitespace(pc.replace_substring_regex(pc.replace_substring_regex(text, r"[.,']", ''), r'\s+', ' '))
+    parts = pc.extract_regex(pc.replace_substring_regex(text, _UNIT, ''), _PARTS)
+
+    number = pc.cast(pc.struct_field(parts, 'number'), pa.int64())
+    name = pc.replace_substring_regex(pc.struct_field(parts, 'name'), r'\b0+(\d)', r'\1')
+    # Few distinct street types, so map the dictionary instead of every row
+    suffix = pc.dictionary_encode(pc.replace_substring_regex(pc.struct_field(parts, 'suffix'), r'\b0+(\d)', r'\1'))
+    abbreviated = pa.array([STREET_SUFFIXES.get(word, word) for word in suffix.dictionary.to_pylist()], type=pa.string())
+    street = pc.binary_join_element_wise(name, pc.take(abbreviated, suffix.indices), ' ')
+    street = pc.if_else(pc.equal(name, ''), pc.take(abbreviated, suffix.indices), street)
+
+    block = pc.multiply(pc.divide(number, 100), 100)
+    key = pc.binary_join_element_wise(pc.cast(number, pa.string()), street, ' ')
+    block_key = pc.binary_join_element_wise(pc.cast(block, pa.string()), street, ' ')
+    return pd.DataFrame({
+        'key': key.to_pandas(),
+        'block_key': block_key.to_pandas(),
+        'is_block': pc.fill_null(pc.not_equal(pc.struct_field(parts, 'block'), ''), False).to_numpy(zero_copy_only=False)
+    })
+
+
+class AddressKeyTable:
+    """Raw address -> normalized key table, persisted in SQLite.
+
+    Each distinct raw address is parsed once: known addresses resolve with a
+    single hash-index probe, and only addresses not seen before are
+    normalized and written, so re-keying a refreshed feed parses and stores
+    O(new addresses). Pass ``':memory:'`` for a table that is not persisted.
+    """
+
+    def __init__(self, path: str = DEFAULT_KEYS_PATH):
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.stats = {'known': 0, 'parsed': 0}
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS address_keys ("
+            " raw TEXT PRIMARY KEY, key TEXT, block_key TEXT, is_block INTEGER NOT NULL)"
+        )
+        self.conn.commit()
+        stored = pd.read_sql_query("SELECT raw, key, block_key, is_block FROM address_keys", self.conn)
+        self._raw = pd.Index(stored['raw'].astype(object))
+        self._keys = stored[KEY_COLUMNS].astype({'is_block': bool}).reset_index(drop=True)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def lookup(self, addresses: Any) -> pd.DataFrame:
+        """KEY_COLUMNS for each address, in input order (NA keys for missing addresses)."""
+        column = addresses if isinstance(addresses, pd.Series) else pd.Series(list(addresses), dtype=object)
+        codes, uniques = pd.factorize(column)
+        uniques = pd.Index(np.asarray(uniques, dtype=object)).astype(str)
+
+        with self._lock:
+            positions = self._raw.get_indexer(uniques)
+            new = uniques[positions < 0]
+            if len(new):
+                parsed = normalize_addresses(new)
+                # SQLite holds NULL, not NaN, for missing keys
+                rows = zip(new, *(parsed[column].astype(object).where(parsed[column].notna(), None).tolist()
+                                  for column in KEY_COLUMNS))
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO address_keys (raw, key, block_key, is_block) VALUES (?, ?, ?, ?)",
+                    [(raw, key, block_key, int(is_block)) for raw, key, block_key, is_block in rows]
+                )
+                self.conn.commit()
+                positions[positions < 0] = np.arange(len(self._raw), len(self._raw) + len(new))
+                self._raw = self._raw.append(new)
+                self._keys = pd.concat([self._keys, parsed], ignore_index=True)
+            self.stats['parsed'] += len(new)
+            self.stats['known'] += len(uniques) - len(new)
+            keys = self._keys
+
+        # Missing addresses (code -1) get NA keys
+        rows = np.where(codes < 0, -1, positions[np.maximum(codes, 0)]) if len(uniques) else np.full(len(codes), -1)
+        keyed = keys.reindex(rows).reset_index(drop=True)
+        keyed['is_block'] = keyed['is_block'].fillna(False).astype(bool)
+        return keyed
+
+    def close(self):
+        self.conn.close()
+
+
+def load_address_keys(path: Optional[str] = None) -> AddressKeyTable:
+    """The process-wide key table for a path (default: ADDRESS_KEYS_PATH, else DEFAULT_KEYS_PATH).
+
+    Opened and read into memory once per process, so agent instances share
+    it; forked workers open their own SQLite connection.
+    """
+    path = os.path.abspath(path or os.environ.get('ADDRESS_KEYS_PATH') or DEFAULT_KEYS_PATH)
+    with _TABLES_LOCK:
+        table = _TABLES.get((path, os.getpid()))
+        if table is None:
+            table = _TABLES[path, os.getpid()] = AddressKeyTable(path)
+        return table
+
+
+class AddressLinks:
+    """Rows of several tables linked by normalized address.
+
+    Every table's keys are factorized together in one hashing pass, so a
+    link between any two tables is a hash join on shared integer codes.
+    Block-level addresses on the left side of a link match every right row
+    on that hundred block; other addresses match exactly.
+    """
+
+    def __init__(self, keyed: Dict[str, pd.DataFrame]):
+        self.names = list(keyed)
+        stacked = pd.concat([keyed[name][KEY_COLUMNS] for name in self.names], ignore_index=True)
+        key_codes = pd.factorize(stacked['key'])[0]
+        block_codes = pd.factorize(stacked['block_key'])[0]
+        is_block = stacked['is_block'].to_numpy(dtype=bool)
+
+        self._codes: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        start = 0
+        for name in self.names:
+            stop = start + len(keyed[name])
+            self._codes[name] = (key_codes[start:stop], block_codes[start:stop], is_block[start:stop])
+            start = stop
+
+    def pairs(self, left: str, right: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(left_row, right_row) for every pair of rows at the same address, in left row order."""
+        left_keys, left_blocks, left_is_block = self._codes[left]
+        right_keys, right_blocks, _ = self._codes[right]
+        # Exact addresses join on the key, block addresses on the block key
+        probe = np.where(left_is_block, -2 - left_blocks, left_keys)
+        probe[(left_is_block & (left_blocks < 0)) | (~left_is_block & (left_keys < 0))] = -1
+        build = np.concatenate([right_keys, -2 - right_blocks])
+        build_rows = np.concatenate([np.arange(len(right_keys)), np.arange(len(right_blocks))])
+        build_rows, build = build_rows[build != -1], build[build != -1]
+
+        matched = pd.merge(
+            pd.DataFrame({'code': probe[probe != -1], 'left': np.flatnonzero(probe != -1)}),
+            pd.DataFrame({'code': build, 'right': build_rows}),
+            on='code', how='inner', sort=False
+        ).sort_values(['left', 'right'], kind='stable')
+        return matched['left'].to_numpy(np.int64), matched['right'].to_numpy(np.int64)
+
+    def first(self, left: str, right: str) -> np.ndarray:
+        """For each left row, the first matching right row, or -1."""
+        rows = np.full(len(self._codes[left][0]), -1, dtype=np.int64)
+        left_rows, right_rows = self.pairs(left, right)
+        # Pairs come sorted by (left, right), so the first of each left row wins
+        unique_left, first = np.unique(left_rows, return_index=True)
+        rows[unique_left] = right_rows[first]
+        return rows
+
+    def counts(self, left: str, right: str) -> np.ndarray:
+        """Number of matching right rows for each left row."""
+        left_rows, _ = self.pairs(left, right)
+        return np.bincount(left_rows, minlength=len(self._codes[left][0]))
+
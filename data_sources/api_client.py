@@ -1,97 +1,379 @@
 import requests
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+import pyarrow as pa
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import json
+import os
+import re
+import threading
+from urllib.parse import urlparse
+from .cache import DatasetCache, DEFAULT_CACHE_DIR
+from .resilience import DataSourceUnavailable, ResilientCaller
+from .classifier import EVICTION_RISK_CLASSIFIER, classify_request_type
+from .frames import POINT_FIELDS, frame_311_data, frame_eviction_data, frame_permit_data, frame_budget_data
+from .query import SoQLQuery
+from .records import RECORD_TYPES, RecordTable
+from .streaming import records_to_arrow, stream_table
+
+# SODA dataset ids on data.sfgov.org
+DATASET_IDS = {
+    '311': 'vw6y-z8j6',
+    'evictions': '5cei-gny5',
+    'permits': 'ipu4-2q9a',
+    'budget': '6j9d-3q6k'
+}
+
+# SoQL filters used by the get_* and iter_* methods
+WHERE_TEMPLATES = {
+    '311': "service_request_type LIKE '%{location}%'",
+    'evictions': "neighborhood LIKE '%{location}%'",
+    'permits': "neighborhood LIKE '%{location}%'",
+    'budget': "fiscal_year = {fiscal_year}"
+}
+
+DEFAULT_BASE_URL = "https://data.sfgov.org/resource"
+
+# stream_table() decodes bodies incrementally only above these sizes; smaller ones parse faster whole
+STREAM_MIN_ROWS = 100000
+STREAM_MIN_BYTES = 40 * 1024 * 1024
+
+# Columnar processors for each dataset, used by the streaming path
+FRAMERS = {
+    '311': frame_311_data,
+    'evictions': frame_eviction_data,
+    'permits': frame_permit_data,
+    'budget': frame_budget_data
+}
 
 class DataSFAPIClient:
-    """API client for DataSF APIs with mock fallbacks."""
+    """API client for DataSF APIs with retries, caching and optional mock fallbacks.
+    
+    ``base_url`` (or the DATASF_BASE_URL environment variable) points the
+    client at another SODA host, such as the local stand-in in
+    data_sources.soda_server. Responses from other hosts get their own
+    cache directory so they never mix with real DataSF data.
     
-    def __init__(self):
-        self.base_url = "https://data.sfgov.org/resource"
+    Failed requests are retried with backoff behind a per-dataset circuit
+    breaker (see data_sources.resilience). Mock rows are only returned when
+    ``allow_mock`` is set; otherwise an outage raises DataSourceUnavailable.
+    """
+    
+    def __init__(self, cache: Optional[DatasetCache] = None, use_cache: bool = True, base_url: Optional[str] = None,
+                 resilience: Optional[ResilientCaller] = None, allow_mock: bool = False):
+        self.base_url = (base_url or os.environ.get('DATASF_BASE_URL') or DEFAULT_BASE_URL).rstrip('/')
         self.api_key = None  # Would be set from environment in production
         self.session = requests.Session()
+        self.page_size = 1000
+        self.timeout = (3.05, 10)  # (connect, read) seconds per attempt
+        self.resilience = resilience or ResilientCaller()
+        self.allow_mock = allow_mock
+        self._revalidating = set()
+        self._revalidate_lock = threading.Lock()
+        if cache is None and use_cache:
+            cache = DatasetCache() if self.base_url == DEFAULT_BASE_URL else DatasetCache(self._host_cache_dir())
+        self.cache = cache
+    
+    def _host_cache_dir(self) -> str:
+        """Cache directory for a non-default SODA host."""
+        host = re.sub(r'[^A-Za-z0-9.-]+', '_', urlparse(self.base_url).hostname or 'local')
+        return os.path.join(DEFAULT_CACHE_DIR, host)
         
     def get_311_data(self, location: str = "San Francisco", limit: int = 100) -> List[Dict[str, Any]]:
         """Fetch 311 service request data."""
-        try:
-            # Real DataSF API endpoint for 311 data
-            url = f"{self.base_url}/vw6y-z8j6.json"
-            params = {
-                '$limit': limit,
-                '$where': f"service_request_type LIKE '%{location}%'"
-            }
-            
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            return self._process_311_data(data)
-            
-        except Exception as e:
-            print(f"Error fetching 311 data: {e}")
-            return self._get_mock_311_data(location, limit)
+        # Real DataSF API endpoint for 311 service request data
+        params = {
+            '$limit': limit,
+            '$where': WHERE_TEMPLATES['311'].format(location=location)
+        }
+        
+        return self._fetch('311', params, self._process_311_data, lambda: self._get_mock_311_data(location, limit))
     
     def get_eviction_data(self, location: str = "San Francisco", limit: int = 100) -> List[Dict[str, Any]]:
         """Fetch eviction data."""
-        try:
-            # Real DataSF API endpoint for eviction data
-            url = f"{self.base_url}/5cei-gny5.json"
-            params = {
-                '$limit': limit,
-                '$where': f"neighborhood LIKE '%{location}%'"
-            }
-            
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            return self._process_eviction_data(data)
-            
-        except Exception as e:
-            print(f"Error fetching eviction data: {e}")
-            return self._get_mock_eviction_data(location, limit)
+        # Real DataSF API endpoint for eviction data
+        params = {
+            '$limit': limit,
+            '$where': WHERE_TEMPLATES['evictions'].format(location=location)
+        }
+        
+        return self._fetch('evictions', params, self._process_eviction_data, lambda: self._get_mock_eviction_data(location, limit))
     
     def get_building_permits(self, location: str = "San Francisco", limit: int = 100) -> List[Dict[str, Any]]:
         """Fetch building permit data."""
-        try:
-            # Real DataSF API endpoint for building permits
-            url = f"{self.base_url}/ipu4-2q9a.json"
-            params = {
-                '$limit': limit,
-                '$where': f"neighborhood LIKE '%{location}%'"
-            }
-            
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            return self._process_permit_data(data)
-            
-        except Exception as e:
-            print(f"Error fetching permit data: {e}")
-            return self._get_mock_permit_data(location, limit)
+        # Real DataSF API endpoint for building permit data
+        params = {
+            '$limit': limit,
+            '$where': WHERE_TEMPLATES['permits'].format(location=location)
+        }
+        
+        return self._fetch('permits', params, self._process_permit_data, lambda: self._get_mock_permit_data(location, limit))
     
     def get_budget_data(self, fiscal_year: int = 2024) -> List[Dict[str, Any]]:
         """Fetch budget allocation data."""
+        # Real DataSF API endpoint for budget data
+        params = {
+            '$limit': 1000,
+            '$where': WHERE_TEMPLATES['budget'].format(fiscal_year=fiscal_year)
+        }
+        
+        return self._fetch('budget', params, self._process_budget_data, lambda: self._get_mock_budget_data(fiscal_year))
+    
+    def aggregate(self, query: SoQLQuery) -> pd.DataFrame:
+        """Run a SoQLQuery on the server and return its (usually small) result as a typed frame.
+        
+        Grouping and aggregation happen in SODA, so a citywide count per
+        location transfers one row per group instead of every request.
+        Results go through the same cache, retries and breakers as get_*.
+        """
+        return query.to_frame(self._fetch(query.dataset, query.params(), list))
+    
+    def stream_table(self, dataset: str, where: Optional[str] = None, max_rows: Optional[int] = None,
+                     batch_size: int = 50000, select: Optional[str] = None, stream: Optional[bool] = None) -> pa.Table:
+        """Pull a large query as raw Arrow columns, decoding the body while it downloads.
+        
+        Unlike response.json(), the payload is never held whole: records are
+        parsed from the byte stream and packed into Arrow batch_size at a
+        time, so peak memory is the Arrow table plus one batch of dicts.
+        That decoder is slower than response.json() (about 1.6x at 400k
+        rows), so by default (``stream=None``) bodies known to be small,
+        by max_rows <= STREAM_MIN_ROWS or a Content-Length under
+        STREAM_MIN_BYTES, are parsed whole instead; ``stream`` forces
+        either path.
+        """
+        params: Dict[str, Any] = {'$limit': max_rows or 1000000000}
+        if where:
+            params['$where'] = where
+        if select:
+            params['$select'] = select
+        url = f"{self.base_url}/{DATASET_IDS[dataset]}.json"
+        
+        def request() -> pa.Table:
+            with self.session.get(url, params=params, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                if not self._should_stream(stream, max_rows, response.headers.get('Content-Length')):
+                    return records_to_arrow(response.json(), batch_size)
+                return stream_table(response.iter_content(chunk_size=1 << 16), batch_size, response.encoding)
+        
+        return self.resilience.call(dataset, request)
+    
+    @staticmethod
+    def _should_stream(stream: Optional[bool], max_rows: Optional[int], content_length: Optional[str]) -> bool:
+        """Whether to decode incrementally: as asked, else only when the body may be large."""
+        if stream is not None:
+            return stream
+        if max_rows is not None and max_rows <= STREAM_MIN_ROWS:
+            return False
+        return content_length is None or int(content_length) > STREAM_MIN_BYTES
+    
+    def stream_frame(self, dataset: str, where: Optional[str] = None, max_rows: Optional[int] = None,
+                     batch_size: int = 50000, stream: Optional[bool] = None) -> pd.DataFrame:
+        """stream_table() followed by the dataset's columnar processor (see data_sources.frames)."""
+        return FRAMERS[dataset](self.stream_table(dataset, where, max_rows, batch_size, stream=stream))
+    
+    def stream_records(self, dataset: str, where: Optional[str] = None, max_rows: Optional[int] = None,
+                       batch_size: int = 50000, stream: Optional[bool] = None) -> RecordTable:
+        """stream_frame() as a compact RecordTable the agents consume directly."""
+        return RecordTable.from_frame(RECORD_TYPES[dataset], self.stream_frame(dataset, where, max_rows, batch_size, stream))
+    
+    def _fetch(self, dataset: str, params: Dict[str, Any],
+               processor: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+               mock_fallback: Optional[Callable[[], List[Dict[str, Any]]]] = None) -> List[Dict[str, Any]]:
+        """Fetch and process one SODA query: fresh cache, then stale cache, then the network.
+        
+        An expired cache entry is served immediately while a background
+        request refreshes it (stale-while-revalidate). With nothing cached,
+        the request runs under the retry policy and circuit breaker; if it
+        still fails, DataSourceUnavailable is raised unless allow_mock is set.
+        The async client runs the same steps (_from_cache, _store, _fallback)
+        around its own request.
+        """
+        cached = self._from_cache(dataset, params, processor)
+        if cached is not None:
+            return cached
+        
         try:
-            # Real DataSF API endpoint for budget data
-            url = f"{self.base_url}/6j9d-3q6k.json"
+            return self._fetch_fresh(dataset, params, processor)
+        except Exception as e:
+            return self._fallback(dataset, e, mock_fallback)
+    
+    def _from_cache(self, dataset: str, params: Dict[str, Any],
+                    processor: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]) -> Optional[List[Dict[str, Any]]]:
+        """Cached records for a query, fresh or (revalidating in the background) stale; None when nothing is cached."""
+        if self.cache is None:
+            return None
+        cached, expired = self.cache.lookup(dataset, params)
+        if cached is not None and expired:
+            self.resilience.metrics.record(dataset, 'stale_served')
+            self._revalidate(dataset, params, processor)
+        return cached
+    
+    def _fallback(self, dataset: str, error: Exception,
+                  mock_fallback: Optional[Callable[[], List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """Mock rows for a failed fetch when allow_mock is set; otherwise raise DataSourceUnavailable."""
+        if mock_fallback is not None and self.allow_mock:
+            print(f"⚠️ Serving mock {dataset} data: {error}")
+            self.resilience.metrics.record(dataset, 'mock_served')
+            return mock_fallback()
+        if isinstance(error, DataSourceUnavailable):
+            raise error
+        raise DataSourceUnavailable(f"Could not fetch {dataset} data: {error}") from error
+    
+    def _fetch_fresh(self, dataset: str, params: Dict[str, Any],
+                     processor: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Fetch a query from the network and store it in the cache."""
+        return self._store(dataset, params, self._get_json(dataset, params), processor)
+    
+    def _store(self, dataset: str, params: Dict[str, Any], data: List[Dict[str, Any]],
+               processor: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Process a fetched payload and cache both forms."""
+        processed = processor(data)
+        
+        if self.cache is not None:
+            self.cache.put(dataset, params, raw=data, processed=processed)
+        return processed
+    
+    def _get_json(self, dataset: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """GET one SODA page with retries, backoff and the dataset's circuit breaker."""
+        url = f"{self.base_url}/{DATASET_IDS[dataset]}.json"
+        
+        def request() -> List[Dict[str, Any]]:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        
+        return self.resilience.call(dataset, request)
+    
+    def _revalidate(self, dataset: str, params: Dict[str, Any],
+                    processor: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]):
+        """Refresh an expired cache entry on a background thread, once per query at a time."""
+        key = self.cache.cache_key(dataset, params)
+        with self._revalidate_lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+        
+        def refresh():
+            try:
+                self._fetch_fresh(dataset, params, processor)
+                self.resilience.metrics.record(dataset, 'revalidations')
+            except Exception as e:
+                print(f"⚠️ Could not revalidate {dataset} data: {e}")
+            finally:
+                with self._revalidate_lock:
+                    self._revalidating.discard(key)
+        
+        threading.Thread(target=refresh, daemon=True).start()
+    
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Retry, breaker and cache-fallback counters per dataset."""
+        return self.resilience.snapshot()
+    
+    def iter_311_pages(self, location: str = "San Francisco", page_size: Optional[int] = None,
+                       max_rows: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Page through every matching 311 request, yielding each processed page."""
+        return self._iter_pages('311', WHERE_TEMPLATES['311'].format(location=location), self._process_311_data,
+                                page_size, max_rows, lambda: self._get_mock_311_data(location, max_rows or 100))
+    
+    def iter_eviction_pages(self, location: str = "San Francisco", page_size: Optional[int] = None,
+                            max_rows: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Page through every matching eviction notice, yielding each processed page."""
+        return self._iter_pages('evictions', WHERE_TEMPLATES['evictions'].format(location=location), self._process_eviction_data,
+                                page_size, max_rows, lambda: self._get_mock_eviction_data(location, max_rows or 100))
+    
+    def iter_permit_pages(self, location: str = "San Francisco", page_size: Optional[int] = None,
+                          max_rows: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Page through every matching building permit, yielding each processed page."""
+        return self._iter_pages('permits', WHERE_TEMPLATES['permits'].format(location=location), self._process_permit_data,
+                                page_size, max_rows, lambda: self._get_mock_permit_data(location, max_rows or 100))
+    
+    def iter_311_frames(self, location: str = "San Francisco", page_size: Optional[int] = None,
+                        max_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Page through 311 requests, yielding each page as a typed DataFrame."""
+        return self._iter_pages('311', WHERE_TEMPLATES['311'].format(location=location), frame_311_data,
+                                page_size, max_rows, lambda: pd.DataFrame(self._get_mock_311_data(location, max_rows or 100)))
+    
+    def iter_eviction_frames(self, location: str = "San Francisco", page_size: Optional[int] = None,
+                             max_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Page through eviction notices, yielding each page as a typed DataFrame."""
+        return self._iter_pages('evictions', WHERE_TEMPLATES['evictions'].format(location=location), frame_eviction_data,
+                                page_size, max_rows, lambda: pd.DataFrame(self._get_mock_eviction_data(location, max_rows or 100)))
+    
+    def iter_permit_frames(self, location: str = "San Francisco", page_size: Optional[int] = None,
+                           max_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Page through building permits, yielding each page as a typed DataFrame."""
+        return self._iter_pages('permits', WHERE_TEMPLATES['permits'].format(location=location), frame_permit_data,
+                                page_size, max_rows, lambda: pd.DataFrame(self._get_mock_permit_data(location, max_rows or 100)))
+    
+    def _iter_pages(self, dataset: str, where: str, processor: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+                    page_size: Optional[int], max_rows: Optional[int],
+                    mock_fallback: Callable[[], List[Dict[str, Any]]]) -> Iterator[List[Dict[str, Any]]]:
+        """Yield processed pages of a dataset; mocks stand in for a failed first page only if allow_mock.
+        
+        A failure mid-stream is raised instead, since a partial real result
+        mixed with mock rows would be misleading.
+        """
+        pages = self.iter_raw_pages(dataset, where, page_size, max_rows)
+        try:
+            first_page = next(pages, None)
+        except Exception as e:
+            if not self.allow_mock:
+                raise DataSourceUnavailable(f"Could not fetch {dataset} data: {e}") from e
+            print(f"⚠️ Serving mock {dataset} data: {e}")
+            self.resilience.metrics.record(dataset, 'mock_served')
+            yield mock_fallback()
+            return
+        
+        if first_page is None:
+            return
+        yield processor(first_page)
+        
+        for rows in pages:
+            yield processor(rows)
+    
+    def iter_raw_pages(self, dataset: str, where: str, page_size: Optional[int] = None, max_rows: Optional[int] = None,
+                       order_fields: Tuple[str, ...] = (':id',)) -> Iterator[List[Dict[str, Any]]]:
+        """Keyset-paginate a SODA dataset and yield raw rows one page at a time.
+        
+        Rows are ordered by ``order_fields`` and each request asks for rows
+        strictly after the last key seen, so deep pages cost the same as the
+        first and only one page is held in memory. Each page is retried under
+        the client's retry policy; errors that remain are raised.
+        """
+        page_size = page_size or self.page_size
+        last_key = None
+        fetched = 0
+        
+        while max_rows is None or fetched < max_rows:
+            limit = page_size if max_rows is None else min(page_size, max_rows - fetched)
+            page_where = where if last_key is None else f"({where}) AND {self._keyset_condition(order_fields, last_key)}"
             params = {
-                '$limit': 1000,
-                '$where': f"fiscal_year = {fiscal_year}"
+                '$select': ':*, *',
+                '$where': page_where,
+                '$order': ', '.join(order_fields),
+                '$limit': limit
             }
             
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            rows = self._get_json(dataset, params)
             
-            data = response.json()
-            return self._process_budget_data(data)
+            if not rows:
+                return
             
-        except Exception as e:
-            print(f"Error fetching budget data: {e}")
-            return self._get_mock_budget_data(fiscal_year)
+            last_key = tuple(rows[-1].get(field) for field in order_fields)
+            fetched += len(rows)
+            yield rows
+            
+            if len(rows) < limit or None in last_key:
+                return
+    
+    def _keyset_condition(self, fields: Tuple[str, ...], values: Tuple[Any, ...]) -> str:
+        """SoQL condition for rows that sort strictly after ``values`` on ``fields``."""
+        head = f"{fields[0]} > '{values[0]}'"
+        if len(fields) == 1:
+            return head
+        tail = self._keyset_condition(fields[1:], values[1:])
+        return f"({head} OR ({fields[0]} = '{values[0]}' AND {tail}))"
     
     def _process_311_data(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Process 311 data into standardized format."""
@@ -106,7 +388,8 @@ class DataSFAPIClient:
                 'description': item.get('service_request_details', ''),
                 'status': item.get('status', 'open'),
                 'created_date': item.get('requested_datetime', ''),
-                'category': self._categorize_311_request(item.get('service_request_type', ''))
+                'category': self._categorize_311_request(item.get('service_request_type', '')),
+                **self._coordinates(item)
             }
             processed_data.append(processed_item)
         
@@ -124,7 +407,8 @@ class DataSFAPIClient:
                 'type': item.get('eviction_type', 'unknown'),
                 'neighborhood': item.get('neighborhood', 'Unknown'),
                 'date': item.get('file_date', ''),
-                'reason': item.get('eviction_reason', '')
+                'reason': item.get('eviction_reason', ''),
+                **self._coordinates(item)
             }
             processed_data.append(processed_item)
         
@@ -164,53 +448,39 @@ class DataSFAPIClient:
         
         return processed_data
     
+    def _coordinates(self, item: Dict[str, Any]) -> Dict[str, float]:
+        """Latitude/longitude from the row's SODA point (see frames._coordinates), NaN when absent."""
+        latitude = longitude = None
+        for name in POINT_FIELDS:
+            point = item.get(name)
+            coordinates = point.get('coordinates') if isinstance(point, dict) else None
+            if coordinates is not None and len(coordinates) >= 2:
+                longitude, latitude = coordinates[0], coordinates[1]
+                break
+            if isinstance(point, dict) and 'latitude' in point:
+                latitude, longitude = point.get('latitude'), point.get('longitude')
+                break
+        else:
+            latitude = item.get('lat', item.get('latitude'))
+            longitude = item.get('long', item.get('longitude'))
+        try:
+            return {'latitude': float(latitude), 'longitude': float(longitude)}
+        except (TypeError, ValueError):
+            return {'latitude': float('nan'), 'longitude': float('nan')}
+    
     def _calculate_severity(self, item: Dict[str, Any]) -> float:
         """Calculate severity score for 311 requests."""
         # Simple severity calculation based on request type
-        severity_map = {
-            'graffiti': 0.8,
-            'street_light': 0.6,
-            'pothole': 0.7,
-            'trash': 0.5,
-            'noise': 0.4
-        }
-        
-        request_type = item.get('service_request_type', '').lower()
-        for key, value in severity_map.items():
-            if key in request_type:
-                return value
-        
-        return 0.5  # Default severity
+        return classify_request_type(item.get('service_request_type', ''))[1]
     
     def _calculate_eviction_risk(self, item: Dict[str, Any]) -> float:
         """Calculate eviction risk score."""
         # Simple risk calculation based on eviction type
-        risk_map = {
-            'non_payment': 0.8,
-            'lease_violation': 0.6,
-            'owner_move_in': 0.9,
-            'demolition': 0.7
-        }
-        
-        eviction_type = item.get('eviction_type', '').lower()
-        for key, value in risk_map.items():
-            if key in eviction_type:
-                return value
-        
-        return 0.5  # Default risk
+        return EVICTION_RISK_CLASSIFIER.classify(item.get('eviction_type', ''))
     
     def _categorize_311_request(self, request_type: str) -> str:
         """Categorize 311 requests."""
-        request_type_lower = request_type.lower()
-        
-        if any(word in request_type_lower for word in ['graffiti', 'trash', 'litter']):
-            return 'gross'
-        elif any(word in request_type_lower for word in ['light', 'pothole', 'glass']):
-            return 'safety'
-        elif any(word in request_type_lower for word in ['sidewalk', 'ramp']):
-            return 'accessibility'
-        else:
-            return 'other'
+        return classify_request_type(request_type)[0]
     
     def _get_mock_311_data(self, location: str, limit: int) -> List[Dict[str, Any]]:
         """Generate mock 311 data."""
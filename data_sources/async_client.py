@@ -0,0 +1,130 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import aiohttp
+
+from .api_client import DataSFAPIClient, DATASET_IDS, WHERE_TEMPLATES
+from .cache import DatasetCache
+from .resilience import ResilientCaller, RetryPolicy
+
+
+class AsyncDataSFAPIClient:
+    """asyncio client for DataSF APIs with the same get_* surface as DataSFAPIClient.
+
+    All requests share one aiohttp connection pool and a semaphore bounds how
+    many are in flight at once. Parsing, caching, retries, circuit breakers
+    and mock fallbacks are delegated to a DataSFAPIClient so both clients
+    return identical records and share breaker state and metrics.
+    Use it as an async context manager, or call close() when done.
+    """
+
+    def __init__(self, max_concurrency: int = 8, timeout: float = 10, cache: Optional[DatasetCache] = None,
+                 use_cache: bool = True, base_url: Optional[str] = None, resilience: Optional[ResilientCaller] = None,
+                 allow_mock: bool = False):
+        if resilience is None:
+            resilience = ResilientCaller(RetryPolicy(retry_on=(OSError, TimeoutError, aiohttp.ClientConnectionError,
+                                                               aiohttp.ClientPayloadError)))
+        self.sync_client = DataSFAPIClient(cache=cache, use_cache=use_cache, base_url=base_url,
+                                           resilience=resilience, allow_mock=allow_mock)
+        self.base_url = self.sync_client.base_url
+        self.max_concurrency = max_concurrency
+        self.timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=3.05)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> 'AsyncDataSFAPIClient':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the shared connection pool."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Create the pooled session lazily, inside the running event loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def get_311_data(self, location: str = "San Francisco", limit: int = 100) -> List[Dict[str, Any]]:
+        """Fetch 311 service request data."""
+        params = {'$limit': limit, '$where': WHERE_TEMPLATES['311'].format(location=location)}
+        return await self._fetch('311', params, self.sync_client._process_311_data,
+                                 lambda: self.sync_client._get_mock_311_data(location, limit))
+
+    async def get_eviction_data(self, location: str = "San Francisco", limit: int = 100) -> List[Dict[str, Any]]:
+        """Fetch eviction data."""
+        params = {'$limit': limit, '$where': WHERE_TEMPLATES['evictions'].format(location=location)}
+        return await self._fetch('evictions', params, self.sync_client._process_eviction_data,
+                                 lambda: self.sync_client._get_mock_eviction_data(location, limit))
+
+    async def get_building_permits(self, location: str = "San Francisco", limit: int = 100) -> List[Dict[str, Any]]:
+        """Fetch building permit data."""
+        params = {'$limit': limit, '$where': WHERE_TEMPLATES['permits'].format(location=location)}
+        return await self._fetch('permits', params, self.sync_client._process_permit_data,
+                                 lambda: self.sync_client._get_mock_permit_data(location, limit))
+
+    async def get_budget_data(self, fiscal_year: int = 2024) -> List[Dict[str, Any]]:
+        """Fetch budget allocation data."""
+        params = {'$limit': 1000, '$where': WHERE_TEMPLATES['budget'].format(fiscal_year=fiscal_year)}
+        return await self._fetch('budget', params, self.sync_client._process_budget_data,
+                                 lambda: self.sync_client._get_mock_budget_data(fiscal_year))
+
+    async def fetch_all(self, location: str = "San Francisco", fiscal_year: int = 2024,
+                        limit: int = 100) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch 311, evictions, permits and budget concurrently."""
+        results = await asyncio.gather(
+            self.get_311_data(location, limit),
+            self.get_eviction_data(location, limit),
+            self.get_building_permits(location, limit),
+            self.get_budget_data(fiscal_year)
+        )
+        return dict(zip(['311', 'evictions', 'permits', 'budget'], results))
+
+    async def _fetch(self, dataset: str, params: Dict[str, Any],
+                     processor: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+                     mock_fallback: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """DataSFAPIClient._fetch's steps around a pooled aiohttp request; cache reads and writes run off the event loop."""
+        client = self.sync_client
+        cached = await asyncio.to_thread(client._from_cache, dataset, params, processor)
+        if cached is not None:
+            return cached
+
+        session = self._get_session()
+        url = f"{self.base_url}/{DATASET_IDS[dataset]}.json"
+
+        async def request() -> List[Dict[str, Any]]:
+            async with self._semaphore:
+                async with session.get(url, params={k: str(v) for k, v in params.items()}) as response:
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+
+        try:
+            data = await client.resilience.call_async(dataset, request)
+            return await asyncio.to_thread(client._store, dataset, params, data, processor)
+        except Exception as e:
+            return client._fallback(dataset, e, mock_fallback)
+
+
+def fetch_all_datasets(location: str = "San Francisco", fiscal_year: int = 2024, limit: int = 100,
+                       **client_kwargs) -> Dict[str, List[Dict[str, Any]]]:
+    """Blocking wrapper around AsyncDataSFAPIClient.fetch_all for synchronous callers."""
+    async def run() -> Dict[str, List[Dict[str, Any]]]:
+        async with AsyncDataSFAPIClient(**client_kwargs) as client:
+            return await client.fetch_all(location, fiscal_year, limit)
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run())
+
+    # Called from inside an event loop: run ours on a helper thread; .result() re-raises its errors here
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, run()).result()
@@ -0,0 +1,268 @@
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+
+try:
+    import fcntl
+except ImportError:  # Windows: index writes are not coordinated across processes
+    fcntl = None
+
+DEFAULT_CACHE_DIR = os.path.join('data_cache', 'responses')
+
+# Seconds a cached response stays fresh, per dataset
+DEFAULT_TTLS = {
+    '311': 5 * 60,
+    'evictions': 60 * 60,
+    'permits': 60 * 60,
+    'budget': 24 * 60 * 60
+}
+
+JSON_COLUMNS_KEY = b'json_columns'
+# Cache hits update last_access in memory and write the index at most this often
+INDEX_FLUSH_SECONDS = 5.0
+
+
+def normalize_query(params: Dict[str, Any]) -> Dict[str, str]:
+    """Canonical form of SODA params so equivalent queries share a cache entry."""
+    normalized = {}
+    for key, value in params.items():
+        text = re.sub(r'\s+', ' ', str(value)).strip()
+        normalized[key.strip().lower()] = text
+    return dict(sorted(normalized.items()))
+
+
+def records_to_table(records: List[Dict[str, Any]]) -> pa.Table:
+    """Build an Arrow table from records, JSON-encoding columns Arrow can't type.
+
+    SODA rows mix nested objects (``point``) and loosely typed values, so any
+    column that fails to convert is stored as JSON text and listed in the
+    schema metadata to be decoded on read.
+    """
+    columns = {}
+    json_columns = []
+    names = list(dict.fromkeys(key for record in records for key in record))
+    for name in names:
+        values = [record.get(name) for record in records]
+        try:
+            columns[name] = pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+            columns[name] = pa.array([None if v is None else json.dumps(v) for v in values], type=pa.string())
+            json_columns.append(name)
+
+    table = pa.table(columns) if columns else pa.table({})
+    return table.replace_schema_metadata({JSON_COLUMNS_KEY: json.dumps(json_columns).encode()})
+
+
+def table_to_records(table: pa.Table) -> List[Dict[str, Any]]:
+    """Inverse of records_to_table."""
+    metadata = table.schema.metadata or {}
+    json_columns = json.loads(metadata.get(JSON_COLUMNS_KEY, b'[]'))
+    records = table.to_pylist()
+    for name in json_columns:
+        for record in records:
+            if record.get(name) is not None:
+                record[name] = json.loads(record[name])
+    return records
+
+
+class DatasetCache:
+    """On-disk Arrow IPC cache of DataSF responses with TTLs and LRU eviction.
+
+    Entries are keyed by dataset id plus the normalized query. Each entry keeps
+    the raw payload and, separately, the output of the client's ``_process_*``
+    method, so a hit skips both the network and the parsing. Files are
+    uncompressed Arrow IPC and are read through a memory map, so reloading the
+    same snapshot does not copy it into the Python heap until records are
+    requested. When the cache grows past ``max_bytes`` the least recently used
+    entries are removed; access times from hits are written back to the index
+    in batches so that order survives restarts. Processes sharing a cache
+    directory (such as batch_runner's workers) merge their changes into
+    index.json under a lock on index.lock, so none overwrites another's
+    entries and eviction sees every file.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttls: Optional[Dict[str, float]] = None,
+                 max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index_path = os.path.join(cache_dir, 'index.json')
+        self._lock_path = os.path.join(cache_dir, 'index.lock')
+        self._index = self._load_index()
+        self._last_flush = time.monotonic()
+        self._dirty = False
+        # Hits since the last save would otherwise be lost when the process exits
+        atexit.register(self.flush)
+
+    def cache_key(self, dataset: str, params: Dict[str, Any]) -> str:
+        """Stable key for a dataset + query pair."""
+        payload = json.dumps({'dataset': dataset, 'query': normalize_query(params)}, sort_keys=True)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def lookup_table(self, dataset: str, params: Dict[str, Any], kind: str = 'processed') -> Tuple[Optional[pa.Table], bool]:
+        """Memory-map a cached table, fresh or expired, and say whether it has expired.
+
+        Each lookup counts once, as a hit, an expired entry or a miss.
+        """
+        key = self.cache_key(dataset, params)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None, False
+            try:
+                # Opened under the lock: once mapped, a concurrent eviction's unlink cannot pull the file away
+                source = pa.memory_map(self._path(key, kind), 'r')
+            except FileNotFoundError:
+                # Evicted by another process since this one last merged the index
+                self._index.pop(key, None)
+                self.stats['misses'] += 1
+                return None, False
+            expired = self.is_expired(entry)
+            entry['last_access'] = time.time()
+            self.stats['expired' if expired else 'hits'] += 1
+            self._dirty = True
+            if time.monotonic() - self._last_flush >= INDEX_FLUSH_SECONDS:
+                self._save_index()
+
+        with source:
+            return pa.ipc.open_file(source).read_all(), expired
+
+    def lookup(self, dataset: str, params: Dict[str, Any], kind: str = 'processed') -> Tuple[Optional[List[Dict[str, Any]]], bool]:
+        """lookup_table() as records."""
+        table, expired = self.lookup_table(dataset, params, kind)
+        return (None if table is None else table_to_records(table)), expired
+
+    def get_table(self, dataset: str, params: Dict[str, Any], kind: str = 'processed',
+                  allow_stale: bool = False) -> Optional[pa.Table]:
+        """Memory-map a cached table, or None on a miss or an expired entry."""
+        table, expired = self.lookup_table(dataset, params, kind)
+        return None if expired and not allow_stale else table
+
+    def get(self, dataset: str, params: Dict[str, Any], kind: str = 'processed',
+            allow_stale: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """Return cached records for a query, or None."""
+        table = self.get_table(dataset, params, kind, allow_stale)
+        return None if table is None else table_to_records(table)
+
+    def put(self, dataset: str, params: Dict[str, Any], raw: List[Dict[str, Any]],
+            processed: Optional[List[Dict[str, Any]]] = None):
+        """Store a raw payload and its processed form, then enforce the size cap."""
+        key = self.cache_key(dataset, params)
+        size = self._write(self._path(key, 'raw'), records_to_table(raw))
+        if processed is not None:
+            size += self._write(self._path(key, 'processed'), records_to_table(processed))
+
+        now = time.time()
+        with self._lock:
+            self._save_index({key: {
+                'dataset': dataset,
+                'query': normalize_query(params),
+                'created_at': now,
+                'last_access': now,
+                'bytes': size
+            }})
+
+    def flush(self):
+        """Write access times recorded since the last index save."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def is_expired(self, entry: Dict[str, Any]) -> bool:
+        """Whether an index entry is older than its dataset's TTL."""
+        ttl = self.ttls.get(entry['dataset'], 60 * 60)
+        return time.time() - entry['created_at'] > ttl
+
+    def total_bytes(self) -> int:
+        return sum(entry['bytes'] for entry in self._index.values())
+
+    def clear(self):
+        """Remove every cached entry, including files no index lists any more."""
+        with self._lock, self._index_lock():
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.arrow'):
+                    os.remove(os.path.join(self.cache_dir, name))
+            self._index = {}
+            self._write_index()
+
+    def _evict_over_cap(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        total = self.total_bytes()
+        for key in sorted(self._index, key=lambda k: self._index[k]['last_access']):
+            if total <= self.max_bytes:
+                break
+            total -= self._index[key]['bytes']
+            self._remove(key)
+            self.stats['evictions'] += 1
+
+    def _remove(self, key: str):
+        for kind in ('raw', 'processed'):
+            try:
+                os.remove(self._path(key, kind))
+            except FileNotFoundError:
+                pass
+        self._index.pop(key, None)
+
+    def _write(self, path: str, table: pa.Table) -> int:
+        """Write a table as an uncompressed Arrow IPC file and return its size."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        return os.path.getsize(path)
+
+    def _path(self, key: str, kind: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{kind}.arrow")
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._index_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @contextmanager
+    def _index_lock(self) -> Iterator[None]:
+        """Hold the cross-process lock on index.lock while the index is read, merged and replaced."""
+        with open(self._lock_path, 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _save_index(self, added: Optional[Dict[str, Dict[str, Any]]] = None):
+        """Merge this process's view into the on-disk index, enforce the size cap and write it back.
+
+        The on-disk index is the base, so entries other processes added or
+        evicted since the last save are kept or stay gone; this process
+        contributes its access times and the ``added`` entries.
+        """
+        with self._index_lock():
+            merged = self._load_index()
+            for key, entry in merged.items():
+                if key in self._index:
+                    entry['last_access'] = max(entry['last_access'], self._index[key]['last_access'])
+            merged.update(added or {})
+            self._index = merged
+            self._evict_over_cap()
+            self._write_index()
+
+    def _write_index(self):
+        tmp_path = f"{self._index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path)
+        self._last_flush = time.monotonic()
+        self._dirty = False
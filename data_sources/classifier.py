@@ -0,0 +1,133 @@
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Keyword maps for DataSF rows.
+# Order matters: the first keyword found in the request type wins.
+SEVERITY_KEYWORDS = {
+    'graffiti': 0.8,
+    'street_light': 0.6,
+    'pothole': 0.7,
+    'trash': 0.5,
+    'noise': 0.4
+}
+DEFAULT_SEVERITY = 0.5
+
+CATEGORY_KEYWORDS: List[Tuple[str, Sequence[str]]] = [
+    ('gross', ['graffiti', 'trash', 'litter']),
+    ('safety', ['light', 'pothole', 'glass']),
+    ('accessibility', ['sidewalk', 'ramp'])
+]
+DEFAULT_CATEGORY = 'other'
+
+EVICTION_RISK_KEYWORDS = {
+    'non_payment': 0.8,
+    'lease_violation': 0.6,
+    'owner_move_in': 0.9,
+    'demolition': 0.7
+}
+DEFAULT_EVICTION_RISK = 0.5
+
+
+class KeywordClassifier:
+    """Maps text to a label by the highest-priority keyword it contains.
+
+    All keywords are compiled into one regex. Each keyword sits inside a
+    lookahead, so a single scan reports a match at every position, and
+    alternatives are ordered by priority, so the lowest index found over the
+    scan is exactly the first keyword (in map order) contained in the text.
+    That preserves the old "first key in the map wins" behaviour at the cost
+    of one regex pass instead of one substring scan per keyword.
+
+    Results are memoized per input string. Request-type vocabularies are
+    small, so after warm-up classification is a dictionary lookup.
+    """
+
+    def __init__(self, keywords: Sequence[Tuple[str, Any]], default: Any, separators_as_underscore: bool = False,
+                 max_cache: int = 100000):
+        self.keywords = [keyword.lower() for keyword, _ in keywords]
+        self.labels = [label for _, label in keywords]
+        self.default = default
+        self.separators_as_underscore = separators_as_underscore
+        self.max_cache = max_cache
+        alternation = '|'.join(re.escape(keyword) for keyword in self.keywords)
+        self._pattern = re.compile(f"(?=({alternation}))") if self.keywords else None
+        self._index = {keyword: i for i, keyword in reversed(list(enumerate(self.keywords)))}
+        self._cache: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_map(cls, keyword_map: Dict[str, Any], default: Any, **kwargs) -> 'KeywordClassifier':
+        """Build from an ordered keyword -> label map."""
+        return cls(list(keyword_map.items()), default, **kwargs)
+
+    @classmethod
+    def from_groups(cls, groups: Iterable[Tuple[Any, Sequence[str]]], default: Any, **kwargs) -> 'KeywordClassifier':
+        """Build from ordered (label, [keywords]) groups; earlier groups win."""
+        return cls([(keyword, label) for label, words in groups for keyword in words], default, **kwargs)
+
+    def classify(self, text: Optional[str]) -> Any:
+        """Label for one string, served from the memo when seen before."""
+        text = text or ''
+        label = self._cache.get(text, self._cache)
+        if label is not self._cache:
+            return label
+
+        label = self._match(text)
+        with self._lock:
+            if len(self._cache) >= self.max_cache:
+                self._cache.clear()
+            self._cache[text] = label
+        return label
+
+    def classify_many(self, texts: Iterable[Optional[str]]) -> List[Any]:
+        """Labels for a sequence of strings."""
+        return [self.classify(text) for text in texts]
+
+    def classify_array(self, texts: Sequence[Optional[str]], dtype: Any = object) -> np.ndarray:
+        """Labels as an array, classifying each distinct string only once."""
+        uniques, inverse = np.unique(np.asarray([text or '' for text in texts], dtype=object), return_inverse=True)
+        labels = np.array([self.classify(text) for text in uniques], dtype=dtype)
+        return labels[inverse] if len(uniques) else np.array([], dtype=dtype)
+
+    def cache_info(self) -> Dict[str, int]:
+        return {'entries': len(self._cache), 'max_entries': self.max_cache}
+
+    def _match(self, text: str) -> Any:
+        """Uncached first-keyword-wins lookup."""
+        if self._pattern is None:
+            return self.default
+        text = text.lower()
+        if self.separators_as_underscore:
+            text = re.sub(r'[\s\-]+', '_', text)
+        best = None
+        for match in self._pattern.finditer(text):
+            index = self._index[match.group(1)]
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return self.default if best is None else self.labels[best]
+
+
+# Shared classifiers for DataSF rows
+SEVERITY_CLASSIFIER = KeywordClassifier.from_map(SEVERITY_KEYWORDS, DEFAULT_SEVERITY)
+CATEGORY_CLASSIFIER = KeywordClassifier.from_groups(CATEGORY_KEYWORDS, DEFAULT_CATEGORY)
+EVICTION_RISK_CLASSIFIER = KeywordClassifier.from_map(EVICTION_RISK_KEYWORDS, DEFAULT_EVICTION_RISK)
+
+_request_type_cache: Dict[str, Tuple[str, float]] = {}
+
+
+def classify_request_type(request_type: Optional[str]) -> Tuple[str, float]:
+    """(category, severity) for a 311 service_request_type, memoized."""
+    request_type = request_type or ''
+    result = _request_type_cache.get(request_type)
+    if result is None:
+        result = (CATEGORY_CLASSIFIER.classify(request_type), SEVERITY_CLASSIFIER.classify(request_type))
+        if len(_request_type_cache) >= SEVERITY_CLASSIFIER.max_cache:
+            _request_type_cache.clear()
+        _request_type_cache[request_type] = result
+    return result
@@ -0,0 +1,176 @@
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .cache import records_to_table
+from .classifier import CATEGORY_CLASSIFIER, SEVERITY_CLASSIFIER, EVICTION_RISK_CLASSIFIER, KeywordClassifier
+
+
+RawRows = Union[List[Dict[str, Any]], pa.Table]
+
+# SODA location columns, in the order they are tried
+POINT_FIELDS = ('point', 'shape', 'location', 'client_location')
+
+
+def _raw_table(data: RawRows) -> pa.Table:
+    """Raw SODA rows as an Arrow table, JSON-encoding any column Arrow can't type."""
+    if isinstance(data, pa.Table):
+        return data
+    try:
+        return pa.Table.from_pylist(data)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return records_to_table(data)
+
+
+def _column(raw: pa.Table, name: str, default: Any) -> pa.ChunkedArray:
+    """Raw SODA column, or a constant column when the field never appears."""
+    if name not in raw.column_names:
+        return pa.chunked_array([pa.array([default] * raw.num_rows)])
+    column = raw.column(name)
+    # SODA omits null fields, so a gap means the same as a missing key
+    return column if default is None else pc.fill_null(column, default)
+
+
+def _as_string(column: pa.ChunkedArray) -> pd.Series:
+    """Arrow-backed pandas string column (no per-row Python objects)."""
+    if not pa.types.is_string(column.type):
+        column = pc.cast(column, pa.string())
+    return column.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+
+
+def _as_category(column: pa.ChunkedArray) -> pd.Series:
+    """Dictionary-encoded column as a pandas Categorical."""
+    if not pa.types.is_string(column.type):
+        column = pc.cast(column, pa.string())
+    return pc.dictionary_encode(column).to_pandas()
+
+
+def _as_float(column: pa.ChunkedArray, default: float) -> np.ndarray:
+    """Numeric column parsed by Arrow, with unparseable values set to ``default``."""
+    try:
+        values = pc.cast(column, pa.float64())
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        # Mixed-type columns arrive JSON-encoded, so strip quotes before parsing
+        text = column.to_pandas().astype('string').str.strip('"')
+        values = pa.chunked_array([pa.array(pd.to_numeric(text, errors='coerce'), type=pa.float64())])
+    return pc.fill_null(values, default).to_numpy()
+
+
+def _as_datetime(column: pa.ChunkedArray) -> pd.Series:
+    """ISO-8601 timestamps parsed by Arrow, with unparseable values as NaT."""
+    try:
+        return pc.cast(column, pa.timestamp('ms')).to_pandas()
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return pd.to_datetime(column.to_pandas(), errors='coerce')
+
+
+def _coordinates(raw: pa.Table) -> Tuple[np.ndarray, np.ndarray]:
+    """Latitude and longitude from a SODA point column, or from plain lat/long columns.
+
+    Newer datasets carry GeoJSON (``{"type": "Point", "coordinates": [lon, lat]}``)
+    and older ones a location object with latitude/longitude; rows without a
+    usable point are NaN.
+    """
+    for name in POINT_FIELDS:
+        if name not in raw.column_names or not pa.types.is_struct(raw.column(name).type):
+            continue
+        column = raw.column(name).combine_chunks()
+        parts = {column.type.field(i).name for i in range(column.type.num_fields)}
+        if 'coordinates' in parts:
+            coordinates = pc.struct_field(column, 'coordinates')
+            longitude, latitude = pc.list_element(coordinates, 0), pc.list_element(coordinates, 1)
+        elif {'latitude', 'longitude'} <= parts:
+            latitude, longitude = pc.struct_field(column, 'latitude'), pc.struct_field(column, 'longitude')
+        else:
+            continue
+        return (_as_float(pa.chunked_array([latitude]), np.nan), _as_float(pa.chunked_array([longitude]), np.nan))
+    for lat_name, lon_name in (('lat', 'long'), ('latitude', 'longitude')):
+        if lat_name in raw.column_names and lon_name in raw.column_names:
+            return _as_float(raw.column(lat_name), np.nan), _as_float(raw.column(lon_name), np.nan)
+    missing = np.full(raw.num_rows, np.nan)
+    return missing, missing.copy()
+
+
+def _classify_column(column: pa.ChunkedArray, classifier: KeywordClassifier) -> np.ndarray:
+    """Classify each row by running the shared classifier once per distinct value."""
+    encoded = pc.dictionary_encode(pc.cast(column, pa.string())).combine_chunks()
+    labels = np.array(classifier.classify_many(encoded.dictionary.to_pylist()), dtype=object)
+    if not len(labels):
+        return np.full(len(encoded), classifier.default, dtype=object)
+    return labels[pc.fill_null(encoded.indices, 0).to_numpy(zero_copy_only=False)]
+
+
+def _score_by_keywords(column: pa.ChunkedArray, classifier: KeywordClassifier) -> np.ndarray:
+    """Keyword-based score for each row as float64, the dtype RecordTable stores scores in."""
+    return _classify_column(column, classifier).astype(np.float64)
+
+
+def _categorize_by_keywords(column: pa.ChunkedArray) -> pd.Categorical:
+    """311 category for each row."""
+    labels = list(dict.fromkeys(CATEGORY_CLASSIFIER.labels + [CATEGORY_CLASSIFIER.default]))
+    return pd.Categorical(_classify_column(column, CATEGORY_CLASSIFIER), categories=labels)
+
+
+def frame_311_data(data: RawRows) -> pd.DataFrame:
+    """Columnar equivalent of DataSFAPIClient._process_311_data (also takes a raw Arrow table)."""
+    raw = _raw_table(data)
+    request_type = _column(raw, 'service_request_type', '')
+    latitude, longitude = _coordinates(raw)
+    return pd.DataFrame({
+        'id': _as_string(_column(raw, 'service_request_id', None)),
+        'type': _as_category(_column(raw, 'service_request_type', 'unknown')),
+        'location': _as_string(_column(raw, 'street_address', 'Unknown')),
+        'severity': _score_by_keywords(request_type, SEVERITY_CLASSIFIER),
+        'description': _as_string(_column(raw, 'service_request_details', '')),
+        'status': _as_category(_column(raw, 'status', 'open')),
+        'created_date': _as_datetime(_column(raw, 'requested_datetime', None)),
+        'category': _categorize_by_keywords(request_type),
+        'latitude': latitude,
+        'longitude': longitude
+    }, index=pd.RangeIndex(raw.num_rows))
+
+
+def frame_eviction_data(data: RawRows) -> pd.DataFrame:
+    """Columnar equivalent of DataSFAPIClient._process_eviction_data."""
+    raw = _raw_table(data)
+    latitude, longitude = _coordinates(raw)
+    return pd.DataFrame({
+        'id': _as_string(_column(raw, 'eviction_id', None)),
+        'address': _as_string(_column(raw, 'address', 'Unknown')),
+        'risk_score': _score_by_keywords(_column(raw, 'eviction_type', ''), EVICTION_RISK_CLASSIFIER),
+        'type': _as_category(_column(raw, 'eviction_type', 'unknown')),
+        'neighborhood': _as_category(_column(raw, 'neighborhood', 'Unknown')),
+        'date': _as_datetime(_column(raw, 'file_date', None)),
+        'reason': _as_category(_column(raw, 'eviction_reason', '')),
+        'latitude': latitude,
+        'longitude': longitude
+    }, index=pd.RangeIndex(raw.num_rows))
+
+
+def frame_permit_data(data: RawRows) -> pd.DataFrame:
+    """Columnar equivalent of DataSFAPIClient._process_permit_data."""
+    raw = _raw_table(data)
+    return pd.DataFrame({
+        'id': _as_string(_column(raw, 'permit_number', None)),
+        'address': _as_string(_column(raw, 'street_address', 'Unknown')),
+        'type': _as_category(_column(raw, 'permit_type', 'unknown')),
+        'value': _as_float(_column(raw, 'estimated_cost', None), 0.0),
+        'status': _as_category(_column(raw, 'status', 'unknown')),
+        'issued_date': _as_datetime(_column(raw, 'issued_date', None)),
+        'description': _as_string(_column(raw, 'description', ''))
+    }, index=pd.RangeIndex(raw.num_rows))
+
+
+def frame_budget_data(data: RawRows) -> pd.DataFrame:
+    """Columnar equivalent of DataSFAPIClient._process_budget_data."""
+    raw = _raw_table(data)
+    return pd.DataFrame({
+        'category': _as_category(_column(raw, 'department', 'Unknown')),
+        'amount': _as_float(_column(raw, 'amount', None), 0.0),
+        'year': _as_float(_column(raw, 'fiscal_year', None), 2024).astype(np.int16),
+        'source': _as_category(_column(raw, 'fund_source', 'general_fund')),
+        'description': _as_string(_column(raw, 'description', ''))
+    }, index=pd.RangeIndex(raw.num_rows))
@@ -0,0 +1,153 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# SoQL functions behind each time bucket; trunc keeps a timestamp, extract an integer
+TIME_BUCKETS = {
+    'year': 'date_trunc_y',
+    'month': 'date_trunc_ym',
+    'day': 'date_trunc_ymd',
+    'hour': 'date_extract_hh',
+    'weekday': 'date_extract_dow'
+}
+
+
+class SoQLQuery:
+    """Builder for SODA queries that aggregate on the server.
+
+    Chain select/aggregate/bucket calls, then hand the query to
+    DataSFAPIClient.aggregate() for a typed DataFrame. Plain fields and
+    time buckets selected next to an aggregate are grouped on automatically,
+    so ``SoQLQuery('311').select('analysis_neighborhood').count()`` is one
+    row per neighborhood.
+    """
+
+    def __init__(self, dataset: str):
+        self.dataset = dataset
+        self._select: List[Tuple[str, str]] = []
+        self._where: List[str] = []
+        self._group: List[str] = []
+        self._having: List[str] = []
+        self._order: List[str] = []
+        self._limit: Optional[int] = None
+        self._kinds: Dict[str, str] = {}
+
+    def select(self, *fields: str) -> 'SoQLQuery':
+        """Select plain columns (grouped on when aggregating)."""
+        for field in fields:
+            self._add(field, field, 'field')
+        return self
+
+    def where(self, condition: str) -> 'SoQLQuery':
+        """Add a SoQL filter; multiple filters are ANDed."""
+        self._where.append(condition)
+        return self
+
+    def count(self, alias: str = 'count') -> 'SoQLQuery':
+        return self._add('count(*)', alias, 'count')
+
+    def avg(self, field: str, alias: Optional[str] = None) -> 'SoQLQuery':
+        return self._add(f"avg({field})", alias or f"avg_{field}", 'number')
+
+    def sum(self, field: str, alias: Optional[str] = None) -> 'SoQLQuery':
+        return self._add(f"sum({field})", alias or f"sum_{field}", 'number')
+
+    def min(self, field: str, alias: Optional[str] = None) -> 'SoQLQuery':
+        return self._add(f"min({field})", alias or f"min_{field}", 'number')
+
+    def max(self, field: str, alias: Optional[str] = None) -> 'SoQLQuery':
+        return self._add(f"max({field})", alias or f"max_{field}", 'number')
+
+    def bucket(self, field: str, unit: str = 'month', alias: Optional[str] = None) -> 'SoQLQuery':
+        """Group a timestamp column by year, month, day, hour of day or weekday."""
+        if unit not in TIME_BUCKETS:
+            raise ValueError(f"Unknown time bucket {unit!r}; expected one of {sorted(TIME_BUCKETS)}")
+        kind = 'timestamp' if TIME_BUCKETS[unit].startswith('date_trunc') else 'integer'
+        return self._add(f"{TIME_BUCKETS[unit]}({field})", alias or unit, kind)
+
+    def group_by(self, *fields: str) -> 'SoQLQuery':
+        """Group on extra columns or expressions beyond the selected ones."""
+        self._group.extend(fields)
+        return self
+
+    def having(self, condition: str) -> 'SoQLQuery':
+        """Filter groups after aggregation, e.g. ``count > 1``."""
+        self._having.append(condition)
+        return self
+
+    def order_by(self, *terms: str) -> 'SoQLQuery':
+        self._order.extend(terms)
+        return self
+
+    def limit(self, n: int) -> 'SoQLQuery':
+        self._limit = n
+        return self
+
+    @property
+    def is_aggregate(self) -> bool:
+        return any(kind in ('count', 'number') for kind in self._kinds.values())
+
+    def params(self) -> Dict[str, Any]:
+        """SODA query parameters for this query."""
+        params: Dict[str, Any] = {}
+        if self._select:
+            params['$select'] = ', '.join(expr if expr == alias else f"{expr} AS {alias}" for expr, alias in self._select)
+        if self._where:
+            params['$where'] = ' AND '.join(f"({condition})" for condition in self._where)
+        group = list(self._group)
+        if self.is_aggregate:
+            group = [expr for expr, alias in self._select if self._kinds[alias] not in ('count', 'number')] + group
+        if group:
+            params['$group'] = ', '.join(dict.fromkeys(group))
+        if self._having:
+            params['$having'] = ' AND '.join(f"({condition})" for condition in self._having)
+        if self._order:
+            params['$order'] = ', '.join(self._order)
+        params['$limit'] = self._limit or 50000
+        return params
+
+    def to_frame(self, rows: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Type SODA's all-string result rows: counts as ints, aggregates as floats, buckets as dates."""
+        frame = pd.DataFrame(rows, columns=[alias for _, alias in self._select] or None)
+        for alias, kind in self._kinds.items():
+            if alias not in frame:
+                continue
+            if kind == 'count':
+                frame[alias] = pd.to_numeric(frame[alias], errors='coerce').fillna(0).astype('int64')
+            elif kind == 'number':
+                frame[alias] = pd.to_numeric(frame[alias], errors='coerce').astype('float64')
+            elif kind == 'timestamp':
+                frame[alias] = pd.to_datetime(frame[alias], errors='coerce')
+            elif kind == 'integer':
+                frame[alias] = pd.to_numeric(frame[alias], errors='coerce').astype('Int64')
+        return frame
+
+    def _add(self, expr: str, alias: str, kind: str) -> 'SoQLQuery':
+        self._select.append((expr, alias))
+        self._kinds[alias] = kind
+        return self
+
+    def __repr__(self) -> str:
+        return f"SoQLQuery({self.dataset!r}, {self.params()!r})"
+
+
+def issue_location_stats(location: Optional[str] = None) -> SoQLQuery:
+    """311 request counts per street address and request type (StreetPrecog location clusters)."""
+    query = SoQLQuery('311').select('street_address', 'service_request_type').count()
+    if location:
+        query.where(f"analysis_neighborhood = '{location}'")
+    return query.order_by('count DESC')
+
+
+def budget_category_stats(fiscal_year: int = 2024) -> SoQLQuery:
+    """Average, total and count of budget lines per department (BudgetProphet funding trends)."""
+    return (SoQLQuery('budget').select('department').avg('amount').sum('amount').count()
+            .where(f"fiscal_year = {fiscal_year}"))
+
+
+def issue_time_stats(location: Optional[str] = None) -> SoQLQuery:
+    """311 request counts by weekday and hour of day."""
+    query = SoQLQuery('311').bucket('requested_datetime', 'weekday').bucket('requested_datetime', 'hour').count()
+    if location:
+        query.where(f"analysis_neighborhood = '{location}'")
+    return query
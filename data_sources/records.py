@@ -0,0 +1,222 @@
+from dataclasses import MISSING, dataclass, fields
+from typing import Any, ClassVar, Dict, Iterable, Iterator, List, Tuple, Type, Union
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(slots=True)
+class Issue:
+    """One 311 service request."""
+    CATEGORICAL: ClassVar[Tuple[str, ...]] = ('type', 'location', 'status', 'category')
+
+    id: Any
+    type: str
+    location: str
+    severity: float = 0.0
+    description: str = ''
+    status: str = 'open'
+    created_date: Any = None
+    category: str = ''
+    latitude: float = float('nan')
+    longitude: float = float('nan')
+
+
+@dataclass(slots=True)
+class Eviction:
+    """One eviction notice."""
+    CATEGORICAL: ClassVar[Tuple[str, ...]] = ('reason', 'type', 'neighborhood')
+    # frame_eviction_data names the keyword score risk_score
+    RENAMED: ClassVar[Dict[str, str]] = {'risk_score': 'severity'}
+
+    id: Any
+    address: str
+    reason: str = ''
+    severity: float = 0.0
+    date: Any = None
+    type: str = ''
+    neighborhood: str = ''
+    latitude: float = float('nan')
+    longitude: float = float('nan')
+
+
+@dataclass(slots=True)
+class Permit:
+    """One building permit."""
+    CATEGORICAL: ClassVar[Tuple[str, ...]] = ('type', 'status')
+
+    id: Any
+    address: str
+    type: str
+    status: str = 'unknown'
+    value: float = 0.0
+    issued_date: Any = None
+    description: str = ''
+
+
+@dataclass(slots=True)
+class BudgetLine:
+    """One budget allocation."""
+    CATEGORICAL: ClassVar[Tuple[str, ...]] = ('category', 'location', 'priority', 'source')
+
+    id: Any = None
+    category: str = 'Unknown'
+    amount: float = 0.0
+    location: str = ''
+    priority: str = ''
+    year: int = 2024
+    source: str = 'general_fund'
+    description: str = ''
+
+
+@dataclass(slots=True)
+class Parcel:
+    """One assessor parcel (block/lot) and its zoning."""
+    CATEGORICAL: ClassVar[Tuple[str, ...]] = ('zoning_district',)
+
+    id: Any
+    address: str
+    zoning_district: str = ''
+    latitude: float = float('nan')
+    longitude: float = float('nan')
+
+
+# Record type for each DataSF dataset, matching the frame_* column layouts
+RECORD_TYPES = {
+    '311': Issue,
+    'evictions': Eviction,
+    'permits': Permit,
+    'budget': BudgetLine
+}
+
+Record = Union[Issue, Eviction, Permit, BudgetLine, Parcel]
+
+
+class RecordTable:
+    """Column store for many records of one type.
+
+    Fields in the record type's CATEGORICAL are dictionary-encoded, numbers
+    are NumPy arrays and the remaining text is Arrow-backed, so a row costs a
+    few bytes per field instead of a dict. Filters are vectorized masks over
+    the category codes; iterating yields slotted records, and to_dicts() is
+    only needed where rows leave the process.
+    """
+
+    def __init__(self, record_type: Type[Record], frame: pd.DataFrame):
+        self.record_type = record_type
+        self.frame = frame
+
+    @classmethod
+    def from_records(cls, record_type: Type[Record], rows: Iterable[Union[Dict[str, Any], Record]]) -> 'RecordTable':
+        """Encode dicts or record instances; missing fields take the record's defaults."""
+        names = [field.name for field in fields(record_type)]
+        columns: Dict[str, List[Any]] = {name: [] for name in names}
+        for row in rows:
+            get = row.get if isinstance(row, dict) else lambda name, default: getattr(row, name, default)
+            for field in fields(record_type):
+                columns[field.name].append(get(field.name, _default(field)))
+        return cls(record_type, _encode(record_type, columns, len(columns[names[0]])))
+
+    @classmethod
+    def from_frame(cls, record_type: Type[Record], frame: pd.DataFrame) -> 'RecordTable':
+        """Adopt a frame_* DataFrame without going through per-row dicts."""
+        frame = frame.rename(columns=getattr(record_type, 'RENAMED', {}))
+        columns = {}
+        for field in fields(record_type):
+            columns[field.name] = frame[field.name] if field.name in frame else [_default(field)] * len(frame)
+        return cls(record_type, _encode(record_type, columns, len(frame)))
+
+    @classmethod
+    def coerce(cls, record_type: Type[Record], data: Union['RecordTable', pd.DataFrame, Iterable]) -> 'RecordTable':
+        """Table for whatever an earlier phase handed over (table, frame or list of dicts)."""
+        if isinstance(data, cls):
+            return data
+        if isinstance(data, pd.DataFrame):
+            return cls.from_frame(record_type, data)
+        return cls.from_records(record_type, data)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __iter__(self) -> Iterator[Record]:
+        record_type = self.record_type
+        for row in self.frame.itertuples(index=False, name=None):
+            yield record_type(*row)
+
+    def __getitem__(self, field: str) -> pd.Series:
+        return self.frame[field]
+
+    def __repr__(self) -> str:
+        return f"RecordTable({self.record_type.__name__}, {len(self)} rows)"
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.frame.memory_usage(deep=True, index=False).sum())
+
+    def mask(self, **conditions: Any) -> np.ndarray:
+        """Rows where each field equals the value, or is one of them for a list, tuple or set."""
+        keep = np.ones(len(self), dtype=bool)
+        for field, value in conditions.items():
+            values = list(value) if isinstance(value, (list, tuple, set, frozenset)) else [value]
+            column = self.frame[field]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                # Compare integer codes instead of strings
+                categories = column.cat.categories
+                codes = [categories.get_loc(v) for v in values if v in categories]
+                keep &= np.isin(column.cat.codes.to_numpy(), codes)
+            else:
+                keep &= column.isin(values).to_numpy()
+        return keep
+
+    def filter(self, mask: np.ndarray) -> 'RecordTable':
+        return RecordTable(self.record_type, self.frame[np.asarray(mask, dtype=bool)].reset_index(drop=True))
+
+    def take(self, rows: Any) -> 'RecordTable':
+        """Rows at the given positions, in that order (e.g. a SpatialIndex query result)."""
+        return RecordTable(self.record_type, self.frame.iloc[np.asarray(rows, dtype=np.int64)].reset_index(drop=True))
+
+    def where(self, **conditions: Any) -> 'RecordTable':
+        """Rows matching mask(**conditions)."""
+        return self.filter(self.mask(**conditions))
+
+    def with_column(self, field: str, values: Any) -> 'RecordTable':
+        """Copy with one field replaced, re-encoded like the rest of its kind."""
+        columns = {name: self.frame[name] for name in self.frame.columns}
+        columns[field] = values
+        return RecordTable(self.record_type, _encode(self.record_type, columns, len(self)))
+
+    def append(self, other: 'RecordTable') -> 'RecordTable':
+        """Rows of this table followed by another's, re-encoded so categories cover both."""
+        return RecordTable.from_frame(self.record_type, pd.concat([self.frame, other.frame], ignore_index=True))
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        names = list(self.frame.columns)
+        return [dict(zip(names, row)) for row in self.frame.itertuples(index=False, name=None)]
+
+
+def _default(field) -> Any:
+    return None if field.default is MISSING else field.default
+
+
+def _encode(record_type: Type[Record], columns: Dict[str, Any], length: int) -> pd.DataFrame:
+    """DataFrame with each field in its compact dtype."""
+    encoded = {}
+    for field in fields(record_type):
+        values = columns[field.name]
+        if field.name in record_type.CATEGORICAL:
+            encoded[field.name] = pd.Categorical(values)
+        elif field.type in (float, int):
+            numbers = pd.to_numeric(pd.Series(values), errors='coerce').fillna(field.default)
+            encoded[field.name] = numbers.to_numpy(np.float64 if field.type is float else np.int64)
+        else:
+            encoded[field.name] = _compact_text(values)
+    return pd.DataFrame(encoded, index=pd.RangeIndex(length))
+
+
+def _compact_text(values: Any) -> Any:
+    """Arrow-backed strings when the column is all text, otherwise the values as they are."""
+    if isinstance(values, pd.Series) and values.dtype != object:
+        return values.reset_index(drop=True)
+    if pd.api.types.infer_dtype(values, skipna=False) == 'string':
+        return pd.array(list(values), dtype=pd.StringDtype('pyarrow'))
+    return pd.array(list(values), dtype=object)
@@ -0,0 +1,227 @@
+import asyncio
+import random
+import threading
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# HTTP statuses worth retrying: throttling and transient server errors
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class DataSourceUnavailable(Exception):
+    """Raised when a dataset can't be fetched and there is nothing cached to serve."""
+
+
+class CircuitOpenError(DataSourceUnavailable):
+    """Raised without calling the endpoint while its circuit breaker is open."""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit open for {endpoint}; retry in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class BreakerState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-endpoint breaker: opens after consecutive failures, probes after a cool-down.
+
+    While open every call fails fast. Once ``reset_timeout`` has passed a
+    single probe is let through (half-open); its success closes the breaker
+    and its failure re-opens it for another cool-down.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> Tuple[bool, float]:
+        """(whether a call may proceed, seconds until the next probe if not)."""
+        with self._lock:
+            if self.state == BreakerState.CLOSED:
+                return True, 0.0
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if self.state == BreakerState.OPEN and remaining <= 0:
+                self.state = BreakerState.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == BreakerState.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True, 0.0
+            return False, max(remaining, 0.0)
+
+    def record_success(self):
+        with self._lock:
+            self.state = BreakerState.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == BreakerState.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != BreakerState.OPEN:
+                    self.times_opened += 1
+                self.state = BreakerState.OPEN
+                self.opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by attempts and a total deadline."""
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.25, max_delay: float = 8.0,
+                 deadline: float = 30.0, retry_on: Tuple[type, ...] = (OSError, TimeoutError),
+                 seed: Optional[int] = None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_on = retry_on
+        self._random = random.Random(seed)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before retry number ``attempt`` (1-based), honoring Retry-After."""
+        delay = self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        return max(delay, min(retry_after, self.max_delay)) if retry_after else delay
+
+    def classify(self, exc: BaseException) -> Tuple[bool, Optional[float]]:
+        """(whether the failure is transient, Retry-After seconds if the server sent one)."""
+        response = getattr(exc, 'response', None)
+        status = getattr(exc, 'status', None) or getattr(response, 'status_code', None)
+        headers = getattr(exc, 'headers', None) or getattr(response, 'headers', None) or {}
+        if status is not None:
+            if status not in RETRYABLE_STATUSES:
+                return False, None
+            try:
+                return True, float(headers.get('Retry-After'))
+            except (TypeError, ValueError):
+                return True, None
+        return isinstance(exc, self.retry_on), None
+
+
+class ResilienceMetrics:
+    """Thread-safe per-endpoint counters."""
+
+    COUNTERS = ('calls', 'successes', 'failures', 'retries', 'rejected', 'stale_served',
+                'revalidations', 'mock_served')
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, counter: str, amount: int = 1):
+        with self._lock:
+            counts = self._counts.setdefault(endpoint, dict.fromkeys(self.COUNTERS, 0))
+            counts[counter] += amount
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {endpoint: dict(counts) for endpoint, counts in self._counts.items()}
+
+
+class ResilientCaller:
+    """Runs endpoint calls with retries, backoff and a circuit breaker per endpoint.
+
+    Only transient failures (connection errors, timeouts, 429 and 5xx) are
+    retried or count against the breaker; a 4xx means the endpoint is up and
+    the request is wrong, so it is raised immediately.
+    """
+
+    def __init__(self, policy: Optional[RetryPolicy] = None, failure_threshold: int = 5,
+                 reset_timeout: float = 30.0, metrics: Optional[ResilienceMetrics] = None):
+        self.policy = policy or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.metrics = metrics or ResilienceMetrics()
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            if endpoint not in self.breakers:
+                self.breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self.breakers[endpoint]
+
+    def call(self, endpoint: str, fn: Callable[[], Any]) -> Any:
+        """Call ``fn`` until it succeeds, fails permanently, or retries run out."""
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            self._admit(endpoint)
+            try:
+                result = fn()
+            except Exception as e:
+                delay = self._on_failure(endpoint, e, attempt, start)
+                time.sleep(delay)
+                continue
+            self._on_success(endpoint)
+            return result
+
+    async def call_async(self, endpoint: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async version of call(); backoff sleeps don't block the event loop."""
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            self._admit(endpoint)
+            try:
+                result = await fn()
+            except Exception as e:
+                delay = self._on_failure(endpoint, e, attempt, start)
+                await asyncio.sleep(delay)
+                continue
+            self._on_success(endpoint)
+            return result
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Counters plus breaker state for every endpoint seen so far."""
+        stats = self.metrics.snapshot()
+        with self._lock:
+            breakers = dict(self.breakers)
+        for endpoint, breaker in breakers.items():
+            stats.setdefault(endpoint, dict.fromkeys(ResilienceMetrics.COUNTERS, 0)).update({
+                'breaker_state': breaker.state.value,
+                'consecutive_failures': breaker.failures,
+                'times_opened': breaker.times_opened
+            })
+        return stats
+
+    def _admit(self, endpoint: str):
+        allowed, retry_in = self.breaker(endpoint).allow()
+        if not allowed:
+            self.metrics.record(endpoint, 'rejected')
+            raise CircuitOpenError(endpoint, retry_in)
+        self.metrics.record(endpoint, 'calls')
+
+    def _on_success(self, endpoint: str):
+        self.breaker(endpoint).record_success()
+        self.metrics.record(endpoint, 'successes')
+
+    def _on_failure(self, endpoint: str, exc: Exception, attempt: int, start: float) -> float:
+        """Record a failed attempt and return the backoff delay, or re-raise if done."""
+        self.metrics.record(endpoint, 'failures')
+        transient, retry_after = self.policy.classify(exc)
+        if not transient:
+            self.breaker(endpoint).record_success()
+            raise exc
+        breaker = self.breaker(endpoint)
+        breaker.record_failure()
+
+        delay = self.policy.backoff(attempt, retry_after)
+        if (breaker.state == BreakerState.OPEN or attempt >= self.policy.max_attempts
+                or time.monotonic() - start + delay > self.policy.deadline):
+            raise exc
+        self.metrics.record(endpoint, 'retries')
+        return delay
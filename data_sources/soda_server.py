@@ -0,0 +1,629 @@
+"""
+Local SODA stand-in server for deterministic network performance tests
+Serves recorded or synthetic rows for the DataSF dataset ids over HTTP,
+honoring $select/$where/$order/$limit/$offset and $group/$having
+aggregation, with injectable latency, throttling and errors. Point DataSFAPIClient(base_url=...) at it.
+"""
+
+import argparse
+import bisect
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pyarrow.parquet as pq
+
+from .api_client import DATASET_IDS
+from .synthetic import SODA_DATASETS, SyntheticCityGenerator
+
+_TOKEN = re.compile(r"\s*(?:(?P<string>'(?:[^']|'')*')|(?P<number>-?\d+(?:\.\d+)?)|(?P<op>>=|<=|!=|<>|=|>|<)"
+                    r"|(?P<paren>[()])|(?P<word>[:A-Za-z_][A-Za-z0-9_]*))")
+
+
+class SoQLError(ValueError):
+    """Raised for $where/$order clauses the stand-in can't parse."""
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens, pos = [], 0
+    text = text.strip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None or match.end() == pos:
+            raise SoQLError(f"Unexpected input at {text[pos:pos + 20]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'string':
+            value = value[1:-1].replace("''", "'")
+        elif kind == 'word' and value.upper() in ('AND', 'OR', 'NOT', 'LIKE'):
+            kind, value = 'keyword', value.upper()
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+class _WhereParser:
+    """Recursive-descent parser for the SoQL subset the clients send.
+
+    Grammar: expr := term (OR term)*, term := factor (AND factor)*,
+    factor := NOT factor | '(' expr ')' | operand (op operand | LIKE string).
+    Produces tuples: ('or', a, b), ('and', a, b), ('not', a),
+    ('cmp', op, left, right) and ('like', left, pattern), where operands are
+    ('field', name) or ('value', literal).
+    """
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def parse(self) -> Tuple:
+        node = self._expr()
+        if self.pos != len(self.tokens):
+            raise SoQLError(f"Unexpected token {self.tokens[self.pos][1]!r}")
+        return node
+
+    def _peek(self) -> Tuple[Optional[str], Optional[str]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _take(self) -> Tuple[str, str]:
+        if self.pos >= len(self.tokens):
+            raise SoQLError("Unexpected end of $where")
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def _expr(self) -> Tuple:
+        node = self._term()
+        while self._peek() == ('keyword', 'OR'):
+            self._take()
+            node = ('or', node, self._term())
+        return node
+
+    def _term(self) -> Tuple:
+        node = self._factor()
+        while self._peek() == ('keyword', 'AND'):
+            self._take()
+            node = ('and', node, self._factor())
+        return node
+
+    def _factor(self) -> Tuple:
+        if self._peek() == ('keyword', 'NOT'):
+            self._take()
+            return ('not', self._factor())
+        if self._peek() == ('paren', '('):
+            self._take()
+            node = self._expr()
+            if self._take() != ('paren', ')'):
+                raise SoQLError("Missing ')'")
+            return node
+
+        left = self._operand()
+        kind, value = self._take()
+        if (kind, value) == ('keyword', 'LIKE'):
+            kind, pattern = self._take()
+            if kind != 'string':
+                raise SoQLError("LIKE needs a quoted pattern")
+            return ('like', left, pattern)
+        if kind != 'op':
+            raise SoQLError(f"Expected a comparison, got {value!r}")
+        return ('cmp', '!=' if value == '<>' else value, left, self._operand())
+
+    def _operand(self) -> Tuple:
+        kind, value = self._take()
+        if kind == 'word':
+            return ('field', value)
+        if kind == 'string':
+            return ('value', value)
+        if kind == 'number':
+            return ('value', float(value))
+        raise SoQLError(f"Expected a field or literal, got {value!r}")
+
+
+def parse_where(text: Optional[str]) -> Optional[Tuple]:
+    """Parse a $where clause, or None when there is no filter."""
+    return _WhereParser(text).parse() if text and text.strip() else None
+
+
+def _compare(left: Any, right: Any, op: str) -> bool:
+    if left is None or right is None:
+        return False
+    if isinstance(left, float) or isinstance(right, float):
+        try:
+            left, right = float(left), float(right)
+        except (TypeError, ValueError):
+            left, right = str(left), str(right)
+    if op == '=':
+        return left == right
+    if op == '!=':
+        return left != right
+    if op == '>':
+        return left > right
+    if op == '>=':
+        return left >= right
+    if op == '<':
+        return left < right
+    return left <= right
+
+
+def _like_regex(pattern: str) -> 're.Pattern':
+    parts = [re.escape(part) for part in pattern.split('%')]
+    return re.compile('^' + '.*'.join(part.replace('_', '.') for part in parts) + '$', re.DOTALL)
+
+
+def compile_where(node: Optional[Tuple]) -> Callable[[Dict[str, Any]], bool]:
+    """Turn a parsed $where into a row predicate."""
+    if node is None:
+        return lambda row: True
+    kind = node[0]
+    if kind in ('and', 'or'):
+        left, right = compile_where(node[1]), compile_where(node[2])
+        if kind == 'and':
+            return lambda row: left(row) and right(row)
+        return lambda row: left(row) or right(row)
+    if kind == 'not':
+        inner = compile_where(node[1])
+        return lambda row: not inner(row)
+    if kind == 'like':
+        regex, get = _like_regex(node[2]), _operand_getter(node[1])
+        return lambda row: (lambda value: value is not None and regex.match(str(value)) is not None)(get(row))
+    op, left, right = node[1], _operand_getter(node[2]), _operand_getter(node[3])
+    return lambda row: _compare(left(row), right(row), op)
+
+
+def _operand_getter(operand: Tuple) -> Callable[[Dict[str, Any]], Any]:
+    if operand[0] == 'field':
+        name = operand[1]
+        return lambda row: row.get(name)
+    value = operand[1]
+    return lambda row: value
+
+
+def lower_bound(node: Optional[Tuple], field: str) -> Optional[Any]:
+    """Smallest value of ``field`` the filter can accept, if the filter implies one.
+
+    Recognizes ``field > v``, ``field >= v`` and keyset conditions of the
+    form ``(field > v OR (field = v AND ...))`` anywhere in a top-level AND,
+    which lets deep keyset pages start with a binary search.
+    """
+    if node is None:
+        return None
+    if node[0] == 'and':
+        bounds = [b for b in (lower_bound(node[1], field), lower_bound(node[2], field)) if b is not None]
+        return max(bounds) if bounds else None
+    if node[0] == 'cmp' and node[1] in ('>', '>=', '=') and node[2] == ('field', field) and node[3][0] == 'value':
+        return node[3][1]
+    if node[0] == 'or':
+        left, right = lower_bound(node[1], field), lower_bound(node[2], field)
+        return min(left, right) if left is not None and right is not None else None
+    return None
+
+
+def parse_order(text: Optional[str]) -> List[Tuple[str, bool]]:
+    """Parse $order into (field, descending) pairs."""
+    order = []
+    for part in (text or '').split(','):
+        words = part.split()
+        if not words:
+            continue
+        if len(words) > 2 or (len(words) == 2 and words[1].upper() not in ('ASC', 'DESC')):
+            raise SoQLError(f"Unsupported $order term {part.strip()!r}")
+        order.append((words[0], len(words) == 2 and words[1].upper() == 'DESC'))
+    return order
+
+
+def _select_fields(text: Optional[str]) -> Optional[List[str]]:
+    """Fields named in $select; None keeps every regular field."""
+    if not text:
+        return None
+    fields = [field.strip() for field in text.split(',') if field.strip()]
+    return None if fields == ['*'] else fields
+
+
+_SELECT_TERM = re.compile(r"^(?:(?P<func>[a-z_]+)\((?P<arg>\*|[:A-Za-z0-9_]+)\)|(?P<field>[:A-Za-z0-9_]+))"
+                          r"(?:\s+AS\s+(?P<alias>[A-Za-z0-9_]+))?$", re.IGNORECASE)
+AGGREGATE_FUNCTIONS = {'count', 'avg', 'sum', 'min', 'max'}
+
+
+def parse_select(text: Optional[str]) -> List[Tuple[Optional[str], str, str]]:
+    """Parse $select into (function or None, argument, output name) terms."""
+    terms = []
+    for part in (text or '').split(','):
+        part = part.strip()
+        if not part or part in ('*', ':*'):
+            continue
+        match = _SELECT_TERM.match(part)
+        if match is None:
+            raise SoQLError(f"Unsupported $select term {part!r}")
+        func = match.group('func')
+        if func is None:
+            terms.append((None, match.group('field'), match.group('alias') or match.group('field')))
+            continue
+        func, arg = func.lower(), match.group('arg')
+        default_alias = func if arg == '*' else f"{func}_{arg}"
+        terms.append((func, arg, match.group('alias') or default_alias))
+    return terms
+
+
+def _scalar(func: Optional[str], value: Any) -> Any:
+    """Evaluate a non-aggregate select term (a field or a date function) on one value."""
+    if func is None or value is None:
+        return value
+    text = str(value)
+    if func == 'date_trunc_y':
+        return text[:4] + '-01-01T00:00:00.000'
+    if func == 'date_trunc_ym':
+        return text[:7] + '-01T00:00:00.000'
+    if func == 'date_trunc_ymd':
+        return text[:10] + 'T00:00:00.000'
+    if func == 'date_extract_hh':
+        return str(int(text[11:13])) if len(text) >= 13 else None
+    if func == 'date_extract_dow':
+        # SODA numbers weekdays from Sunday = 0
+        return str((datetime.strptime(text[:10], '%Y-%m-%d').weekday() + 1) % 7)
+    raise SoQLError(f"Unsupported function {func}()")
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _format_number(value: Optional[float]) -> Optional[str]:
+    if value is None:
+        return None
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _sort_value(value: Any) -> Tuple:
+    """Sort key that orders numbers numerically and puts nulls last."""
+    number = _number(value)
+    if value is None:
+        return (2, 0.0, '')
+    return (0, number, '') if number is not None else (1, 0.0, str(value))
+
+
+def aggregate_rows(rows: List[Dict[str, Any]], select: List[Tuple[Optional[str], str, str]],
+                   group: List[str]) -> List[Dict[str, Any]]:
+    """Group rows and evaluate count/avg/sum/min/max select terms, SODA style (string values)."""
+    by_name = {}
+    for func, arg, alias in select:
+        if func not in AGGREGATE_FUNCTIONS:
+            by_name[alias] = (func, arg)
+            by_name[arg if func is None else f"{func}({arg})"] = (func, arg)
+    keys = []
+    for term in group:
+        if term not in by_name:
+            match = _SELECT_TERM.match(term)
+            if match is None:
+                raise SoQLError(f"Unsupported $group term {term!r}")
+            by_name[term] = (match.group('func'), match.group('arg') or match.group('field'))
+        keys.append(by_name[term])
+
+    groups: Dict[Tuple, List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(_scalar(func, row.get(arg)) for func, arg in keys), []).append(row)
+
+    output = []
+    for key, members in groups.items():
+        out = {}
+        for func, arg, alias in select:
+            if func == 'count':
+                out[alias] = str(len(members) if arg == '*' else sum(row.get(arg) is not None for row in members))
+            elif func in AGGREGATE_FUNCTIONS:
+                values = [v for v in (_number(row.get(arg)) for row in members) if v is not None]
+                if not values:
+                    out[alias] = None
+                elif func == 'avg':
+                    out[alias] = _format_number(sum(values) / len(values))
+                elif func == 'sum':
+                    out[alias] = _format_number(sum(values))
+                else:
+                    out[alias] = _format_number(min(values) if func == 'min' else max(values))
+            else:
+                out[alias] = _scalar(func, members[0].get(arg))
+        output.append({k: v for k, v in out.items() if v is not None})
+    return output
+
+
+class FaultInjector:
+    """Seeded latency, throttling and error injection shared by all handler threads.
+
+    ``rate_limit`` is a requests-per-second token bucket; requests over it get
+    429 with Retry-After. ``throttle_rate`` and ``error_rate`` add random 429s
+    and ``error_status`` responses on top.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, error_status: int = 503,
+                 throttle_rate: float = 0.0, rate_limit: Optional[float] = None, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self._random = random.Random(seed)
+        self._tokens = rate_limit or 0.0
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+
+    def decide(self) -> Tuple[float, Optional[int]]:
+        """(delay in seconds, status to fail with or None) for the next request."""
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            if self.rate_limit:
+                now = time.monotonic()
+                self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled) * self.rate_limit)
+                self._refilled = now
+                if self._tokens < 1:
+                    return delay, 429
+                self._tokens -= 1
+            roll = self._random.random()
+            if roll < self.throttle_rate:
+                return delay, 429
+            if roll < self.throttle_rate + self.error_rate:
+                return delay, self.error_status
+            return delay, None
+
+
+class SODAStandInServer:
+    """Threaded HTTP server that answers /resource/<dataset id>.json like SODA.
+
+    ``datasets`` maps the client's dataset names ('311', 'evictions',
+    'permits', 'budget') to lists of raw rows whose values are strings, as
+    SODA returns them. System fields (:id, :updated_at) are only returned
+    when $select includes ':*', matching the real API. Sorted copies of each
+    dataset are cached per $order, so keyset pages are a binary search plus
+    a scan of one page.
+    """
+
+    def __init__(self, datasets: Dict[str, List[Dict[str, Any]]], host: str = '127.0.0.1', port: int = 0,
+                 faults: Optional[FaultInjector] = None, max_limit: int = 50000):
+        self.datasets = {DATASET_IDS[name]: rows for name, rows in datasets.items()}
+        self.faults = faults or FaultInjector()
+        self.max_limit = max_limit
+        self.stats = {'requests': 0, 'rows_served': 0, 'errors': 0, 'throttled': 0}
+        self._sorted: Dict[Tuple[str, Tuple], Tuple[List[Dict[str, Any]], List[Any]]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/resource"
+
+    def start(self) -> 'SODAStandInServer':
+        """Serve on a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'SODAStandInServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def query(self, dataset_id: str, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Run one SODA query against the in-memory rows."""
+        rows = self.datasets[dataset_id]
+        node = parse_where(params.get('$where'))
+        predicate = compile_where(node)
+        order = tuple(parse_order(params.get('$order')))
+        limit = min(int(params.get('$limit', 1000)), self.max_limit)
+        offset = int(params.get('$offset', 0))
+
+        select = parse_select(params.get('$select'))
+        group = [term.strip() for term in params.get('$group', '').split(',') if term.strip()]
+        if group or any(func in AGGREGATE_FUNCTIONS for func, _, _ in select):
+            return self._aggregate(rows, predicate, select, group, params.get('$having'), order, offset, limit)
+
+        start = 0
+        if order:
+            rows, keys = self._sorted_rows(dataset_id, order)
+            bound = lower_bound(node, order[0][0]) if not order[0][1] else None
+            # Values are strings, so only a string bound orders the same way they sort
+            if isinstance(bound, str):
+                start = bisect.bisect_left(keys, bound)
+
+        matched: List[Dict[str, Any]] = []
+        skipped = 0
+        for index in range(start, len(rows)):
+            row = rows[index]
+            if not predicate(row):
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            matched.append(row)
+            if len(matched) >= limit:
+                break
+        return self._project(matched, params.get('$select'))
+
+    def _aggregate(self, rows: List[Dict[str, Any]], predicate: Callable[[Dict[str, Any]], bool],
+                   select: List[Tuple[Optional[str], str, str]], group: List[str], having: Optional[str],
+                   order: Tuple[Tuple[str, bool], ...], offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Answer a $group/aggregate query: filter, group, apply $having, sort, then page."""
+        output = aggregate_rows([row for row in rows if predicate(row)], select, group)
+        having_predicate = compile_where(parse_where(having))
+        output = [row for row in output if having_predicate(row)]
+        for field, descending in reversed(order):
+            output.sort(key=lambda row: _sort_value(row.get(field)), reverse=descending)
+        return output[offset:offset + limit]
+
+    def _sorted_rows(self, dataset_id: str, order: Tuple[Tuple[str, bool], ...]):
+        """Rows sorted by $order (cached), plus the non-null first sort keys for bisecting."""
+        key = (dataset_id, order)
+        with self._lock:
+            cached = self._sorted.get(key)
+            if cached is None:
+                rows = list(self.datasets[dataset_id])
+                # Stable sorts from the last field to the first give a multi-key order
+                for field, descending in reversed(order):
+                    rows.sort(key=lambda row: (row.get(field) is None, row.get(field) or ''), reverse=descending)
+                # Nulls sort last and never pass a > or >= bound, so only the prefix is searched
+                keys = [row[order[0][0]] for row in rows if row.get(order[0][0]) is not None]
+                cached = (rows, keys)
+                self._sorted[key] = cached
+            return cached
+
+    def _project(self, rows: List[Dict[str, Any]], select: Optional[str]) -> List[Dict[str, Any]]:
+        fields = _select_fields(select)
+        if fields is None:
+            return [{k: v for k, v in row.items() if not k.startswith(':')} for row in rows]
+        keep_system = ':*' in fields
+        keep_all = '*' in fields
+        named = [field for field in fields if field not in (':*', '*')]
+        projected = []
+        for row in rows:
+            out = {k: v for k, v in row.items() if (keep_system if k.startswith(':') else keep_all)}
+            out.update({field: row[field] for field in named if field in row})
+            projected.append(out)
+        return projected
+
+    def _record(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._record('requests')
+                url = urlparse(self.path)
+                match = re.fullmatch(r'/resource/([a-z0-9]{4}-[a-z0-9]{4})\.json', url.path)
+                if match is None or match.group(1) not in server.datasets:
+                    self._send(404, {'error': True, 'message': f"Unknown resource {url.path}"})
+                    return
+
+                delay, status = server.faults.decide()
+                if delay:
+                    time.sleep(delay)
+                if status is not None:
+                    server._record('throttled' if status == 429 else 'errors')
+                    self._send(status, {'error': True, 'message': 'Injected failure'},
+                               {'Retry-After': '1'} if status == 429 else None)
+                    return
+
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                try:
+                    rows = server.query(match.group(1), params)
+                except (SoQLError, ValueError) as e:
+                    server._record('errors')
+                    self._send(400, {'error': True, 'message': str(e)})
+                    return
+                server._record('rows_served', len(rows))
+                self._send_rows(rows)
+
+            def _send_rows(self, rows: List[Dict[str, Any]], batch_size: int = 10000):
+                """Write a result array in slices, so large pulls arrive as a stream."""
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                self.wfile.write(b'[')
+                for start in range(0, len(rows), batch_size):
+                    body = json.dumps(rows[start:start + batch_size])[1:-1]
+                    self.wfile.write(((',' if start else '') + body).encode())
+                self.wfile.write(b']')
+
+            def _send(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def load_datasets(source: Optional[str] = None, rows: int = 10000, seed: int = 42,
+                  names: Optional[List[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Raw rows per dataset, from recorded files or the synthetic generator.
+
+    ``source`` may be a directory holding ``<name>.json``/``.parquet`` or
+    ``<dataset id>.json``/``.parquet`` files (e.g. saved SODA responses);
+    datasets without a file there are generated synthetically. ``names``
+    limits which datasets are loaded.
+    """
+    datasets = {}
+    generator = SyntheticCityGenerator(seed=seed)
+    for name, dataset_id in DATASET_IDS.items():
+        if names and name not in names:
+            continue
+        recorded = None
+        for stem in (name, dataset_id, SODA_DATASETS[name]):
+            for ext in ('.json', '.parquet'):
+                path = os.path.join(source, stem + ext) if source else None
+                if path and os.path.exists(path):
+                    recorded = path
+                    break
+            if recorded:
+                break
+
+        if recorded is None:
+            datasets[name] = generator.to_records(SODA_DATASETS[name], min(rows, 50000) if name == 'budget' else rows)
+        elif recorded.endswith('.json'):
+            with open(recorded) as f:
+                datasets[name] = json.load(f)
+        else:
+            datasets[name] = pq.read_table(recorded).to_pylist()
+    return datasets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve DataSF datasets locally for performance tests.")
+    parser.add_argument('--source', default=None, help="Directory of recorded .json/.parquet datasets")
+    parser.add_argument('--rows', type=int, default=10000, help="Synthetic rows per dataset")
+    parser.add_argument('--datasets', nargs='*', default=None, choices=list(DATASET_IDS), help="Datasets to serve")
+    parser.add_argument('--max-limit', type=int, default=50000, help="Largest $limit honored per request")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8085)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Extra random latency, up to this many seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of requests that fail")
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument('--rate-limit', type=float, default=None, help="Requests per second before 429s")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    faults = FaultInjector(args.latency, args.jitter, args.error_rate, args.error_status,
+                           args.throttle_rate, args.rate_limit, args.seed)
+    datasets = load_datasets(args.source, args.rows, args.seed, args.datasets)
+    server = SODAStandInServer(datasets, args.host, args.port, faults, args.max_limit)
+    print(f"🚀 SODA stand-in serving at {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
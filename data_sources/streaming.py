@@ -0,0 +1,118 @@
+import codecs
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import pyarrow as pa
+
+from .frames import _raw_table
+
+_DELIMITERS = ',] \t\n\r'
+# Whitespace and at most one comma between array elements
+_SEPARATOR = re.compile(r'[ \t\n\r]*,?[ \t\n\r]*')
+
+
+def iter_json_array(chunks: Iterable[bytes], encoding: str = 'utf-8') -> Iterator[Dict[str, Any]]:
+    """Yield the elements of a top-level JSON array as its bytes arrive.
+
+    Each element is parsed with ``json.JSONDecoder.raw_decode`` (the C
+    scanner) straight out of a rolling text buffer, so only the unparsed
+    tail of the body is held, never the whole payload or its full list.
+    """
+    raw_decode = json.JSONDecoder().raw_decode
+    skip = _SEPARATOR.match
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    buffer = ''
+    pos = 0
+    started = False
+    finished = False
+
+    for chunk in chunks:
+        buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = skip(buffer, 0).end()
+        size = len(buffer)
+        while pos < size:
+            char = buffer[pos]
+            if finished:
+                raise ValueError(f"Unexpected data after JSON array: {buffer[pos:pos + 20]!r}")
+            if not started:
+                if char != '[':
+                    raise ValueError(f"Expected a JSON array, got {buffer[pos:pos + 20]!r}")
+                started = True
+                pos = skip(buffer, pos + 1).end()
+                continue
+            if char == ']':
+                finished = True
+                pos = skip(buffer, pos + 1).end()
+                continue
+
+            try:
+                item, end = raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The element continues in the next chunk
+                break
+            if end == size or (buffer[end] not in _DELIMITERS and not isinstance(item, (dict, list, str))):
+                # Wait for the delimiter: a bare number may still be growing ("2." then "5")
+                break
+            pos = skip(buffer, end).end()
+            yield item
+
+    tail = buffer[pos:] + text_decoder.decode(b'', final=True)
+    if tail.strip() or (started and not finished):
+        raise ValueError("Truncated JSON array")
+
+
+def iter_batches(records: Iterable[Dict[str, Any]], batch_size: int = 50000) -> Iterator[List[Dict[str, Any]]]:
+    """Group an iterator of records into lists of at most batch_size."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def records_to_arrow(records: Iterable[Dict[str, Any]], batch_size: int = 50000) -> pa.Table:
+    """Build one Arrow table from streamed records, batch_size dicts at a time.
+
+    SODA omits null fields, so batches may disagree on columns; missing ones
+    are filled with nulls and conflicting types fall back to strings.
+    """
+    tables = [_batch_table(batch) for batch in iter_batches(records, batch_size)]
+    if not tables:
+        return pa.table({})
+    try:
+        return pa.concat_tables(tables, promote_options='permissive')
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.concat_tables([_strings_only(table) for table in tables], promote_options='permissive')
+
+
+def _batch_table(batch: List[Dict[str, Any]]) -> pa.Table:
+    """Arrow table for one batch; SODA values are strings, so skip type inference when they are."""
+    fields = dict.fromkeys(field for record in batch for field in record)
+    try:
+        return pa.table({field: pa.array([record.get(field) for record in batch], type=pa.string())
+                         for field in fields})
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Nested values such as location points
+        return _raw_table(batch)
+
+
+def _strings_only(table: pa.Table) -> pa.Table:
+    columns = [column if pa.types.is_string(column.type) else _to_string(column) for column in table.columns]
+    return pa.table(columns, names=table.column_names)
+
+
+def _to_string(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    try:
+        return column.cast(pa.string())
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return pa.chunked_array([pa.array([None if v is None else json.dumps(v) for v in column.to_pylist()],
+                                          type=pa.string())])
+
+
+def stream_table(chunks: Iterable[bytes], batch_size: int = 50000, encoding: Optional[str] = None) -> pa.Table:
+    """Decode a streamed SODA JSON body into an Arrow table in bounded memory."""
+    return records_to_arrow(iter_json_array(chunks, encoding or 'utf-8'), batch_size)
@@ -0,0 +1,137 @@
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional
+
+from .api_client import DataSFAPIClient
+
+# Natural key used to dedupe each dataset's rows
+SYNC_KEYS = {
+    '311': 'service_request_id',
+    'evictions': 'eviction_id',
+    'permits': 'permit_number'
+}
+
+DEFAULT_STORE_PATH = os.path.join('data_cache', 'datasf_sync.db')
+
+
+class LocalDatasetStore:
+    """SQLite store holding the latest version of every synced DataSF row."""
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS rows ("
+            " dataset TEXT NOT NULL, row_key TEXT NOT NULL, updated_at TEXT, payload TEXT NOT NULL,"
+            " PRIMARY KEY (dataset, row_key))"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks (dataset TEXT PRIMARY KEY, updated_at TEXT NOT NULL)"
+        )
+        self.conn.commit()
+
+    def get_watermark(self, dataset: str) -> Optional[str]:
+        """Return the highest :updated_at synced so far, or None before the first sync."""
+        row = self.conn.execute("SELECT updated_at FROM watermarks WHERE dataset = ?", (dataset,)).fetchone()
+        return row[0] if row else None
+
+    def upsert(self, dataset: str, rows: List[Dict[str, Any]], watermark: Optional[str] = None) -> int:
+        """Insert or replace rows by natural key and advance the watermark in one transaction."""
+        key_field = SYNC_KEYS[dataset]
+        records = [
+            (dataset, str(row.get(key_field, row.get(':id'))), row.get(':updated_at'), json.dumps(row))
+            for row in rows
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO rows (dataset, row_key, updated_at, payload) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(dataset, row_key) DO UPDATE SET"
+                " updated_at = excluded.updated_at, payload = excluded.payload",
+                records
+            )
+            if watermark is not None:
+                self.conn.execute(
+                    "INSERT INTO watermarks (dataset, updated_at) VALUES (?, ?)"
+                    " ON CONFLICT(dataset) DO UPDATE SET updated_at = max(updated_at, excluded.updated_at)",
+                    (dataset, watermark)
+                )
+        return len(records)
+
+    def iter_rows(self, dataset: str, batch_size: int = 10000) -> Iterator[List[Dict[str, Any]]]:
+        """Yield stored raw rows in batches, in key order."""
+        cursor = self.conn.execute("SELECT payload FROM rows WHERE dataset = ? ORDER BY row_key", (dataset,))
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                return
+            yield [json.loads(payload) for (payload,) in batch]
+
+    def count(self, dataset: str) -> int:
+        """Number of distinct rows stored for a dataset."""
+        return self.conn.execute("SELECT COUNT(*) FROM rows WHERE dataset = ?", (dataset,)).fetchone()[0]
+
+    def reset(self, dataset: str):
+        """Forget a dataset's rows and watermark so the next sync is a full pull."""
+        with self.conn:
+            self.conn.execute("DELETE FROM rows WHERE dataset = ?", (dataset,))
+            self.conn.execute("DELETE FROM watermarks WHERE dataset = ?", (dataset,))
+
+    def close(self):
+        self.conn.close()
+
+
+class IncrementalSync:
+    """Keeps a local copy of DataSF datasets current by pulling only changed rows.
+
+    Each dataset has a high-water mark on :updated_at. A sync asks SODA for
+    rows updated at or after the mark, pages through them ordered by
+    (:updated_at, :id) and upserts each page by the dataset's natural key, so
+    re-delivered rows are deduped rather than duplicated. The first sync of a
+    dataset is a full pull; later ones only cost the rows that changed.
+    """
+
+    def __init__(self, client: Optional[DataSFAPIClient] = None, store: Optional[LocalDatasetStore] = None):
+        self.client = client or DataSFAPIClient()
+        self.store = store or LocalDatasetStore()
+
+    def sync(self, dataset: str, page_size: Optional[int] = None) -> Dict[str, Any]:
+        """Pull rows changed since the dataset's watermark into the local store."""
+        watermark = self.store.get_watermark(dataset)
+        # >= rather than >: rows sharing the mark's timestamp may have landed after it
+        where = f":updated_at >= '{watermark}'" if watermark else "1 = 1"
+
+        pages = 0
+        rows_synced = 0
+        for rows in self.client.iter_raw_pages(dataset, where, page_size, order_fields=(':updated_at', ':id')):
+            page_mark = max((row[':updated_at'] for row in rows if row.get(':updated_at')), default=None)
+            rows_synced += self.store.upsert(dataset, rows, page_mark)
+            pages += 1
+
+        return {
+            'dataset': dataset,
+            'previous_watermark': watermark,
+            'watermark': self.store.get_watermark(dataset),
+            'pages': pages,
+            'rows_synced': rows_synced,
+            'rows_stored': self.store.count(dataset)
+        }
+
+    def sync_all(self, page_size: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Sync every dataset that has a natural key."""
+        return {dataset: self.sync(dataset, page_size) for dataset in SYNC_KEYS}
+
+    def load(self, dataset: str) -> List[Dict[str, Any]]:
+        """Return the stored rows in the client's standardized format."""
+        processors = {
+            '311': self.client._process_311_data,
+            'evictions': self.client._process_eviction_data,
+            'permits': self.client._process_permit_data
+        }
+        processed = []
+        for rows in self.store.iter_rows(dataset):
+            processed.extend(processors[dataset](rows))
+        return processed
@@ -0,0 +1,438 @@
+"""
+Synthetic city-scale DataSF data for load and benchmark testing
+Generates seeded, realistically distributed rows in the schemas the agents
+and the DataSF client consume, and writes them straight to Parquet
+"""
+
+import argparse
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .classifier import SEVERITY_CLASSIFIER, CATEGORY_CLASSIFIER
+
+# (name, latitude, longitude, relative volume, main streets, peak period)
+NEIGHBORHOODS = [
+    ('Tenderloin', 37.7847, -122.4141, 9.0, ['Eddy St', 'Ellis St', 'Turk St', 'Jones St'], 'morning'),
+    ('South of Market', 37.7785, -122.4056, 8.0, ['Folsom St', 'Howard St', '6th St', 'Mission St'], 'morning'),
+    ('Mission', 37.7599, -122.4148, 8.0, ['Mission St', 'Valencia St', '16th St', '24th St'], 'evening'),
+    ('Financial District', 37.7946, -122.3999, 5.0, ['Market St', 'Montgomery St', 'California St'], 'morning'),
+    ('Civic Center', 37.7793, -122.4193, 4.0, ['Market St', 'Van Ness Ave', 'Polk St'], 'morning'),
+    ('Bayview Hunters Point', 37.7298, -122.3877, 4.0, ['3rd St', 'Palou Ave', 'Evans Ave'], 'evening'),
+    ('Castro', 37.7609, -122.4350, 2.5, ['Castro St', 'Market St', '18th St'], 'evening'),
+    ('Haight Ashbury', 37.7692, -122.4481, 2.5, ['Haight St', 'Ashbury St', 'Stanyan St'], 'evening'),
+    ('Chinatown', 37.7941, -122.4078, 2.5, ['Grant Ave', 'Stockton St', 'Clay St'], 'morning'),
+    ('North Beach', 37.8061, -122.4103, 2.0, ['Columbus Ave', 'Broadway', 'Union St'], 'evening'),
+    ('Nob Hill', 37.7930, -122.4161, 2.0, ['California St', 'Hyde St', 'Sacramento St'], 'morning'),
+    ('Western Addition', 37.7817, -122.4330, 2.5, ['Fillmore St', 'Divisadero St', 'Geary Blvd'], 'evening'),
+    ('Outer Sunset', 37.7553, -122.4948, 2.0, ['Judah St', 'Irving St', 'Noriega St'], 'morning'),
+    ('Outer Richmond', 37.7777, -122.4942, 1.5, ['Geary Blvd', 'Clement St', 'Balboa St'], 'morning'),
+    ('Excelsior', 37.7244, -122.4272, 2.0, ['Mission St', 'Geneva Ave', 'Excelsior Ave'], 'evening'),
+    ('Potrero Hill', 37.7588, -122.4010, 1.5, ['18th St', 'Connecticut St', 'Potrero Ave'], 'evening'),
+    ('Marina', 37.8015, -122.4368, 1.5, ['Chestnut St', 'Lombard St', 'Marina Blvd'], 'evening'),
+    ('Visitacion Valley', 37.7128, -122.4049, 1.0, ['Leland Ave', 'Bayshore Blvd', 'Sunnydale Ave'], 'morning')
+]
+
+# (service_request_type, relative volume)
+REQUEST_TYPES = [
+    ('Street and Sidewalk Cleaning', 30.0), ('Graffiti Public', 10.0), ('Graffiti Private', 6.0),
+    ('Encampments', 8.0), ('Abandoned Vehicle', 6.0), ('Litter Receptacles', 5.0),
+    ('Streetlights', 4.0), ('Pothole or Street Defect', 4.0), ('Sidewalk or Curb', 3.0),
+    ('Noise Report', 3.0), ('Blocked Street or SideWalk', 3.0), ('Damaged Property', 2.0),
+    ('Broken Glass', 2.0), ('Curb Ramp Issue', 1.0), ('Tree Maintenance', 2.0), ('Sewer Issues', 2.0)
+]
+STATUSES = [('Closed', 0.7), ('Open', 0.2), ('In Progress', 0.1)]
+
+# (eviction_type, reason shown to agents, relative volume, base severity)
+EVICTION_TYPES = [
+    ('non_payment', 'Non-payment', 40.0, 0.8), ('lease_violation', 'Lease violation', 20.0, 0.6),
+    ('owner_move_in', 'Owner move-in', 15.0, 0.9), ('nuisance', 'Nuisance', 10.0, 0.5),
+    ('demolition', 'Demolition', 5.0, 0.7), ('capital_improvement', 'Capital improvement', 5.0, 0.6),
+    ('ellis_act_withdrawal', 'Ellis Act withdrawal', 5.0, 0.9)
+]
+PERMIT_TYPES = [('renovation', 60.0), ('new_construction', 15.0), ('demolition', 5.0), ('additions', 20.0)]
+PERMIT_STATUSES = [('approved', 0.6), ('pending', 0.3), ('expired', 0.1)]
+BUDGET_CATEGORIES = ['homeless_services', 'housing_development', 'street_maintenance', 'public_safety',
+                     'social_services', 'public_transport', 'infrastructure', 'public_health']
+CRISIS_TYPES = [
+    ('medical', 45.0, ['Overdose incident', 'Mental health crisis', 'Medical emergency']),
+    ('safety', 30.0, ['Fire emergency', 'Traffic accident', 'Violent incident']),
+    ('infrastructure', 15.0, ['Power outage', 'Water main break', 'Building collapse']),
+    ('environmental', 10.0, ['Flooding', 'Earthquake damage', 'Poor air quality'])
+]
+
+# Hour-of-day weights for neighborhoods that peak in the morning or evening
+HOUR_WEIGHTS = {
+    'morning': np.array([1, 1, 1, 1, 1, 2, 4, 8, 10, 9, 7, 6, 6, 5, 5, 5, 5, 5, 4, 3, 3, 2, 2, 1], dtype=float),
+    'evening': np.array([2, 1, 1, 1, 1, 1, 2, 3, 4, 4, 4, 5, 5, 5, 5, 6, 7, 9, 10, 9, 7, 5, 4, 3], dtype=float)
+}
+
+# Zoning districts drawn for parcels in downtown and in residential neighborhoods
+DOWNTOWN = {'Financial District', 'Civic Center', 'South of Market', 'Chinatown'}
+DOWNTOWN_ZONING = [('C-3', 50.0), ('C-2', 20.0), ('RC-4', 20.0), ('RM-4', 10.0)]
+RESIDENTIAL_ZONING = [('RH-1', 30.0), ('RH-2', 30.0), ('RH-3', 15.0), ('RM-1', 10.0), ('RM-2', 8.0),
+                      ('NC-2', 5.0), ('C-2', 2.0)]
+# Zoning map grid over the city: (south, west, north, east) bounds and cell size in degrees
+CITY_BOUNDS = (37.705, -122.515, 37.815, -122.355)
+ZONING_CELL = (0.004, 0.005)
+# Downtown cells this close to their neighborhood center (degrees latitude) are C-3
+DOWNTOWN_CORE = 0.006
+# Random stream for the zoning map, clear of the per-dataset stream ids
+ZONING_STREAM = 100
+# How parcel rolls spell the street types used above
+STREET_TYPES = {'St': 'STREET', 'Ave': 'AVENUE', 'Blvd': 'BOULEVARD'}
+
+DATASETS = ['311_issues', 'evictions', 'permits', 'budget', 'crisis_events',
+            'soda_311', 'soda_evictions', 'soda_permits', 'soda_budget', 'parcels']
+
+# Raw SODA rows for each DataSF dataset, keyed like DATASET_IDS
+SODA_DATASETS = {'311': 'soda_311', 'evictions': 'soda_evictions', 'permits': 'soda_permits', 'budget': 'soda_budget'}
+
+
+def _weights(values: List[float]) -> np.ndarray:
+    weights = np.asarray(values, dtype=float)
+    return weights / weights.sum()
+
+
+class SyntheticCityGenerator:
+    """Seeded generator of city-scale datasets, produced in fixed-size chunks.
+
+    Every chunk draws from its own stream derived from (seed, dataset, chunk),
+    so output is reproducible and any chunk can be regenerated on its own.
+    Agent-facing datasets use the same keys as the agents' mock rows, plus
+    neighborhood, latitude/longitude and timestamps. The ``soda_*`` datasets
+    are raw SODA rows (all values strings, plus :id and :updated_at) in the
+    fields DataSFAPIClient parses.
+    """
+
+    def __init__(self, seed: int = 42, start_date: str = '2024-01-01', days: int = 365,
+                 chunk_size: int = 1000000):
+        self.seed = seed
+        self.start = np.datetime64(start_date, 's')
+        self.days = days
+        self.chunk_size = chunk_size
+        self._hood_weights = _weights([h[3] for h in NEIGHBORHOODS])
+        self._hood_lat = np.array([h[1] for h in NEIGHBORHOODS])
+        self._hood_lon = np.array([h[2] for h in NEIGHBORHOODS])
+        self._hood_evening = np.array([h[5] == 'evening' for h in NEIGHBORHOODS])
+        # Each street belongs to the first neighborhood that lists it
+        self._street_hood = {}
+        for i, (_, _, _, _, hood_streets, _) in enumerate(NEIGHBORHOODS):
+            for street in hood_streets:
+                self._street_hood.setdefault(street, i)
+
+    def iter_chunks(self, dataset: str, n_rows: int) -> Iterator[pa.Table]:
+        """Yield the dataset as Arrow tables of at most chunk_size rows."""
+        builder = getattr(self, f"_build_{dataset}")
+        for chunk_index, offset in enumerate(range(0, n_rows, self.chunk_size)):
+            size = min(self.chunk_size, n_rows - offset)
+            rng = np.random.default_rng([self.seed, DATASETS.index(dataset), chunk_index])
+            yield pa.Table.from_pandas(builder(rng, size, offset), preserve_index=False)
+
+    def to_frame(self, dataset: str, n_rows: int) -> pd.DataFrame:
+        """Whole dataset as one DataFrame (for small sizes)."""
+        return pa.concat_tables(self.iter_chunks(dataset, n_rows)).to_pandas()
+
+    def to_records(self, dataset: str, n_rows: int) -> List[Dict[str, Any]]:
+        """Whole dataset as a list of dicts, the shape agents and the client pass around."""
+        return pa.concat_tables(self.iter_chunks(dataset, n_rows)).to_pylist()
+
+    def write_parquet(self, dataset: str, n_rows: int, path: str) -> str:
+        """Stream the dataset to a Parquet file, one row group per chunk."""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        writer = None
+        try:
+            for table in self.iter_chunks(dataset, n_rows):
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return path
+
+    def write_all(self, out_dir: str, n_rows: int, datasets: Optional[List[str]] = None) -> Dict[str, str]:
+        """Write several datasets at the same scale into out_dir."""
+        paths = {}
+        for dataset in datasets or DATASETS:
+            rows = min(n_rows, 50000) if dataset in ('budget', 'soda_budget') else n_rows
+            paths[dataset] = self.write_parquet(dataset, rows, os.path.join(out_dir, f"{dataset}.parquet"))
+        return paths
+
+    def zoning_districts(self) -> Dict[str, Any]:
+        """Synthetic zoning map as a GeoJSON FeatureCollection of grid-cell polygons.
+
+        Each cell belongs to the nearest neighborhood and draws its district
+        from the same downtown or residential mix as the parcels dataset;
+        downtown cores are C-3.
+        """
+        rng = np.random.default_rng([self.seed, ZONING_STREAM])
+        south, west, north, east = CITY_BOUNDS
+        height, width = ZONING_CELL
+        lat, lon = np.meshgrid(np.arange(south, north, height), np.arange(west, east, width), indexing='ij')
+        lat, lon = lat.ravel(), lon.ravel()
+        center_lat, center_lon = lat + height / 2, lon + width / 2
+
+        # Nearest neighborhood center, with longitude scaled to ground distance
+        scale = np.cos(np.radians(south))
+        distance = np.hypot(center_lat[:, None] - self._hood_lat, (center_lon[:, None] - self._hood_lon) * scale)
+        hood = distance.argmin(axis=1)
+        downtown = np.isin(hood, [i for i, h in enumerate(NEIGHBORHOODS) if h[0] in DOWNTOWN])
+        zoning = np.where(
+            downtown,
+            np.asarray([z for z, _ in DOWNTOWN_ZONING], dtype=object)[
+                rng.choice(len(DOWNTOWN_ZONING), size=len(hood), p=_weights([w for _, w in DOWNTOWN_ZONING]))],
+            np.asarray([z for z, _ in RESIDENTIAL_ZONING], dtype=object)[
+                rng.choice(len(RESIDENTIAL_ZONING), size=len(hood), p=_weights([w for _, w in RESIDENTIAL_ZONING]))]
+        )
+        zoning[downtown & (distance.min(axis=1) < DOWNTOWN_CORE)] = 'C-3'
+
+        features = []
+        for i in range(len(hood)):
+            ring = [[lon[i], lat[i]], [lon[i] + width, lat[i]], [lon[i] + width, lat[i] + height],
+                    [lon[i], lat[i] + height], [lon[i], lat[i]]]
+            features.append({
+                'type': 'Feature',
+                'properties': {'zoning': zoning[i], 'neighborhood': NEIGHBORHOODS[hood[i]][0]},
+                'geometry': {'type': 'Polygon', 'coordinates': [[[round(x, 6), round(y, 6)] for x, y in ring]]}
+            })
+        return {'type': 'FeatureCollection', 'features': features}
+
+    def _places(self, rng: np.random.Generator, n: int) -> Dict[str, np.ndarray]:
+        """Neighborhood, street, address and jittered coordinates for n rows."""
+        hood = rng.choice(len(NEIGHBORHOODS), size=n, p=self._hood_weights)
+        street_pick = rng.random(n)
+        streets = np.empty(n, dtype=object)
+        for i, (_, _, _, _, hood_streets, _) in enumerate(NEIGHBORHOODS):
+            mask = hood == i
+            streets[mask] = np.asarray(hood_streets, dtype=object)[(street_pick[mask] * len(hood_streets)).astype(int)]
+        numbers = rng.integers(1, 4000, size=n).astype(str).astype(object)
+        return {
+            'hood': hood,
+            'neighborhood': np.asarray([h[0] for h in NEIGHBORHOODS], dtype=object)[hood],
+            'street': streets,
+            'address': numbers + ' ' + streets,
+            'latitude': self._hood_lat[hood] + rng.normal(0, 0.0045, n),
+            'longitude': self._hood_lon[hood] + rng.normal(0, 0.0055, n)
+        }
+
+    def _timestamps(self, rng: np.random.Generator, hood: np.ndarray) -> np.ndarray:
+        """Timestamps with weekday and neighborhood-specific hour-of-day profiles."""
+        n = len(hood)
+        day = rng.integers(0, self.days, size=n)
+        weekday = (day + (self.start.astype('datetime64[D]').view('int64') + 3)) % 7
+        # Thin weekend volume by re-drawing a share of weekend days
+        redraw = (weekday >= 5) & (rng.random(n) < 0.3)
+        day[redraw] = rng.integers(0, self.days, size=int(redraw.sum()))
+        morning = rng.choice(24, size=n, p=_weights(HOUR_WEIGHTS['morning']))
+        evening = rng.choice(24, size=n, p=_weights(HOUR_WEIGHTS['evening']))
+        hour = np.where(self._hood_evening[hood], evening, morning)
+        seconds = day * 86400 + hour * 3600 + rng.integers(0, 3600, size=n)
+        return self.start + seconds.astype('timedelta64[s]')
+
+    def _build_311_issues(self, rng: np.random.Generator, n: int, offset: int) -> pd.DataFrame:
+        places = self._places(rng, n)
+        request_type = np.asarray([t for t, _ in REQUEST_TYPES], dtype=object)[
+            rng.choice(len(REQUEST_TYPES), size=n, p=_weights([w for _, w in REQUEST_TYPES]))]
+        base = SEVERITY_CLASSIFIER.classify_array(request_type, dtype=float)
+        return pd.DataFrame({
+            'id': np.arange(offset + 1, offset + n + 1),
+            'type': CATEGORY_CLASSIFIER.classify_array(request_type),
+            'location': places['street'],
+            'severity': np.clip(base + rng.normal(0, 0.12, n), 0.05, 1.0).round(2),
+            'description': request_type,
+            'neighborhood': places['neighborhood'],
+            'address': places['address'],
+            'latitude': places['latitude'],
+            'longitude': places['longitude'],
+            'created_date': self._timestamps(rng, places['hood'])
+        })
+
+    def _build_soda_311(self, rng: np.random.Generator, n: int, offset: int) -> pd.DataFrame:
+        places = self._places(rng, n)
+        requested = self._timestamps(rng, places['hood'])
+        updated = requested + rng.exponential(3 * 86400, n).astype('timedelta64[s]')
+        status = np.asarray([s for s, _ in STATUSES], dtype=object)[
+            rng.choice(len(STATUSES), size=n, p=_weights([w for _, w in STATUSES]))]
+        request_type = np.asarray([t for t, _ in REQUEST_TYPES], dtype=object)[
+            rng.choice(len(REQUEST_TYPES), size=n, p=_weights([w for _, w in REQUEST_TYPES]))]
+        ids = np.arange(offset + 1, offset + n + 1)
+        return pd.DataFrame({
+            **self._system_fields(ids, updated),
+            'service_request_id': (ids + 10000000).astype(str).astype(object),
+            'requested_datetime': pd.to_datetime(requested).strftime('%Y-%m-%dT%H:%M:%S.000'),
+            'updated_datetime': pd.to_datetime(updated).strftime('%Y-%m-%dT%H:%M:%S.000'),
+            'status': status,
+            'service_request_type': request_type,
+            'service_request_details': request_type,
+            'street_address': places['address'],
+            'analysis_neighborhood': places['neighborhood'],
+            'lat': places['latitude'].round(6).astype(str),
+            'long': places['longitude'].round(6).astype(str)
+        })
+
+    def _system_fields(self, ids: np.ndarray, updated: np.ndarray) -> Dict[str, Any]:
+        """SODA :id and :updated_at columns; zero-padded ids sort in row order."""
+        return {
+            ':id': np.char.add('row-', np.char.zfill(ids.astype(str), 10)).astype(object),
+            ':updated_at': pd.to_datetime(updated).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        }
+
+    def _build_soda_evictions(self, rng: np.random.Generator, n: int, offset: int) -> pd.DataFrame:
+        places = self._places(rng, n)
+        filed = self._timestamps(rng, places['hood'])
+        kind = rng.choice(len(EVICTION_TYPES), size=n, p=_weights([e[2] for e in EVICTION_TYPES]))
+        ids = np.arange(offset + 1, offset + n + 1)
+        return pd.DataFrame({
+            **self._system_fields(ids, filed + rng.exponential(7 * 86400, n).astype('timedelta64[s]')),
+            'eviction_id': np.char.add('M', np.char.zfill(ids.astype(str), 7)).astype(object),
+            'address': places['address'],
+            'eviction_type': np.asarray([e[0] for e in EVICTION_TYPES], dtype=object)[kind],
+            'eviction_reason': np.asarray([e[1] for e in EVICTION_TYPES], dtype=object)[kind],
+            'neighborhood': places['neighborhood'],
+            'file_date': pd.to_datetime(filed).strftime('%Y-%m-%dT00:00:00.000'),
+            'shape': [{'type': 'Point', 'coordinates': [lon, lat]}
+                      for lon, lat in zip(places['longitude'].round(6), places['latitude'].round(6))]
+        })
+
+    def _build_soda_permits(self, rng: np.random.Generator, n: int, offset: int) -> pd.DataFrame:
+        permits = self._build_permits(rng, n, offset)
+        issued = self._timestamps(rng, rng.choice(len(NEIGHBORHOODS), size=n, p=self._hood_weights))
+        ids = np.arange(offset + 1, offset + n + 1)
+        return pd.DataFrame({
+            **self._system_fields(ids, issued + rng.exponential(30 * 86400, n).astype('timedelta64[s]')),
+            'permit_number': (ids + 202400000000).astype(str).astype(object),
+            'street_address': permits['address'],
+            'permit_type': permits['type'],
+            'estimated_cost': permits['value'].map('{:.2f}'.format),
+            'status': permits['status'],
+            'issued_date': pd.to_datetime(issued).strftime('%Y-%m-%dT00:00:00.000'),
+            'description': permits['type'].str.replace('_', ' '),
+            'neighborhood': permits['neighborhood']
+        })
+
+    def _build_soda_budget(self, rng: np.random.Generator, n: int, offset: int) -> pd.DataFrame:
+        budget = self._build_budget(rng, n, offset)
+        ids = np.arange(offset + 1, offset + n + 1)
+        year = rng.integers(2020, 2026, n)
+        updated = (year - 1970).astype('datetime64[Y]').astype('datetime64[s]')
+        return pd.DataFrame({
+            **self._system_fields(ids, updated),
+            'department': budget['category'],
+            'amount': budget['amount'].map('{:.0f}'.format),
+            'fiscal_year': year.astype(str).astype(object),
+            'fund_source': np.where(rng.random(n) < 0.7, 'general_fund', 'federal_grant').astype(object),
+            'description': budget['category'].str.replace('_', ' ') + ' - ' + budget['location']
+        })
+
+    def _build_evictions(self, rng: np.random.Generator, n: int, offset: int) -> pd.DataFrame:
+        places = self._places(rng, n)
+        kind = rng.choice(len(EVICTION_TYPES), size=n, p=_weights([e[2] for e in EVICTION_TYPES]))
+        base = np.array([e[3] for e in EVICTION_TYPES])[kind]
+        return pd.DataFrame({
+            'id': np.arange(offset + 1, offset + n + 1),
+            'address': places['address'],
+            'reason': np.asarray([e[1] for e in EVICTION_TYPES], dtype=object)[kind],
+            'eviction_type': np.asarray([e[0] for e in EVICTION_TYPES], dtype=object)[kind],
+            'severity': np.clip(base + rng.normal(0, 0.08, n), 0.05, 1.0).round(2),
+            'date': pd.to_datetime(self._timestamps(rng, places['hood'])).strftime('%Y-%m-%d'),
+            'neighborhood': places['neighborhood'],
+            'latitude': places['latitude'],
+            'longitude': places['longitude']
+        })
+
+    def _build_permits(self, rng: np.random.Generator, n: int, offset: int) -> pd.DataFrame:
+        places = self._places(rng, n)
+        kind = rng.choice(len(PERMIT_TYPES), size=n, p=_weights([w for _, w in PERMIT_TYPES]))
+        status = rng.choice(len(PERMIT_STATUSES), size=n, p=_weights([w for _, w in PERMIT_STATUSES]))
+        value = np.round(rng.lognormal(11.0, 1.2, n), -2)
+        return pd.DataFrame({
+            'id': np.arange(offset + 1, offset + n + 1),
+            'address': places['address'],
+            'type': np.asarray([t for t, _ in PERMIT_TYPES], dtype=object)[kind],
+            'status': np.asarray([s for s, _ in PERMIT_STATUSES], dtype=object)[status],
+            'value': np.where(kind == 1, value * 8, value),
+            'neighborhood': places['neighborhood'],
+            'latitude': places['latitude'],
+            'longitude': places['longitude']
+        })
+
+    def _build_budget(self, rng: np.random.Generator, n: int, offset: int) -> pd.DataFrame:
+        hood = rng.choice(len(NEIGHBORHOODS), size=n, p=self._hood_weights)
+        amount = np.round(rng.lognormal(16.5, 0.8, n), -5)
+        return pd.DataFrame({
+            'id': np.arange(offset + 1, offset + n + 1),
+            'category': np.asarray(BUDGET_CATEGORIES, dtype=object)[rng.integers(0, len(BUDGET_CATEGORIES), n)],
+            'amount': amount,
+            'location': np.asarray([h[0] for h in NEIGHBORHOODS], dtype=object)[hood],
+            'priority': np.where(amount > 40000000, 'high', np.where(rng.random(n) < 0.5, 'high', 'medium'))
+        })
+
+    def _build_parcels(self, rng: np.random.Generator, n: int, offset: int) -> pd.DataFrame:
+        """One parcel per street number, so every address the other datasets draw has a parcel."""
+        streets = list(self._street_hood)
+        position = np.arange(offset, offset + n)
+        street = position % len(streets)
+        numbers = (position // len(streets) + 1).astype(str).astype(object)
+        hood = np.array([self._street_hood[name] for name in streets])[street]
+        # Assessor rolls spell addresses in upper case with full street types
+        spelled = np.asarray([' '.join(STREET_TYPES.get(word, word) for word in name.split()).upper()
+                              for name in streets], dtype=object)
+        downtown = np.isin(hood, [i for i, h in enumerate(NEIGHBORHOODS) if h[0] in DOWNTOWN])
+        zoning = np.where(
+            downtown,
+            np.asarray([z for z, _ in DOWNTOWN_ZONING], dtype=object)[
+                rng.choice(len(DOWNTOWN_ZONING), size=n, p=_weights([w for _, w in DOWNTOWN_ZONING]))],
+            np.asarray([z for z, _ in RESIDENTIAL_ZONING], dtype=object)[
+                rng.choice(len(RESIDENTIAL_ZONING), size=n, p=_weights([w for _, w in RESIDENTIAL_ZONING]))]
+        )
+        return pd.DataFrame({
+            'id': [f"{block:04d}{lot:03d}" for block, lot in zip(position // 40 + 1, position % 40 + 1)],
+            'address': numbers + ' ' + spelled[street],
+            'zoning_district': zoning,
+            'neighborhood': np.asarray([h[0] for h in NEIGHBORHOODS], dtype=object)[hood],
+            'latitude': self._hood_lat[hood] + rng.normal(0, 0.0045, n),
+            'longitude': self._hood_lon[hood] + rng.normal(0, 0.0055, n)
+        })
+
+    def _build_crisis_events(self, rng: np.random.Generator, n: int, offset: int) -> pd.DataFrame:
+        places = self._places(rng, n)
+        kind = rng.choice(len(CRISIS_TYPES), size=n, p=_weights([c[1] for c in CRISIS_TYPES]))
+        descriptions = np.empty(n, dtype=object)
+        pick = rng.integers(0, 3, n)
+        for i, (_, _, options) in enumerate(CRISIS_TYPES):
+            mask = kind == i
+            descriptions[mask] = np.asarray(options, dtype=object)[pick[mask]]
+        return pd.DataFrame({
+            'id': np.arange(offset + 1, offset + n + 1),
+            'type': np.asarray([c[0] for c in CRISIS_TYPES], dtype=object)[kind],
+            'location': places['neighborhood'],
+            'severity': np.clip(rng.beta(5, 2.5, n), 0.05, 1.0).round(2),
+            'description': descriptions,
+            'timestamp': self._timestamps(rng, places['hood']),
+            'latitude': places['latitude'],
+            'longitude': places['longitude']
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic DataSF datasets as Parquet.")
+    parser.add_argument('--rows', type=int, default=100000, help="Rows per dataset (1k to 10M)")
+    parser.add_argument('--out', default=os.path.join('data_cache', 'synthetic'), help="Output directory")
+    parser.add_argument('--datasets', nargs='*', default=None, choices=DATASETS)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=1000000)
+    args = parser.parse_args()
+
+    generator = SyntheticCityGenerator(seed=args.seed, chunk_size=args.chunk_size)
+    for dataset, path in generator.write_all(args.out, args.rows, args.datasets).items():
+        print(f"✅ {dataset}: {path}")
+
+
+if __name__ == "__main__":
+    main()
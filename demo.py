@@ -9,6 +9,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 from orchestrator import Orchestrator
+from coordination.events import StreamlitSink
 from data_sources.api_client import DataSFAPIClient
 
 def run_demo():
@@ -91,7 +92,7 @@ def run_scenario_demo(scenario: str):
     st.markdown(f"## 🎮 Running: {scenario}")
     
     # Initialize orchestrator
-    orchestrator = Orchestrator()
+    orchestrator = Orchestrator(event_sink=StreamlitSink())
     
     # Prepare scenario data
     scenario_data = {
@@ -3,112 +3,143 @@ import numpy as np
 import pandas as pd
 import networkx as nx
 from sympy import symbols, solve, Eq
-from pulp import *
 import requests
 from agents.street_precog import StreetPrecog
 from agents.housing_oracle import HousingOracle
 from agents.budget_prophet import BudgetProphet
 from agents.crisis_sage import CrisisSage
-import streamlit as st
+from agents.base_agent import AgentMode
+from analytics.allocation import AllocationEngine
+from analytics.funding import simulate_funding
+from coordination.executors import PhaseExecutor, ExecutorMode
+from coordination.events import EventKind, EventSink, NullSink, OrchestratorEvent
+import time
+
+# The ROI phase is interactive: stop the allocator early rather than search for the last 0.01%
+ROI_TIME_LIMIT = 2.0
+ROI_MIP_GAP = 1e-3
 
 class Orchestrator:
     """Orchestrator: Coordinates all agents with ROI optimization and funding simulations."""
     
-    def __init__(self):
+    def __init__(self, executor_mode: str = ExecutorMode.SEQUENTIAL.value, agent_timeout: Optional[float] = None,
+                 event_sink: Optional[EventSink] = None, data_client=None):
         self.agents = {
-            'street_precog': StreetPrecog(),
+            'street_precog': StreetPrecog(data_client),
             'housing_oracle': HousingOracle(),
-            'budget_prophet': BudgetProphet(),
+            'budget_prophet': BudgetProphet(data_client),
             'crisis_sage': CrisisSage()
         }
         self.city_graph = nx.Graph()
         self.roi_threshold = 0.75
         self.funding_simulations = {}
         self.coordination_history = []
-        
+        self.total_budget = 1000000  # $1M budget unless the scenario sets one
+        self.allocator = AllocationEngine(time_limit=ROI_TIME_LIMIT, mip_gap=ROI_MIP_GAP)
+        self.phase_executor = PhaseExecutor(executor_mode, agent_timeout=agent_timeout)
+        self.event_sink = event_sink or NullSink()
+        
+    def _emit(self, kind: EventKind, phase: str, message: str = "", agent: Optional[str] = None, **data):
+        """Send a structured progress event to the configured sink."""
+        self.event_sink.emit(OrchestratorEvent(kind=kind, phase=phase, message=message, agent=agent, data=data))
+    
+    def _run_timed_phase(self, phase: str, title: str, phase_fn, *args) -> Dict[str, Any]:
+        """Run one phase between started/completed events carrying its wall time."""
+        self._emit(EventKind.PHASE_STARTED, phase, title)
+        start = time.perf_counter()
+        results = phase_fn(*args)
+        self._emit(EventKind.PHASE_COMPLETED, phase, title, duration=time.perf_counter() - start)
+        return results
+    
+    def set_executor_mode(self, executor_mode: str, agent_timeout: Optional[float] = None):
+        """Switch how agents within a phase are run (sequential, thread or asyncio)."""
+        self.phase_executor.shutdown()
+        self.phase_executor = PhaseExecutor(executor_mode, agent_timeout=agent_timeout)
+    
+    def _agent_task(self, agent, mode: AgentMode, agent_data: Dict[str, Any]):
+        """Bind an agent, its mode and its input into a task for the phase executor."""
+        def task() -> Dict[str, Any]:
+            agent.set_mode(mode)
+            return agent.execute(agent_data)
+        return task
+    
     def coordinate_agents(self, scenario_data: Dict[str, Any]) -> Dict[str, Any]:
         """Coordinate all agents in a predictive chain."""
         coordination_results = {}
         
         # Step 1: Detect phase
-        st.write("🔍 **Phase 1: Detection**")
-        detection_results = self._run_detection_phase(scenario_data)
+        detection_results = self._run_timed_phase('detection', "🔍 **Phase 1: Detection**", self._run_detection_phase, scenario_data)
         coordination_results['detection'] = detection_results
         
         # Step 2: Predict phase
-        st.write("🔮 **Phase 2: Prediction**")
-        prediction_results = self._run_prediction_phase(detection_results)
+        prediction_results = self._run_timed_phase('prediction', "🔮 **Phase 2: Prediction**", self._run_prediction_phase, detection_results, scenario_data)
         coordination_results['prediction'] = prediction_results
         
         # Step 3: Prevent phase
-        st.write("🛡️ **Phase 3: Prevention**")
-        prevention_results = self._run_prevention_phase(prediction_results)
+        prevention_results = self._run_timed_phase('prevention', "🛡️ **Phase 3: Prevention**", self._run_prevention_phase, prediction_results, scenario_data)
         coordination_results['prevention'] = prevention_results
         
         # Step 4: ROI optimization with funding simulations
-        st.write("💰 **Phase 4: ROI Optimization**")
-        roi_results = self._optimize_roi_with_funding(prevention_results)
+        roi_results = self._run_timed_phase('roi_optimization', "💰 **Phase 4: ROI Optimization**", self._optimize_roi_with_funding, prevention_results,
+                                           scenario_data.get('budget', self.total_budget), scenario_data.get('budget_constraints'))
         coordination_results['roi_optimization'] = roi_results
         
         # Step 5: Generate visualizations
-        st.write("🎨 **Phase 5: Future Visualizations**")
-        viz_results = self._run_visualization_phase(coordination_results)
+        viz_results = self._run_timed_phase('visualization', "🎨 **Phase 5: Future Visualizations**", self._run_visualization_phase, coordination_results)
         coordination_results['visualization'] = viz_results
         
         # Step 6: Citizen engagement
-        st.write("👥 **Phase 6: Citizen Engagement**")
-        citizen_results = self._run_citizen_engagement_phase(coordination_results)
+        citizen_results = self._run_timed_phase('citizen_engagement', "👥 **Phase 6: Citizen Engagement**", self._run_citizen_engagement_phase, coordination_results)
         coordination_results['citizen_engagement'] = citizen_results
         
         # Step 7: Broadcast results
-        st.write("📡 **Phase 7: Broadcasting**")
-        broadcast_results = self._run_broadcast_phase(coordination_results)
+        broadcast_results = self._run_timed_phase('broadcast', "📡 **Phase 7: Broadcasting**", self._run_broadcast_phase, coordination_results)
         coordination_results['broadcast'] = broadcast_results
         
+        self.event_sink.flush()
+        
         return coordination_results
     
     def _run_detection_phase(self, scenario_data: Dict[str, Any]) -> Dict[str, Any]:
         """Run detection phase across all agents."""
-        detection_results = {}
+        tasks = {}
         
         for agent_name, agent in self.agents.items():
-            agent.set_mode(agent.mode.__class__.DETECT)
-            
             # Prepare data with the structure agents expect
             agent_data = {
                 'location': scenario_data.get('location', 'San Francisco'),
                 'weather': scenario_data.get('weather', {'rain_probability': 0.6}),
                 'timestamp': scenario_data.get('timestamp', '2024-01-15')
             }
-            
-            result = agent.execute(agent_data)
-            detection_results[agent_name] = result
-            
+            tasks[agent_name] = self._agent_task(agent, AgentMode.DETECT, agent_data)
+        
+        detection_results = self.phase_executor.run_phase(AgentMode.DETECT.value, tasks)
+        
+        for agent_name, result in detection_results.items():
             # Level-up: Show detection status with challenge alignments
             level_up_status = result.get('level_up_status', {})
-            st.success(f"✅ {agent_name}: {result.get('level_up_message', 'Detection completed')}")
+            self._emit(EventKind.AGENT_COMPLETED, 'detection', f"✅ {agent_name}: {result.get('level_up_message', 'Detection completed')}", agent_name)
             
             if level_up_status.get('level_up_features'):
                 for feature, data in level_up_status['level_up_features'].items():
-                    st.info(f"🎯 Level-up: {feature} - {len(data) if isinstance(data, list) else data}")
+                    self._emit(EventKind.LEVEL_UP, 'detection', f"🎯 Level-up: {feature} - {len(data) if isinstance(data, list) else data}", agent_name, feature=feature)
         
         return detection_results
     
-    def _run_prediction_phase(self, detection_results: Dict[str, Any]) -> Dict[str, Any]:
+    def _run_prediction_phase(self, detection_results: Dict[str, Any], scenario_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Run prediction phase with agent coordination."""
-        prediction_results = {}
+        tasks = {}
+        scenario_data = scenario_data or {}
         
         # Combine detection data for cross-agent predictions
         combined_data = self._combine_detection_data(detection_results)
         
         for agent_name, agent in self.agents.items():
-            agent.set_mode(agent.mode.__class__.PREDICT)
-            
             # Prepare data with detection results for each agent
             agent_data = {
-                'location': 'San Francisco',
-                'weather': {'rain_probability': 0.6},
-                'timestamp': '2024-01-15'
+                'location': scenario_data.get('location', 'San Francisco'),
+                'weather': scenario_data.get('weather', {'rain_probability': 0.6}),
+                'timestamp': scenario_data.get('timestamp', '2024-01-15')
             }
             
             # Add agent-specific detection data from the detection phase
@@ -129,28 +160,29 @@ class Orchestrator:
                 agent_data['crisis_events'] = crisis_detection.get('crisis_events', [])
                 agent_data['escalation_patterns'] = crisis_detection.get('escalation_patterns', [])
             
-            result = agent.execute(agent_data)
-            prediction_results[agent_name] = result
-            
-            st.success(f"🔮 {agent_name}: {result.get('level_up_message', 'Prediction completed')}")
+            tasks[agent_name] = self._agent_task(agent, AgentMode.PREDICT, agent_data)
+        
+        prediction_results = self.phase_executor.run_phase(AgentMode.PREDICT.value, tasks)
+        
+        for agent_name, result in prediction_results.items():
+            self._emit(EventKind.AGENT_COMPLETED, 'prediction', f"🔮 {agent_name}: {result.get('level_up_message', 'Prediction completed')}", agent_name)
         
         return prediction_results
     
-    def _run_prevention_phase(self, prediction_results: Dict[str, Any]) -> Dict[str, Any]:
+    def _run_prevention_phase(self, prediction_results: Dict[str, Any], scenario_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Run prevention phase with coordinated strategies."""
-        prevention_results = {}
+        tasks = {}
+        scenario_data = scenario_data or {}
         
         # Combine prediction data for cross-agent prevention
         combined_data = self._combine_prediction_data(prediction_results)
         
         for agent_name, agent in self.agents.items():
-            agent.set_mode(agent.mode.__class__.PREVENT)
-            
             # Prepare data with prediction results for each agent
             agent_data = {
-                'location': 'San Francisco',
-                'weather': {'rain_probability': 0.6},
-                'timestamp': '2024-01-15'
+                'location': scenario_data.get('location', 'San Francisco'),
+                'weather': scenario_data.get('weather', {'rain_probability': 0.6}),
+                'timestamp': scenario_data.get('timestamp', '2024-01-15')
             }
             
             # Add agent-specific prediction data from the prediction phase
@@ -162,6 +194,7 @@ class Orchestrator:
                 housing_prediction = prediction_results.get('housing_oracle', {})
                 agent_data['risk_predictions'] = housing_prediction.get('risk_predictions', [])
                 agent_data['evictions'] = housing_prediction.get('evictions', [])
+                agent_data['snap_households'] = scenario_data.get('snap_households', [])
             elif agent_name == 'budget_prophet':
                 budget_prediction = prediction_results.get('budget_prophet', {})
                 agent_data['funding_predictions'] = budget_prediction.get('funding_predictions', [])
@@ -171,15 +204,18 @@ class Orchestrator:
                 agent_data['escalation_predictions'] = crisis_prediction.get('escalation_predictions', [])
                 agent_data['crisis_events'] = crisis_prediction.get('crisis_events', [])
             
-            result = agent.execute(agent_data)
-            prevention_results[agent_name] = result
-            
-            st.success(f"🛡️ {agent_name}: {result.get('level_up_message', 'Prevention completed')}")
+            tasks[agent_name] = self._agent_task(agent, AgentMode.PREVENT, agent_data)
+        
+        prevention_results = self.phase_executor.run_phase(AgentMode.PREVENT.value, tasks)
+        
+        for agent_name, result in prevention_results.items():
+            self._emit(EventKind.AGENT_COMPLETED, 'prevention', f"🛡️ {agent_name}: {result.get('level_up_message', 'Prevention completed')}", agent_name)
         
         return prevention_results
     
-    def _optimize_roi_with_funding(self, prevention_results: Dict[str, Any]) -> Dict[str, Any]:
-        """Optimize ROI with federal funding simulations."""
+    def _optimize_roi_with_funding(self, prevention_results: Dict[str, Any], total_budget: float = 1000000,
+                                   budget_constraints: Optional[Dict[str, Dict[str, float]]] = None) -> Dict[str, Any]:
+        """Optimize ROI with federal funding simulations; budget_constraints caps spend per agent, district or category."""
         roi_results = {}
         
         # Level-up: Federal funding simulation
@@ -189,7 +225,7 @@ class Orchestrator:
         roi_calculations = self._calculate_roi(prevention_results, funding_simulation)
         
         # Optimize resource allocation
-        optimization_result = self._optimize_resource_allocation(roi_calculations)
+        optimization_result = self._optimize_resource_allocation(roi_calculations, total_budget, budget_constraints)
         
         roi_results = {
             'funding_simulation': funding_simulation,
@@ -200,65 +236,68 @@ class Orchestrator:
             'level_up_message': f"ROI optimization with federal funding: {len(funding_simulation.get('opportunities', []))} opportunities"
         }
         
-        st.success(f"💰 ROI Optimization: {roi_results['total_roi']:.2f}x return with {roi_results['funding_opportunities']} funding opportunities")
+        self._emit(EventKind.AGENT_COMPLETED, 'roi_optimization', f"💰 ROI Optimization: {roi_results['total_roi']:.2f}x return with {roi_results['funding_opportunities']} funding opportunities")
         
         return roi_results
     
     def _run_broadcast_phase(self, coordination_results: Dict[str, Any]) -> Dict[str, Any]:
         """Run broadcast phase to share results across agents."""
-        broadcast_results = {}
-        
         # Combine all results for broadcasting
         combined_data = self._combine_all_results(coordination_results)
         
-        for agent_name, agent in self.agents.items():
-            agent.set_mode(agent.mode.__class__.BROADCAST)
-            result = agent.execute(combined_data)
-            broadcast_results[agent_name] = result
+        tasks = {
+            agent_name: self._agent_task(agent, AgentMode.BROADCAST, combined_data)
+            for agent_name, agent in self.agents.items()
+        }
+        broadcast_results = self.phase_executor.run_phase(AgentMode.BROADCAST.value, tasks)
+        
+        for agent_name, result in broadcast_results.items():
             
-            st.success(f"📡 {agent_name}: Broadcasting completed")
+            self._emit(EventKind.AGENT_COMPLETED, 'broadcast', f"📡 {agent_name}: Broadcasting completed", agent_name)
         
         return broadcast_results
     
     def _run_visualization_phase(self, coordination_results: Dict[str, Any]) -> Dict[str, Any]:
         """Run visualization phase with MidJourney integration."""
-        viz_results = {}
-        
         # Combine all results for visualization
         combined_data = self._combine_all_results(coordination_results)
         
-        for agent_name, agent in self.agents.items():
-            agent.set_mode(agent.mode.__class__.VIZ_GENERATE)
-            result = agent.execute(combined_data)
-            viz_results[agent_name] = result
+        tasks = {
+            agent_name: self._agent_task(agent, AgentMode.VIZ_GENERATE, combined_data)
+            for agent_name, agent in self.agents.items()
+        }
+        viz_results = self.phase_executor.run_phase(AgentMode.VIZ_GENERATE.value, tasks)
+        
+        for agent_name, result in viz_results.items():
             
             # Level-up: Show visualization status
             level_up_status = result.get('level_up_status', {})
-            st.success(f"🎨 {agent_name}: {result.get('level_up_message', 'Visualization completed')}")
+            self._emit(EventKind.AGENT_COMPLETED, 'visualization', f"🎨 {agent_name}: {result.get('level_up_message', 'Visualization completed')}", agent_name)
             
             if level_up_status.get('midjourney_prompts'):
-                st.info(f"🎯 Level-up: Generated {len(level_up_status['midjourney_prompts'])} MidJourney prompts")
+                self._emit(EventKind.LEVEL_UP, 'visualization', f"🎯 Level-up: Generated {len(level_up_status['midjourney_prompts'])} MidJourney prompts", agent_name)
         
         return viz_results
     
     def _run_citizen_engagement_phase(self, coordination_results: Dict[str, Any]) -> Dict[str, Any]:
         """Run citizen engagement phase with polls and community stories."""
-        citizen_results = {}
-        
         # Combine all results for citizen engagement
         combined_data = self._combine_all_results(coordination_results)
         
-        for agent_name, agent in self.agents.items():
-            agent.set_mode(agent.mode.__class__.POLL_OUTPUT)
-            result = agent.execute(combined_data)
-            citizen_results[agent_name] = result
+        tasks = {
+            agent_name: self._agent_task(agent, AgentMode.POLL_OUTPUT, combined_data)
+            for agent_name, agent in self.agents.items()
+        }
+        citizen_results = self.phase_executor.run_phase(AgentMode.POLL_OUTPUT.value, tasks)
+        
+        for agent_name, result in citizen_results.items():
             
             # Level-up: Show citizen engagement status
             level_up_status = result.get('level_up_status', {})
-            st.success(f"👥 {agent_name}: {result.get('level_up_message', 'Citizen engagement completed')}")
+            self._emit(EventKind.AGENT_COMPLETED, 'citizen_engagement', f"👥 {agent_name}: {result.get('level_up_message', 'Citizen engagement completed')}", agent_name)
             
             if level_up_status.get('citizen_votes'):
-                st.info(f"🎯 Level-up: Collected {len(level_up_status['citizen_votes'])} citizen votes")
+                self._emit(EventKind.LEVEL_UP, 'citizen_engagement', f"🎯 Level-up: Collected {len(level_up_status['citizen_votes'])} citizen votes", agent_name)
         
         return citizen_results
     
@@ -329,10 +368,19 @@ class Orchestrator:
                 'impact': 'high'
             })
         
+        # Monte Carlo award outcomes: distributions instead of the point estimates alone
+        simulation = simulate_funding(opportunities)
+        for opportunity, outcome in zip(opportunities, simulation['programs']):
+            opportunity['expected_award'] = outcome['expected_award']
+        
         return {
             'opportunities': opportunities,
             'total_potential_funding': sum(o['amount'] for o in opportunities),
-            'average_roi_multiplier': np.mean([o['roi_multiplier'] for o in opportunities])
+            'average_roi_multiplier': np.mean([o['roi_multiplier'] for o in opportunities]),
+            'funding_distribution': simulation['total_funding'],
+            'return_distribution': simulation['total_return'],
+            'expected_roi': simulation['expected_roi'],
+            'trials': simulation['trials']
         }
     
     def _calculate_roi(self, prevention_results: Dict[str, Any], funding_simulation: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -356,6 +404,10 @@ class Orchestrator:
                 roi_calculations.append({
                     'agent': agent_name,
                     'strategy': strategy.get('type', 'unknown'),
+                    'target': strategy.get('target'),
+                    'district': (strategy.get('location') or strategy.get('target')
+                                 or (strategy.get('target_areas') or ['Citywide'])[0]),
+                    'category': strategy.get('category', strategy.get('type', 'unknown')),
                     'cost': base_cost,
                     'benefit': base_benefit * funding_multiplier,
                     'roi': roi,
@@ -364,43 +416,10 @@ class Orchestrator:
         
         return roi_calculations
     
-    def _optimize_resource_allocation(self, roi_calculations: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Optimize resource allocation using linear programming."""
-        # Create optimization problem
-        prob = LpProblem("Resource_Allocation", LpMaximize)
-        
-        # Decision variables
-        strategy_vars = {}
-        for i, calc in enumerate(roi_calculations):
-            strategy_vars[i] = LpVariable(f"strategy_{i}", 0, 1, LpBinary)
-        
-        # Objective function: maximize total benefit
-        prob += lpSum([calc['benefit'] * strategy_vars[i] for i, calc in enumerate(roi_calculations)])
-        
-        # Constraints
-        total_budget = 1000000  # $1M budget
-        prob += lpSum([calc['cost'] * strategy_vars[i] for i, calc in enumerate(roi_calculations)]) <= total_budget
-        
-        # Solve
-        prob.solve()
-        
-        # Extract results
-        selected_strategies = []
-        total_cost = 0
-        total_benefit = 0
-        
-        for i, calc in enumerate(roi_calculations):
-            if strategy_vars[i].value() == 1:
-                selected_strategies.append(calc)
-                total_cost += calc['cost']
-                total_benefit += calc['benefit']
-        
-        return {
-            'selected_strategies': selected_strategies,
-            'total_cost': total_cost,
-            'total_benefit': total_benefit,
-            'optimization_status': LpStatus[prob.status]
-        }
+    def _optimize_resource_allocation(self, roi_calculations: List[Dict[str, Any]], total_budget: float = 1000000,
+                                      budget_constraints: Optional[Dict[str, Dict[str, float]]] = None) -> Dict[str, Any]:
+        """Optimize resource allocation under the overall budget and any per-agent, district or category budgets."""
+        return self.allocator.allocate(roi_calculations, total_budget, budget_constraints)
     
     def _calculate_total_roi(self, roi_calculations: List[Dict[str, Any]]) -> float:
         """Calculate total ROI across all strategies."""